@@ -1,4 +1,9 @@
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from number_theory import mod_inverse
 
 # -------------------------
 # AFFINE CIPHER FUNCTIONS
@@ -12,12 +17,6 @@ def char_to_num(c):
 def num_to_char(n):
     return chr((n % 26) + ord('A'))
 
-def mod_inverse(a, m):
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
-
 def validate_key(a, b):
     if not isinstance(a, int) or not isinstance(b, int):
         return False, "a and b must be integers."
@@ -2,34 +2,33 @@
 # Extended Euclid, Discrete Log (BSGS), Elliptic Curve Arithmetic
 # Save & run in VS Code: python crypto_algorithms.py
 
+import importlib
 import math
+import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Elliptic-Curve-Arithmetic"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Implementation-Discrete-Logarithm"))
+
 # -------------------------
 # 1) EXTENDED EUCLID
 # -------------------------
-def extended_euclid(a, b):
-    """
-    Return (g, x, y) such that g = gcd(a, b) and a*x + b*y = g
-    """
-    if b == 0:
-        return abs(a), 1 if a >= 0 else -1, 0
-    else:
-        g, x1, y1 = extended_euclid(b, a % b)
-        x = y1
-        y = x1 - (a // b) * y1
-        return g, x, y
-
-def modinv(a, m):
-    """
-    Modular inverse of a modulo m using Extended Euclid.
-    Returns inverse in 0..m-1, or None if inverse does not exist.
-    """
-    a = a % m
-    g, x, _ = extended_euclid(a, m)
-    if g != 1:
-        return None
-    return x % m
+# extended_euclid(a, b) -> (g, x, y) with a*x + b*y = g, and
+# modinv(a, m) -> inverse in 0..m-1 or None: arith_backend.invert (gmpy2 when
+# installed, else the shared iterative extended-Euclid core)
+from arith_backend import invert as modinv
+from arith_backend import is_prime, mul_mod, powmod
+from dlog_rho import rho_log
+from number_theory import extended_gcd as extended_euclid
+from ec_order import ORDER_LIMIT, group_order, point_order
+from ecdlp import PRACTICAL_LIMIT, ecdlp
+from multiscalar import multi_scalar_mul
+from wnaf import scalar_mul_wnaf
+
+_dlog = importlib.import_module("Implementation of Discrete Logarithm")
+COMPACT_TABLE_ABOVE = _dlog.COMPACT_TABLE_ABOVE
 
 # -------------------------
 # 2) DISCRETE LOGARITHM
@@ -47,15 +46,19 @@ def brute_force_discrete_log(g, h, p, limit=None):
         cur = (cur * g) % p
     return None
 
-def baby_step_giant_step(g, h, p):
+def baby_step_giant_step(g, h, p, memory_budget=None):
     """
     Solve g^x = h (mod p) using baby-step giant-step.
     Returns x or None if not found.
+    With memory_budget (bytes), or for p > COMPACT_TABLE_ABOVE, this is
+    the compact NumPy table path of "Implementation of Discrete Logarithm.py".
     """
     g %= p
     h %= p
     if p == 1:
         return 0 if h == 0 else None
+    if (memory_budget is not None or p > COMPACT_TABLE_ABOVE) and math.gcd(g, p) == 1:
+        return _dlog.baby_step_giant_step(g, h, p, memory_budget)
 
     m = math.isqrt(p) + 1
 
@@ -68,7 +71,7 @@ def baby_step_giant_step(g, h, p):
         baby_val = (baby_val * g) % p
 
     # Compute factor = g^{-m} mod p
-    gm = pow(g, m, p)
+    gm = powmod(g, m, p)
     gm_inv = modinv(gm, p)
     if gm_inv is None:
         # Fallback: try brute force (degenerate case)
@@ -78,7 +81,7 @@ def baby_step_giant_step(g, h, p):
     for i in range(m):
         if gamma in baby:
             x = i * m + baby[gamma]
-            if pow(g, x, p) == h % p:
+            if powmod(g, x, p) == h % p:
                 return x
         gamma = (gamma * gm_inv) % p
 
@@ -130,7 +133,7 @@ def point_add(P, Q, a, p):
         inv = modinv(denom, p)
         if inv is None:
             return None
-        lam = ((y2 - y1) * inv) % p
+        lam = mul_mod(y2 - y1, inv, p)
     else:
         # P == Q -> doubling
         if y1 % p == 0:
@@ -139,7 +142,7 @@ def point_add(P, Q, a, p):
         inv = modinv(denom, p)
         if inv is None:
             return None
-        lam = ((3 * x1 * x1 + a) * inv) % p
+        lam = mul_mod(3 * x1 * x1 + a, inv, p)
 
     x3 = (lam * lam - x1 - x2) % p
     y3 = (lam * (x1 - x3) - y1) % p
@@ -147,22 +150,18 @@ def point_add(P, Q, a, p):
 
 def scalar_mul(k, P, a, p):
     """
-    Scalar multiplication k * P using double-and-add (left-to-right).
-    k: non-negative integer
+    Scalar multiplication k * P using windowed-NAF double-and-add
+    (left-to-right) in Jacobian coordinates.
+    k: any integer (reduce it modulo point_order(P, a, b, p) first if large)
     """
-    if k % p == 0 or P is None:
+    if k == 0 or P is None:
         return None
     if k < 0:
         return scalar_mul(-k, point_neg(P, p), a, p)
 
-    R = None
-    Q = P
-    while k > 0:
-        if k & 1:
-            R = point_add(R, Q, a, p)
-        Q = point_add(Q, Q, a, p)
-        k >>= 1
-    return R
+    # wNAF recoding in Jacobian coordinates: no inversion until the final
+    # conversion to affine, and about n/(w+1) additions
+    return scalar_mul_wnaf(k, P, a, p)
 
 # -------------------------
 # DEMOS AND USAGE
@@ -188,11 +187,17 @@ def demo_discrete_log():
     g = int(input("Enter base g: "))
     h = int(input("Enter h: "))
     p = int(input("Enter modulus p (>1): "))
-    method = input("Method (bsgs/brute) [bsgs]: ").strip().lower() or "bsgs"
-    if method not in ("bsgs", "brute"):
+    method = input("Method (bsgs/brute/rho) [bsgs]: ").strip().lower() or "bsgs"
+    if method not in ("bsgs", "brute", "rho") or (method == "rho" and not is_prime(p)):
         method = "bsgs"
     if method == "brute":
         x = brute_force_discrete_log(g, h, p)
+    elif method == "rho":
+        # constant memory per walk; BSGS keeps sqrt(p) entries in a dict
+        stats = {}
+        x = rho_log(g, h, p, stats=stats)
+        print(f"rho: {stats['iterations']} iterations, {stats['collisions']} collision(s), "
+              f"{stats['seconds']:.3f} s")
     else:
         x = baby_step_giant_step(g, h, p)
     if x is None:
@@ -217,7 +222,8 @@ def demo_ecc():
         yP = int(input("y: "))
         P = (xP % p, yP % p)
 
-    if not is_on_curve(P, a, b, p):
+    on_curve = is_on_curve(P, a, b, p)
+    if not on_curve:
         print("Warning: The provided point P is NOT on the curve with given parameters.")
     else:
         print("Point P is on the curve.")
@@ -226,9 +232,26 @@ def demo_ecc():
     if P is None:
         print("Point at infinity selected; scalar multiples are point at infinity.")
     else:
+        n = None
+        if on_curve and p >= ORDER_LIMIT:
+            print("Order not computed (p too large)")
+        elif on_curve:
+            try:
+                N, n = group_order(a, b, p), point_order(P, a, b, p)
+                print(f"Group order #E = {N}, order of P = {n}")
+            except ValueError as exc:
+                print(f"Group order not available: {exc}")
         k = int(input("Enter scalar k to compute k*P: "))
-        R = scalar_mul(k, P, a, p)
-        print(f"{k} * P = {R}")
+        if n is None:
+            R = scalar_mul(k, P, a, p)
+            print(f"{k} * P = {R}")
+        else:
+            R = scalar_mul(k % n, P, a, p)
+            print(f"{k} * P = {k % n} * P = {R}")
+            if n < PRACTICAL_LIMIT:
+                print(f"Pollard rho recovers k mod {n} from R: {ecdlp(P, R, a, b, p, n, workers=1)}")
+            else:
+                print("Pollard rho recovery skipped (order of P too large)")
 
         # demonstration of addition/doubling
         Q = P
@@ -246,7 +269,7 @@ def demo_ecc():
 def main():
     print("Crypto Algorithms Collection")
     print("1) Extended Euclid")
-    print("2) Discrete Logarithm (BSGS & brute)")
+    print("2) Discrete Logarithm (BSGS, brute & rho)")
     print("3) Elliptic Curve Arithmetic (prime field)")
     choice = input("Choose demo (1/2/3) or press Enter to run examples: ").strip()
 
@@ -274,8 +297,10 @@ def main():
         a, b, p = 2, 3, 97
         P = (3, 6)
         print("P on curve?", is_on_curve(P, a, b, p))
+        print("#E =", group_order(a, b, p), " order of P =", point_order(P, a, b, p))
         print("2P =", scalar_mul(2, P, a, p))
         print("3P =", scalar_mul(3, P, a, p))
+        print("2P + 5P =", multi_scalar_mul([2, 5], [P, P], a, p), "(7P =", scalar_mul(7, P, a, p), ")")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
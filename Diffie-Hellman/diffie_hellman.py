@@ -1,5 +1,11 @@
 # Diffie–Hellman Key Exchange Implementation
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from arith_backend import powmod
+
 # Large prime number (p) and primitive root (g)
 # For demo, using smaller numbers but in real systems values are very large
 p = 23          # prime number
@@ -11,17 +17,17 @@ print("Primitive Root (g):", g)
 
 # ---- Alice ----
 a = int(input("Alice, enter your private key (a): "))
-A = pow(g, a, p)   # g^a mod p
+A = powmod(g, a, p)   # g^a mod p
 print("Alice's public key (A = g^a mod p):", A)
 
 # ---- Bob ----
 b = int(input("Bob, enter your private key (b): "))
-B = pow(g, b, p)   # g^b mod p
+B = powmod(g, b, p)   # g^b mod p
 print("Bob's public key (B = g^b mod p):", B)
 
 # ---- Shared Secret Calculation ----
-secret_A = pow(B, a, p)   # (g^b)^a mod p
-secret_B = pow(A, b, p)   # (g^a)^b mod p
+secret_A = powmod(B, a, p)   # (g^b)^a mod p
+secret_B = powmod(A, b, p)   # (g^a)^b mod p
 
 print("\nShared secret computed by Alice:", secret_A)
 print("Shared secret computed by Bob:  ", secret_B)
@@ -1,17 +1,22 @@
 # --------------------------------------------------------
 #   ElGamal Key Exchange + Encryption/Decryption
-#   Plain Python | No external libraries
+#   Plain Python (gmpy2 used automatically if installed)
 # --------------------------------------------------------
 
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from arith_backend import invert, powmod
 
 # Fast modular exponentiation
 def power_mod(base, exp, mod):
-    return pow(base, exp, mod)
+    return powmod(base, exp, mod)
 
-# Modular inverse using Fermat's theorem (p must be prime)
+# Modular inverse (p must be prime)
 def mod_inverse(a, p):
-    return pow(a, p - 2, p)
+    return invert(a, p)
 
 
 # ------------------------------
@@ -66,17 +71,42 @@ def elgamal_decrypt(p, x, c1, c2):
     return m
 
 
+# ------------------------------
+# Key object (for batch / service use, no printing)
+# ------------------------------
+class ElGamalPrivateKey:
+    def __init__(self, p, g, x):
+        self.p = p
+        self.g = g
+        self.x = x
+        self.y = power_mod(g, x, p)
+
+    @property
+    def public_key(self):
+        return self.p, self.g, self.y
+
+    def encrypt(self, m):
+        k = random.randint(2, self.p - 2)
+        return power_mod(self.g, k, self.p), (m * power_mod(self.y, k, self.p)) % self.p
+
+    def decrypt(self, ciphertext):
+        c1, c2 = ciphertext
+        s = power_mod(c1, self.x, self.p)
+        return (c2 * mod_inverse(s, self.p)) % self.p
+
+
 # ------------------------------
 # Main program
 # ------------------------------
-print("====== ElGamal Key Exchange + Encryption/Decryption ======\n")
+if __name__ == "__main__":
+    print("====== ElGamal Key Exchange + Encryption/Decryption ======\n")
 
-p, g, x, y = elgamal_keygen()
+    p, g, x, y = elgamal_keygen()
 
-m = int(input("\nEnter a message (as integer < p): "))
-c1, c2 = elgamal_encrypt(p, g, y, m)
+    m = int(input("\nEnter a message (as integer < p): "))
+    c1, c2 = elgamal_encrypt(p, g, y, m)
 
-decrypted = elgamal_decrypt(p, x, c1, c2)
+    decrypted = elgamal_decrypt(p, x, c1, c2)
 
-print("\nFinal Decrypted Message:", decrypted)
-print("----------------------------------------------------------")
+    print("\nFinal Decrypted Message:", decrypted)
+    print("----------------------------------------------------------")
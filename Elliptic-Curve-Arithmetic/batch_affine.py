@@ -0,0 +1,134 @@
+# Batch Affine Arithmetic via Simultaneous Inversion
+# Montgomery's trick inverts N field elements with one modular inverse and
+# about 3N multiplications: multiply them together, invert the product,
+# then peel the individual inverses back off. That makes two jobs cheap:
+#   - normalising N Jacobian points to affine (one inverse instead of N)
+#   - adding N independent affine pairs (their N slope denominators share
+#     one inverse)
+# Zero denominators (points at infinity, P + (-P)) are skipped, not inverted.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import BACKEND
+from arith_backend import invert as modinv
+from jacobian import BENCH_CURVES, from_jacobian, jacobian_add_mixed, to_jacobian
+
+
+# -----------------------------
+# Simultaneous inversion
+# -----------------------------
+def batch_inverse_mod(values, p):
+    """Inverses modulo prime p, with None wherever a value is 0 mod p."""
+    prefix = []
+    acc = 1
+    for v in values:
+        if v % p:
+            acc = acc * v % p
+        prefix.append(acc)
+    inv = modinv(acc, p)
+
+    out = [None] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        v = values[i] % p
+        if v:
+            before = prefix[i - 1] if i else 1
+            out[i] = inv * before % p
+            inv = inv * v % p
+    return out
+
+
+# -----------------------------
+# Batch normalisation
+# -----------------------------
+def batch_to_affine(points, p):
+    """Jacobian (X, Y, Z) points to affine (x, y) or None, with one inversion."""
+    z_invs = batch_inverse_mod([Z for _, _, Z in points], p)
+    out = []
+    for (X, Y, _), zi in zip(points, z_invs):
+        if zi is None:
+            out.append(None)
+        else:
+            zi2 = zi * zi % p
+            out.append((X * zi2 % p, Y * zi2 * zi % p))
+    return out
+
+
+# -----------------------------
+# Batch point addition
+# -----------------------------
+def batch_point_add(pairs, a, p):
+    """[P + Q for (P, Q) in pairs] over affine points, sharing one inversion."""
+    denominators = []
+    for P, Q in pairs:
+        if P is None or Q is None:
+            denominators.append(0)
+        elif P[0] != Q[0]:
+            denominators.append(Q[0] - P[0])
+        elif (P[1] + Q[1]) % p == 0:
+            denominators.append(0)              # P + (-P) or doubling a 2-torsion point
+        else:
+            denominators.append(2 * P[1])
+    inverses = batch_inverse_mod(denominators, p)
+
+    out = []
+    for (P, Q), inv in zip(pairs, inverses):
+        if inv is None:
+            out.append(Q if P is None else P if Q is None else None)
+            continue
+        x1, y1 = P
+        x2, y2 = Q
+        if x1 != x2:
+            lam = (y2 - y1) * inv % p
+        else:
+            lam = (3 * x1 * x1 + a) * inv % p
+        x3 = (lam * lam - x1 - x2) % p
+        out.append((x3, (lam * (x1 - x3) - y1) % p))
+    return out
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark(count=5000):
+    from elliptic_curve_arithmetic import point_add
+
+    print(f"\n--- Batch affine arithmetic, points per second ({BACKEND} inverses) ---")
+    print(f"{'curve':>10} {'operation':>12} {'one by one':>12} {'batched':>12} {'speedup':>8}")
+    for name, (a, b, p, G) in BENCH_CURVES.items():
+        # a chain of Jacobian multiples of G as the input set
+        jac = [to_jacobian(G)]
+        for _ in range(count - 1):
+            jac.append(jacobian_add_mixed(jac[-1], G, a, p))
+
+        start = time.perf_counter()
+        single = [from_jacobian(P, p) for P in jac]
+        t_single = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = batch_to_affine(jac, p)
+        t_batch = time.perf_counter() - start
+        assert single == batched
+        print(f"{name:>10} {'to affine':>12} {count / t_single:>12,.0f} {count / t_batch:>12,.0f} "
+              f"{t_single / t_batch:>7.1f}x")
+
+        pairs = [(random.choice(single), random.choice(single)) for _ in range(count)]
+        start = time.perf_counter()
+        single = [point_add(P, Q, a, p) for P, Q in pairs]
+        t_single = time.perf_counter() - start
+        start = time.perf_counter()
+        batched = batch_point_add(pairs, a, p)
+        t_batch = time.perf_counter() - start
+        assert single == batched
+        print(f"{name:>10} {'pair add':>12} {count / t_single:>12,.0f} {count / t_batch:>12,.0f} "
+              f"{t_single / t_batch:>7.1f}x")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,125 @@
+# Named Elliptic Curves
+# Registry of standard short-Weierstrass curves y^2 = x^3 + a*x + b over
+# F_p with generator G, prime order n and cofactor h. Parameters are
+# validated the first time a curve is looked up.
+#
+# The primes have special forms (secp256k1: 2^256 - 2^32 - 977, P-256 and
+# P-384: Solinas primes) that allow reduction without division, but under
+# CPython a single built-in % runs in C and beats any fold written in
+# Python, so the point formulas reduce with % throughout.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import is_prime
+
+
+# -----------------------------
+# Curve records
+# -----------------------------
+class Curve:
+    """Short-Weierstrass curve with generator G of prime order n and cofactor h."""
+    __slots__ = ("name", "p", "a", "b", "G", "n", "h", "validated")
+
+    def __init__(self, name, p, a, b, G, n, h):
+        self.name, self.p, self.a, self.b = name, p, a, b
+        self.G, self.n, self.h = G, n, h
+        self.validated = False
+
+    @property
+    def bits(self):
+        return self.p.bit_length()
+
+    def is_on_curve(self, P):
+        if P is None:
+            return True
+        x, y = P
+        return (y * y - (x * x * x + self.a * x + self.b)) % self.p == 0
+
+    def validate(self):
+        """Check the domain parameters; raises ValueError on the first problem."""
+        from wnaf import scalar_mul_wnaf
+
+        p, a, b, n, h = self.p, self.a, self.b, self.n, self.h
+        if not is_prime(p):
+            raise ValueError(f"{self.name}: field modulus is not prime")
+        if (4 * a * a * a + 27 * b * b) % p == 0:
+            raise ValueError(f"{self.name}: curve is singular")
+        if not self.is_on_curve(self.G):
+            raise ValueError(f"{self.name}: generator is not on the curve")
+        if not is_prime(n) or scalar_mul_wnaf(n, self.G, a, p) is not None:
+            raise ValueError(f"{self.name}: n is not the prime order of G")
+        # Hasse: |#E - (p + 1)| <= 2*sqrt(p), and #E = h*n
+        t = p + 1 - h * n
+        if t * t > 4 * p:
+            raise ValueError(f"{self.name}: h*n is outside the Hasse interval")
+        self.validated = True
+        return self
+
+    def __repr__(self):
+        return f"Curve({self.name!r}, {self.bits}-bit)"
+
+
+_P256 = 2**256 - 2**224 + 2**192 + 2**96 - 1
+_P384 = 2**384 - 2**128 - 2**96 + 2**32 - 1
+_K256 = 2**256 - 2**32 - 977
+
+CURVES = {
+    "secp256k1": Curve(
+        "secp256k1", _K256, 0, 7,
+        (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+         0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8),
+        0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141, 1,
+    ),
+    "P-256": Curve(
+        "P-256", _P256, -3,
+        0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B,
+        (0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+         0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5),
+        0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551, 1,
+    ),
+    "P-384": Curve(
+        "P-384", _P384, -3,
+        0xB3312FA7E23EE7E4988E056BE3F82D19181D9C6EFE8141120314088F5013875AC656398D8A2ED19D2A85C8EDD3EC2AEF,
+        (0xAA87CA22BE8B05378EB1C71EF320AD746E1D3B628BA79B9859F741E082542A385502F25DBF55296C3A545E3872760AB7,
+         0x3617DE4A96262C6F5D9E98BF9292DC29F8F41DBD289A147CE9DA3113B5F0B8C00A60B1CE1D7E819D7A431D7C90EA0E5F),
+        0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF581A0DB248B0A77AECEC196ACCC52973, 1,
+    ),
+}
+ALIASES = {"secp256r1": "P-256", "prime256v1": "P-256", "secp384r1": "P-384"}
+
+
+def get_curve(name):
+    """Registered curve by name or alias, validated on first use."""
+    curve = CURVES.get(ALIASES.get(name, name))
+    if curve is None:
+        raise ValueError(f"Unknown curve {name!r}: choose from {', '.join(CURVES)}")
+    return curve if curve.validated else curve.validate()
+
+
+def register_curve(curve):
+    """Add a curve to the registry after validating it."""
+    CURVES[curve.name] = curve.validate()
+    return curve
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark():
+    print("\n--- Registered curves: parameter validation (seconds) ---")
+    print(f"{'curve':>10} {'bits':>5} {'h':>3} {'validate':>9}")
+    for name, curve in CURVES.items():
+        start = time.perf_counter()
+        curve.validate()
+        print(f"{name:>10} {curve.bits:>5} {curve.h:>3} {time.perf_counter() - start:>9.4f}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,244 @@
+# Elliptic-Curve Group Order and Point Order
+# #E(F_p) for y^2 = x^3 + a*x + b lies in the Hasse interval
+# [p + 1 - 2*sqrt(p), p + 1 + 2*sqrt(p)].
+#   - small p: count points directly, one Legendre symbol per x
+#   - larger p: baby-step giant-step over the Hasse interval finds an m
+#     with m*P = O for random points P; once the lcm of their orders has a
+#     single multiple in the interval, that multiple is #E. When it does not
+#     (large 2- or 3-torsion, say) points on the quadratic twist, whose
+#     order is 2p + 2 - #E, settle it (Mestre).
+# The order of a point divides #E: strip prime factors of #E while the
+# reduced multiple still kills the point. Both results are cached.
+
+import math
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from batch_affine import batch_to_affine
+from elliptic_curve_arithmetic import is_on_curve, point_add, point_neg
+from factorization import factorize
+from jacobian import jacobian_add_mixed, to_jacobian
+from number_theory import legendre, sqrt_mod
+from wnaf import curve_points, scalar_mul_wnaf
+
+NAIVE_LIMIT = 1 << 12       # BSGS is already faster above ~12 bits
+ORDER_LIMIT = 1 << 64       # BSGS needs ~p^(1/4) baby steps: 2^16 here, 2^64 at 256 bits
+
+
+# -----------------------------
+# Point counting (small p)
+# -----------------------------
+def count_points_naive(a, b, p):
+    """#E(F_p) including the point at infinity, in O(p)."""
+    squares = bytearray(p)
+    for y in range(1, (p + 1) // 2):
+        squares[y * y % p] = 1
+    count = 1
+    for x in range(p):
+        rhs = (x * x * x + a * x + b) % p
+        count += 1 if rhs == 0 else 2 * squares[rhs]
+    return count
+
+
+# -----------------------------
+# Baby-step giant-step over the Hasse interval
+# -----------------------------
+def hasse_interval(p):
+    w = math.isqrt(4 * p)
+    return p + 1 - w, p + 1 + w
+
+
+def random_point(a, b, p, rng=random):
+    while True:
+        x = rng.randrange(p)
+        y = sqrt_mod(x * x * x + a * x + b, p)
+        if y is not None and y:
+            return (x, y)
+
+
+def _killing_multiple(P, a, p, lo, hi):
+    """Some m in [lo, hi] with m*P = O (None if there is none)."""
+    width = hi - lo
+    s = math.isqrt(width) + 1
+    # baby steps: j*P for j = 1..s, keyed by affine point
+    jac = [to_jacobian(P)]
+    for _ in range(s - 1):
+        jac.append(jacobian_add_mixed(jac[-1], P, a, p))
+    baby = {}
+    for j, Q in enumerate(batch_to_affine(jac, p), 1):
+        baby.setdefault(Q, j)
+    # giant steps: R = (lo + k*s)*P; R = -j*P means (lo + k*s + j)*P = O
+    step = scalar_mul_wnaf(s, P, a, p)
+    R = scalar_mul_wnaf(lo, P, a, p)
+    for k in range(s + 1):
+        if R is None:
+            return lo + k * s
+        j = baby.get(point_neg(R, p))
+        if j is not None and lo + k * s + j <= hi:
+            return lo + k * s + j
+        R = point_add(R, step, a, p)
+    return None
+
+
+def _order_dividing(P, m, a, p):
+    """Order of P given some m with m*P = O."""
+    order = m
+    for q in factorize(m, workers=1):
+        while order % q == 0 and scalar_mul_wnaf(order // q, P, a, p) is None:
+            order //= q
+    return order
+
+
+def _twist(a, b, p):
+    d = 2
+    while legendre(d, p) != -1:
+        d += 1
+    return a * d * d % p, b * d * d * d % p
+
+
+@lru_cache(maxsize=1024)
+def group_order(a, b, p, seed=None):
+    """#E(F_p) for y^2 = x^3 + a*x + b over prime 3 < p < ORDER_LIMIT."""
+    if p >= ORDER_LIMIT:
+        raise ValueError(f"p is too large to count points ({p.bit_length()} bits, "
+                         f"limit {ORDER_LIMIT.bit_length() - 1}); Schoof/SEA would be needed")
+    a, b = a % p, b % p
+    if (4 * a * a * a + 27 * b * b) % p == 0:
+        raise ValueError("curve is singular")
+    if p < NAIVE_LIMIT:
+        return count_points_naive(a, b, p)
+
+    rng = random.Random(seed)
+    lo, hi = hasse_interval(p)
+    ta, tb = _twist(a, b, p)
+    l_curve = l_twist = 1
+    for attempt in range(64):
+        # alternate between E and its twist; N must satisfy both lcms
+        on_twist = attempt % 2 == 1
+        ca, cb = (ta, tb) if on_twist else (a, b)
+        P = random_point(ca, cb, p, rng)
+        L = l_twist if on_twist else l_curve
+        if scalar_mul_wnaf(L, P, ca, p) is not None:
+            t_lo, t_hi = (2 * p + 2 - hi, 2 * p + 2 - lo) if on_twist else (lo, hi)
+            m = _killing_multiple(P, ca, p, t_lo, t_hi)
+            L = math.lcm(L, _order_dividing(P, m, ca, p))
+            if on_twist:
+                l_twist = L
+            else:
+                l_curve = L
+        candidates = [N for N in range(lo + (-lo) % l_curve, hi + 1, l_curve)
+                      if (2 * p + 2 - N) % l_twist == 0]
+        if len(candidates) == 1:
+            return candidates[0]
+    raise ArithmeticError("group order not determined")
+
+
+@lru_cache(maxsize=4096)
+def point_order(P, a, b, p):
+    """Smallest n > 0 with n*P = O."""
+    if P is None:
+        return 1
+    if not is_on_curve(P, a, b, p):
+        raise ValueError("point is not on the curve")
+    return _order_dividing(P, group_order(a, b, p), a, p)
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def _brute_order(P, a, p):
+    n, R = 1, P
+    while R is not None:
+        R = point_add(R, P, a, p)
+        n += 1
+    return n
+
+
+def check_against_reference(small=32, bsgs_primes=20, curves=20, rng=random):
+    """
+    group_order and point_order against enumeration: every non-singular
+    curve and every point over each prime below `small`, then the BSGS
+    path on random curves (with a = 0 and b = 0 among them) over the
+    first primes above NAIVE_LIMIT.
+    """
+    from arith_backend import is_prime
+
+    def check(a, b, p, points):
+        N = len(points) + 1
+        if group_order(a, b, p) != N:
+            raise AssertionError(f"#E for ({a}, {b}, {p}) is {N}, not {group_order(a, b, p)}")
+        for P in points:
+            if point_order(P, a, b, p) != _brute_order(P, a, p):
+                raise AssertionError(f"order of {P} on ({a}, {b}, {p})")
+
+    for p in range(5, small):
+        if not is_prime(p):
+            continue
+        for a in range(p):
+            for b in range(p):
+                if (4 * a ** 3 + 27 * b * b) % p:
+                    check(a, b, p, curve_points(a, b, p))
+
+    p = NAIVE_LIMIT
+    for _ in range(bsgs_primes):
+        p += 1
+        while not is_prime(p):
+            p += 1
+        choices = [(0, rng.randrange(1, p)), (rng.randrange(1, p), 0)]
+        choices += [(rng.randrange(p), rng.randrange(p)) for _ in range(curves)]
+        for a, b in choices:
+            if (4 * a ** 3 + 27 * b * b) % p:
+                N = count_points_naive(a, b, p)
+                if group_order(a, b, p) != N:
+                    raise AssertionError(f"#E for ({a}, {b}, {p}) is {N}, not {group_order(a, b, p)}")
+                P = random_point(a, b, p, rng)
+                if point_order(P, a, b, p) != _brute_order(P, a, p):
+                    raise AssertionError(f"order of {P} on ({a}, {b}, {p})")
+
+
+def _random_curve(bits, rng):
+    from factorization import _random_prime
+
+    while True:
+        p = _random_prime(bits)
+        a, b = rng.randrange(p), rng.randrange(p)
+        if (4 * a ** 3 + 27 * b * b) % p:
+            return a, b, p
+
+
+def benchmark(sizes=(10, 12, 16, 20, 24, 32, 40, 48, 56, 64), curves=3):
+    rng = random.Random()
+    print("\n--- Group order / point order (seconds per curve) ---")
+    print(f"{'p bits':>7} {'method':>8} {'#E':>10} {'ord(P)':>10} {'check':>6}")
+    for bits in sizes:
+        t_group = t_point = 0.0
+        ok = True
+        for _ in range(curves):
+            a, b, p = _random_curve(bits, rng)
+            start = time.perf_counter()
+            N = group_order(a, b, p)
+            t_group += time.perf_counter() - start
+            P = random_point(a, b, p, rng)
+            start = time.perf_counter()
+            n = point_order(P, a, b, p)
+            t_point += time.perf_counter() - start
+
+            ok &= N % n == 0 and scalar_mul_wnaf(n, P, a, p) is None
+            if bits <= 20 and p >= NAIVE_LIMIT:
+                ok &= N == count_points_naive(a, b, p)
+        method = "count" if 1 << (bits - 1) < NAIVE_LIMIT else "bsgs"
+        print(f"{bits:>7} {method:>8} {t_group / curves:>10.4f} {t_point / curves:>10.4f} "
+              f"{'ok' if ok else 'FAIL':>6}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
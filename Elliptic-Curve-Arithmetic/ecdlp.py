@@ -0,0 +1,298 @@
+# Elliptic-Curve Discrete Logarithms: Parallel Pollard Rho
+# Finds k with Q = k*P for P of (preferably prime) order n.
+#   - r-adding walk: X -> X + R[h(X)] with R[j] = c_j*P + d_j*Q, tracking
+#     X = c*P + d*Q; a collision c1 + d1*k = c2 + d2*k (mod n) gives k.
+#   - distinguished points: a walk runs until the x-coordinate has dp_bits
+#     zero bits and only that point is reported, so workers share one small
+#     table in the parent instead of storing whole walks.
+#   - negation map: walk on classes {X, -X} (y <= p/2), cutting the
+#     expected work by sqrt(2); a look-ahead step avoids fruitless 2-cycles
+#     and longer cycles are detected at checkpoints and left by doubling.
+# Expected iterations: sqrt(pi*n/2), or sqrt(pi*n/4) with the negation map.
+# Task scheduling and collision solving are shared with dlog_rho in
+# distinguished_points.py.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import invert, is_prime
+from distinguished_points import collision_search, default_dp_bits, expected_iterations
+from ec_order import point_order
+from elliptic_curve_arithmetic import point_add
+from multiscalar import multi_scalar_mul
+from wnaf import scalar_mul_wnaf
+
+BRUTE_FORCE_LIMIT = 1 << 10     # below this order, just walk through <P>
+TASK_STEPS = 1 << 15            # most walk steps per worker task
+PRACTICAL_LIMIT = 1 << 40       # orders solved in seconds on one core; 2^128 never is
+
+
+# -----------------------------
+# Walks
+# -----------------------------
+def _walk_table(P, Q, a, p, n, r, rng):
+    table = []
+    while len(table) < r:
+        c, d = rng.randrange(n), rng.randrange(n)
+        R = multi_scalar_mul([c, d], [P, Q], a, p)
+        if R is not None:
+            table.append((R[0], R[1], c, d))
+    return table
+
+
+def _step(x, y, table, p, negation):
+    """
+    One r-adding step from (x, y): (x', y', j, negated), or None when the
+    step would hit X = +-R[j]. With the negation map (x', y') is the class
+    representative, and a step whose successor would pick the same R[j]
+    (a fruitless 2-cycle) moves on to R[j+1].
+    """
+    rmask = len(table) - 1
+    j = x & rmask
+    for _ in range(len(table)):
+        rx, ry = table[j][0], table[j][1]
+        if x == rx:
+            return None
+        lam = (ry - y) * invert(rx - x, p) % p
+        nx = (lam * lam - x - rx) % p
+        if not negation or nx & rmask != j:
+            break
+        j = (j + 1) & rmask
+    ny = (lam * (x - nx) - y) % p
+    if negation and ny > p >> 1:
+        return nx, p - ny, j, True
+    return nx, ny, j, False
+
+
+def _escape(x, y, c, d, table, a, p):
+    """
+    Leave a fruitless cycle through (x, y) from its smallest point, doubled;
+    None if a step or the doubling reaches O, so the walk must start afresh.
+    """
+    best = (x, y, c, d)
+    cx, cy = x, y
+    while True:
+        nxt = _step(cx, cy, table, p, True)
+        if nxt is None:
+            return None
+        cx, cy, j, negated = nxt
+        c, d = c + table[j][2], d + table[j][3]
+        if negated:
+            c, d = -c, -d
+        if cx == x:
+            break
+        best = min(best, (cx, cy, c, d))
+    x, y, c, d = best
+    doubled = point_add((x, y), (x, y), a, p)
+    if doubled is None:
+        return None                     # y = 0: 2X = O
+    x, y = doubled
+    if y > p >> 1:
+        return x, p - y, -2 * c, -2 * d
+    return x, y, 2 * c, 2 * d
+
+
+def _walks(P, Q, a, p, n, table, dp_bits, negation, seed, budget):
+    """
+    Walk from random starts until `budget` steps are spent.
+    Returns ([(x, c, d) distinguished points], steps, restarts), with (c, d)
+    for the class representative of {X, -X}: a shared x is then always a
+    collision.
+    """
+    rng = random.Random(seed)
+    dmask = ((1 << dp_bits) - 1) * len(table)
+    max_length = 20 << dp_bits
+    half = p >> 1
+    # starts S, S + T, S + 2T, ...: one addition each instead of a
+    # scalar multiplication
+    sc, sd, tc, td = (rng.randrange(n) for _ in range(4))
+    S = multi_scalar_mul([sc, sd], [P, Q], a, p)
+    T = multi_scalar_mul([tc, td], [P, Q], a, p)
+    found, steps, restarts = [], 0, 0
+    while steps < budget:
+        S = point_add(S, T, a, p)
+        sc, sd = sc + tc, sd + td
+        if S is None:
+            continue
+        (x, y), c, d = S, sc, sd
+        if negation and y > half:
+            y, c, d = p - y, -c, -d
+        length, mark = 0, x
+        while x & dmask and length <= max_length:
+            nxt = _step(x, y, table, p, negation)
+            if nxt is None:
+                break                   # X = +-R[j]: start afresh
+            x, y, j, negated = nxt
+            c, d = c + table[j][2], d + table[j][3]
+            if negated:
+                c, d = -c, -d
+            length += 1
+            if negation:
+                # the negation map still admits longer fruitless cycles;
+                # a walk that returns to its last checkpoint is in one
+                if x == mark:
+                    escaped = _escape(x, y, c, d, table, a, p)
+                    if escaped is None:
+                        break           # reached O: start afresh
+                    x, y, c, d = escaped
+                    mark = x
+                elif length & 63 == 0:
+                    mark = x
+        steps += max(1, length)        # a degenerate start still costs a step
+        if x & dmask:
+            restarts += 1
+            continue
+        if y > half:
+            c, d = -c, -d
+        found.append((x, c % n, d % n))
+    return found, steps, restarts
+
+
+def _brute_force(P, Q, a, p, n):
+    R = None
+    for k in range(n):
+        if R == Q:
+            return k
+        R = point_add(R, P, a, p)
+    return None
+
+
+# -----------------------------
+# Solver
+# -----------------------------
+def ecdlp(P, Q, a, b, p, n=None, workers=None, negation=True, r=32, dp_bits=None,
+          max_iterations=None, seed=None, stats=None):
+    """
+    k in [0, n) with k*P = Q by parallel Pollard rho.
+
+    n is the order of P (computed when omitted); rho assumes n prime or
+    nearly so - split composite orders with Pohlig-Hellman first. r must be
+    a power of two. If `stats` is a dict it receives iterations, expected,
+    distinguished, collisions, restarts, workers and seconds. Raises
+    ValueError if n*Q != O and ArithmeticError once max_iterations group
+    operations (default 50x expected) pass without a solution.
+    """
+    start = time.perf_counter()
+    if n is None:
+        n = point_order(P, a, b, p)
+    if scalar_mul_wnaf(n, Q, a, p) is not None:
+        raise ValueError("Q is not in a group of order n")
+    if r & (r - 1) or r < 2:
+        raise ValueError("r must be a power of two")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if dp_bits is None:
+        dp_bits = default_dp_bits(n)
+    expected = expected_iterations(n, negation)
+    if max_iterations is None:
+        max_iterations = 50 * expected + (workers << (dp_bits + 4))
+    report = {"iterations": 0, "expected": expected, "distinguished": 0,
+              "collisions": 0, "restarts": 0, "workers": workers, "seconds": 0.0}
+
+    k = None
+    if Q is None:
+        k = 0
+    elif n < BRUTE_FORCE_LIMIT:
+        k = _brute_force(P, Q, a, p, n)
+        if k is None:
+            raise ValueError("Q is not a multiple of P")
+    else:
+        rng = random.Random(seed)
+        args = (P, Q, a, p, n, _walk_table(P, Q, a, p, n, r, rng), dp_bits, negation)
+        k = collision_search(_walks, args, n, lambda k: scalar_mul_wnaf(k, P, a, p) == Q,
+                             expected, dp_bits, workers, TASK_STEPS, max_iterations, rng, report)
+
+    report["seconds"] = time.perf_counter() - start
+    if stats is not None:
+        stats.update(report)
+    return k
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(rng=None):
+    """
+    ecdlp against the known k: every multiple of every point of a toy
+    curve (the brute-force path), then every second k below a prime order
+    n just above BRUTE_FORCE_LIMIT with the negation map and every fifth
+    without it (the rho walks); Q outside <P> must raise ValueError.
+    """
+    from wnaf import TOY_CURVES, curve_points
+
+    rng = rng or random.Random(1)
+    a, b, p = TOY_CURVES["y^2=x^3+2x+3/97"]
+    points = curve_points(a, b, p)
+    for P in points:
+        n = point_order(P, a, b, p)
+        for k in range(n):
+            if ecdlp(P, scalar_mul_wnaf(k, P, a, p), a, b, p, n, workers=1) != k:
+                raise AssertionError(f"ecdlp: {k} * {P} on the mod-{p} curve")
+        outside = next((Q for Q in points if scalar_mul_wnaf(n, Q, a, p) is not None), None)
+        if outside is not None:
+            try:
+                ecdlp(P, outside, a, b, p, n, workers=1)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"ecdlp accepted {outside} outside <{P}>")
+
+    while True:
+        a, b, p, G = prime_order_curve(BRUTE_FORCE_LIMIT.bit_length() + 1, rng)
+        n = point_order(G, a, b, p)
+        if n > BRUTE_FORCE_LIMIT:
+            break
+    for negation, stride in ((True, 2), (False, 5)):
+        for k in range(0, n, stride):
+            Q = scalar_mul_wnaf(k, G, a, p)
+            if ecdlp(G, Q, a, b, p, n, workers=1, negation=negation, seed=k) != k:
+                raise AssertionError(f"ecdlp: {k} * {G} on ({a}, {b}, {p}), negation={negation}")
+
+
+def prime_order_curve(bits, rng=random):
+    """(a, b, p, G) with #E prime; G is a random point, so ord(G) = #E."""
+    from ec_order import _random_curve, group_order, random_point
+
+    while True:
+        a, b, p = _random_curve(bits, rng)
+        if is_prime(group_order(a, b, p)):
+            return a, b, p, random_point(a, b, p, rng)
+
+
+def benchmark(sizes=(24, 32, 40), instances=3):
+    """Mean iterations against sqrt(pi*n/2) / sqrt(pi*n/4); try sizes=(48, 50) for minutes-long runs."""
+    rng = random.Random()
+    cpus = os.cpu_count() or 1
+    print("\n--- Pollard rho ECDLP, prime-order curves (mean over instances) ---")
+    print(f"{'n bits':>7} {'negation':>9} {'workers':>8} {'expected':>10} {'actual':>10} "
+          f"{'ratio':>6} {'DPs':>7} {'seconds':>8}")
+    for bits in sizes:
+        curves = [prime_order_curve(bits, rng) for _ in range(instances)]
+        for negation in (False, True):
+            for workers in sorted({1, cpus}):
+                total = {"iterations": 0, "expected": 0, "distinguished": 0, "seconds": 0.0}
+                for a, b, p, G in curves:
+                    n = point_order(G, a, b, p)
+                    k = rng.randrange(1, n)
+                    stats = {}
+                    assert ecdlp(G, scalar_mul_wnaf(k, G, a, p), a, b, p, n, workers,
+                                 negation, stats=stats) == k
+                    for key in total:
+                        total[key] += stats[key]
+                mean = {key: value / instances for key, value in total.items()}
+                print(f"{bits:>7} {'on' if negation else 'off':>9} {workers:>8} "
+                      f"{mean['expected']:>10,.0f} {mean['iterations']:>10,.0f} "
+                      f"{mean['iterations'] / mean['expected']:>6.2f} "
+                      f"{mean['distinguished']:>7,.0f} {mean['seconds']:>8.2f}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -3,21 +3,17 @@
 # Curve: y^2 = x^3 + a*x + b (mod p)
 # Point at infinity is represented by None
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
 # -----------------------------
-# Extended Euclid (for inverse)
+# Modular arithmetic (Number-Theory/arith_backend: GMP or pure Python)
 # -----------------------------
-def extended_euclid(a, b):
-    if b == 0:
-        return a, 1, 0
-    g, x1, y1 = extended_euclid(b, a % b)
-    return g, y1, x1 - (a // b) * y1
-
-def modinv(a, p):
-    a %= p
-    g, x, _ = extended_euclid(a, p)
-    if g != 1:
-        return None
-    return x % p
+from arith_backend import invert as modinv
+from arith_backend import mul_mod
+from wnaf import scalar_mul_wnaf
 
 # -----------------------------
 # ECC Operations
@@ -54,19 +50,20 @@ def point_add(P, Q, a, p):
         inv = modinv((x2 - x1) % p, p)
         if inv is None:
             return None
-        lam = ((y2 - y1) * inv) % p
+        lam = mul_mod(y2 - y1, inv, p)
     else:
         # Doubling: slope = (3*x1^2 + a) / (2*y1)
         if y1 % p == 0:
             return None
         inv = modinv((2 * y1) % p, p)
-        lam = ((3 * x1 * x1 + a) * inv) % p
+        lam = mul_mod(3 * x1 * x1 + a, inv, p)
 
     x3 = (lam * lam - x1 - x2) % p
     y3 = (lam * (x1 - x3) - y1) % p
     return (x3, y3)
 
-def scalar_mul(k, P, a, p):
+def scalar_mul_affine(k, P, a, p):
+    # one inversion per add/double; kept as the reference for scalar_mul
     result = None      # point at infinity
     addend = P
 
@@ -78,6 +75,10 @@ def scalar_mul(k, P, a, p):
 
     return result
 
+def scalar_mul(k, P, a, p):
+    # wNAF digits over Jacobian coordinates: ~n/(w+1) additions, one inversion
+    return scalar_mul_wnaf(k, P, a, p)
+
 # -----------------------------
 # Main Program
 # -----------------------------
@@ -100,9 +101,20 @@ if __name__ == "__main__":
 
     print("\nPoint P is on the curve.\n")
 
+    from ec_order import ORDER_LIMIT, group_order, point_order
+    n = None
+    if p >= ORDER_LIMIT:
+        print("Order not computed (p too large)\n")
+    else:
+        try:
+            n = point_order(P, a, b, p)
+            print(f"Group order #E = {group_order(a, b, p)}, order of P = {n}\n")
+        except ValueError as exc:
+            print(f"Group order not available: {exc}\n")
+
     k = int(input("Enter scalar k for multiplication (k*P): "))
 
-    R = scalar_mul(k, P, a, p)
+    R = scalar_mul(k if n is None else k % n, P, a, p)
 
     print("\nRESULT")
     print(f"k * P = {R}")
@@ -0,0 +1,188 @@
+# SEC1 Point Encoding
+# Uncompressed:  0x04 || x || y            (1 + 2L bytes)
+# Compressed:    0x02/0x03 || x            (1 + L bytes, prefix = 2 + y mod 2)
+# Infinity:      0x00
+# L is the byte length of p. Decompression recovers y as a square root of
+# x^3 + a*x + b with number_theory.sqrt_mod (a single exponentiation on
+# p = 3 mod 4 curves such as secp256k1, P-256 and P-384).
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from curves import get_curve
+from elliptic_curve_arithmetic import is_on_curve
+from number_theory import sqrt_mod
+from wnaf import TOY_CURVES, curve_points, scalar_mul_wnaf
+
+
+def field_bytes(p):
+    return (p.bit_length() + 7) // 8
+
+
+# -----------------------------
+# Encode
+# -----------------------------
+def encode_point(P, p, compressed=True):
+    """SEC1 bytes for an affine point (None = infinity)."""
+    if P is None:
+        return b"\x00"
+    x, y = P
+    size = field_bytes(p)
+    if compressed:
+        return bytes([2 + (y & 1)]) + x.to_bytes(size, "big")
+    return b"\x04" + x.to_bytes(size, "big") + y.to_bytes(size, "big")
+
+
+# -----------------------------
+# Decode
+# -----------------------------
+def decode_point(data, a, b, p):
+    """Affine point (or None for infinity) from SEC1 bytes; ValueError if invalid."""
+    size = field_bytes(p)
+    prefix = data[0] if data else None
+    if prefix == 0 and len(data) == 1:
+        return None
+    if prefix in (2, 3) and len(data) == 1 + size:
+        x = int.from_bytes(data[1:], "big")
+        if x >= p:
+            raise ValueError("x coordinate out of range")
+        y = sqrt_mod((x * x * x + a * x + b) % p, p)
+        if y is None:
+            raise ValueError("x is not the abscissa of a curve point")
+        if (y & 1) != (prefix & 1):
+            if y == 0:
+                raise ValueError("y = 0 has no odd square root")
+            y = p - y
+        return (x, y)
+    if prefix == 4 and len(data) == 1 + 2 * size:
+        x = int.from_bytes(data[1:1 + size], "big")
+        y = int.from_bytes(data[1 + size:], "big")
+        if x >= p or y >= p or not is_on_curve((x, y), a, b, p):
+            raise ValueError("point is not on the curve")
+        return (x, y)
+    raise ValueError("not a SEC1 point encoding for this curve")
+
+
+def decode_many(blobs, a, b, p, strict=True):
+    """
+    Decode a batch of SEC1 blobs. Uncompressed points are checked with
+    is_on_curve, compressed ones by their y having a square root; with
+    strict=False invalid entries come back as False instead of raising.
+    """
+    points = []
+    for data in blobs:
+        try:
+            P = decode_point(data, a, b, p)
+        except ValueError:
+            if strict:
+                raise
+            P = False
+        points.append(P)
+    return points
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+# one toy field per sqrt_mod branch: p = 1 (mod 8), 5 (mod 8), 3 (mod 4)
+CHECK_CURVES = {**TOY_CURVES, "y^2=x^3+x+1/23": (1, 1, 23)}
+
+
+def check_against_reference(curves=CHECK_CURVES):
+    """
+    Every compressed and uncompressed encoding over each toy field decoded
+    against a table of the curve's points: valid ones give the point with
+    the right y parity, the rest raise ValueError. Also sqrt_mod for every
+    residue, encode/decode round trips and malformed lengths and prefixes.
+    """
+    for name, (a, b, p) in curves.items():
+        roots = {}
+        for y in range(p):
+            roots.setdefault(y * y % p, set()).add(y)
+        for v in range(p):
+            r = sqrt_mod(v, p)
+            if (r is None) != (v not in roots) or (r is not None and r not in roots[v]):
+                raise AssertionError(f"sqrt_mod({v}, {p}) = {r}")
+
+        size = field_bytes(p)
+        points = set(curve_points(a, b, p))
+        for x in range(1 << (8 * size)):
+            for prefix in (2, 3):
+                ys = [y for y in range(p) if (x, y) in points and y & 1 == prefix & 1]
+                data = bytes([prefix]) + x.to_bytes(size, "big")
+                _expect(decode_point, data, a, b, p, (x, ys[0]) if ys else None, name)
+            for y in range(p + 2):
+                data = b"\x04" + x.to_bytes(size, "big") + y.to_bytes(size, "big")
+                _expect(decode_point, data, a, b, p, (x, y) if (x, y) in points else None, name)
+
+        for P in [None] + sorted(points):
+            for compressed in (True, False):
+                if decode_point(encode_point(P, p, compressed), a, b, p) != P:
+                    raise AssertionError(f"{name}: round trip of {P}")
+        for data in (b"", b"\x00\x00", b"\x01" + bytes(size), b"\x02", b"\x04" + bytes(size)):
+            _expect(decode_point, data, a, b, p, None, name)
+        if decode_many([b"\x05", b"\x00"], a, b, p, strict=False) != [False, None]:
+            raise AssertionError(f"{name}: decode_many(strict=False)")
+
+
+def _expect(decode, data, a, b, p, point, name):
+    # point None here means "must be rejected"; infinity is only b"\x00"
+    try:
+        got = decode(data, a, b, p)
+    except ValueError:
+        got = None
+    if got != point:
+        raise AssertionError(f"{name}: decode_point({data.hex()}) = {got}, expected {point}")
+
+
+def benchmark(count=20000):
+    print("\n--- SEC1 decoding, points per second ---")
+    print(f"{'curve':>10} {'p mod 8':>8} {'compressed':>11} {'uncompressed':>13} {'bytes c/u':>10}")
+    for name in ("secp256k1", "P-256", "P-384"):
+        curve = get_curve(name)
+        a, b, p = curve.a, curve.b, curve.p
+        P = scalar_mul_wnaf(random.getrandbits(256), curve.G, a, p)
+        base = [scalar_mul_wnaf(random.getrandbits(64), P, a, p) for _ in range(200)]
+        pts = base * (count // len(base))
+
+        rates = []
+        for compressed in (True, False):
+            blobs = [encode_point(Q, p, compressed) for Q in pts]
+            start = time.perf_counter()
+            decoded = decode_many(blobs, a, b, p)
+            rates.append(len(blobs) / (time.perf_counter() - start))
+            assert decoded == pts
+        sizes = f"{len(encode_point(P, p))}/{len(encode_point(P, p, False))}"
+        print(f"{name:>10} {p % 8:>8} {rates[0]:>11,.0f} {rates[1]:>13,.0f} {sizes:>10}")
+
+    print("\n--- Modular square roots per second by method ---")
+    from number_theory import _tonelli_shanks
+
+    cases = [
+        ("p = 3 mod 4", get_curve("P-256").p),
+        ("p = 5 mod 8", 2**255 - 19),
+        ("p = 1 mod 8", 2**224 - 2**96 + 1),
+    ]
+    for label, p in cases:
+        squares = [random.randrange(p) ** 2 % p for _ in range(500)]
+        start = time.perf_counter()
+        roots = [sqrt_mod(s, p) for s in squares]
+        fast = len(squares) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for s in squares:
+            _tonelli_shanks(s, p)
+        ts = len(squares) / (time.perf_counter() - start)
+        assert all(r * r % p == s for r, s in zip(roots, squares))
+        print(f"{label:>14}  sqrt_mod {fast:>9,.0f}   Tonelli-Shanks only {ts:>9,.0f}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
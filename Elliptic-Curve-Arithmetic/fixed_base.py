@@ -0,0 +1,289 @@
+# Fixed-Base Scalar Multiplication
+# For a generator G that never changes, precompute j * 2^(w*i) * G for
+# every window i of a `bits`-bit scalar and every digit j = 1 .. 2^(w-1).
+# With the scalar recoded into signed base-2^w digits, k*G is then one
+# mixed addition per non-zero digit: about bits/w additions and no
+# doublings at all.
+#
+# Tables can be cached on disk: a short header followed by every entry in
+# SEC1 uncompressed form (0x04 || x || y, or a single 0x00 for infinity).
+# The default cache directory is private to the user, and a loaded table is
+# checked point by point before use, so a stale or damaged file is rebuilt
+# instead of producing wrong multiples.
+
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from batch_affine import batch_to_affine
+from jacobian import (
+    BENCH_CURVES, INFINITY, from_jacobian, jacobian_add_mixed, jacobian_double,
+    to_jacobian,
+)
+from disk_cache import atomic_write, cache_file
+from wnaf import TOY_CURVES, curve_points, scalar_mul_wnaf
+
+MAGIC = b"ECFB"
+VERSION = 1
+HEADER = struct.Struct(">4sBBHI")      # magic, version, w, field bytes, bits
+
+
+# -----------------------------
+# Scalar recoding
+# -----------------------------
+def signed_digits(k, w, windows):
+    """k >= 0 as `windows` digits in (-2^(w-1), 2^(w-1)], least significant first."""
+    digits = []
+    half, full = 1 << (w - 1), 1 << w
+    for _ in range(windows):
+        d = k & (full - 1)
+        k >>= w
+        if d > half:
+            d -= full
+            k += 1
+        digits.append(d)
+    return digits
+
+
+# -----------------------------
+# Precomputed table
+# -----------------------------
+class FixedBaseTable:
+    """
+    rows[i][j-1] = j * 2^(w*i) * G (affine, or None) for scalars up to
+    `bits` bits. Larger or negative scalars fall back to wNAF.
+    """
+
+    def __init__(self, G, a, p, bits, w=4, rows=None):
+        self.G, self.a, self.p, self.bits, self.w = G, a, p, bits, w
+        self.windows = bits // w + 1          # one extra for the recoding carry
+        self.rows = rows if rows is not None else self._build()
+
+    def _build(self):
+        a, p, w = self.a, self.p, self.w
+        # row bases 2^(w*i) * G, made affine together for the mixed additions
+        bases = [to_jacobian(self.G)]
+        for _ in range(self.windows - 1):
+            E = bases[-1]
+            for _ in range(w):
+                E = jacobian_double(E, a, p)
+            bases.append(E)
+        rows = []
+        for base in batch_to_affine(bases, p):
+            row = [to_jacobian(base)]
+            for _ in range((1 << (w - 1)) - 1):
+                row.append(jacobian_add_mixed(row[-1], base, a, p))
+            rows.append(row)
+        # and one more inversion for every entry: two for the whole table
+        flat = batch_to_affine([E for row in rows for E in row], p)
+        per_row = 1 << (w - 1)
+        return [flat[i:i + per_row] for i in range(0, len(flat), per_row)]
+
+    @property
+    def entries(self):
+        return self.windows << (self.w - 1)
+
+    def size_bytes(self):
+        """On-disk size: 1 + 2 * field bytes per entry, plus the header."""
+        return HEADER.size + self.entries * (1 + 2 * _field_bytes(self.p))
+
+    def mul(self, k):
+        """k * G as an affine point (None for infinity)."""
+        if k < 0 or k.bit_length() > self.bits:
+            return scalar_mul_wnaf(k, self.G, self.a, self.p)
+        a, p = self.a, self.p
+        R = INFINITY
+        for row, d in zip(self.rows, signed_digits(k, self.w, self.windows)):
+            if d > 0:
+                R = jacobian_add_mixed(R, row[d - 1], a, p)
+            elif d < 0:
+                Q = row[-d - 1]
+                if Q is not None:
+                    R = jacobian_add_mixed(R, (Q[0], -Q[1] % p), a, p)
+        return from_jacobian(R, p)
+
+    # --- disk cache -----------------------------------------------------
+    def save(self, path):
+        size = _field_bytes(self.p)
+        parts = [HEADER.pack(MAGIC, VERSION, self.w, size, self.bits)]
+        for row in self.rows:
+            for Q in row:
+                if Q is None:
+                    parts.append(b"\x00")
+                else:
+                    parts.append(b"\x04" + Q[0].to_bytes(size, "big") + Q[1].to_bytes(size, "big"))
+        with atomic_write(path) as f:
+            f.write(b"".join(parts))
+
+    @classmethod
+    def load(cls, path, G, a, p, bits=None, w=None):
+        """
+        Read a saved table; ValueError unless it is a well-formed table for
+        G (and for bits and w, when given) whose entries all check out.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, stored_w, size, stored_bits = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or size != _field_bytes(p) or not stored_w:
+            raise ValueError("not a fixed-base table for this curve")
+        if bits not in (None, stored_bits) or w not in (None, stored_w):
+            raise ValueError("fixed-base table has another size or window")
+        table = cls(G, a, p, stored_bits, stored_w, rows=[])
+        pos, per_row = HEADER.size, 1 << (stored_w - 1)
+        try:
+            for _ in range(table.windows):
+                row = []
+                for _ in range(per_row):
+                    if data[pos] == 0:
+                        row.append(None)
+                        pos += 1
+                    else:
+                        x = int.from_bytes(data[pos + 1:pos + 1 + size], "big")
+                        y = int.from_bytes(data[pos + 1 + size:pos + 1 + 2 * size], "big")
+                        row.append((x, y))
+                        pos += 1 + 2 * size
+                table.rows.append(row)
+        except IndexError:
+            raise ValueError("fixed-base table file is truncated") from None
+        if pos != len(data) or not table._consistent():
+            raise ValueError("fixed-base table file is corrupt or for another generator")
+        return table
+
+    def _consistent(self):
+        """Every entry is on G's curve and row i starts with 2^(w*i) * G."""
+        G, a, p = self.G, self.a, self.p
+        if self.rows[0][0] != G:
+            return False
+        b = (G[1] * G[1] - G[0] * (G[0] * G[0] + a)) % p
+        for row in self.rows:
+            for Q in row:
+                if Q is not None and (Q[1] * Q[1] - Q[0] * (Q[0] * Q[0] + a) - b) % p:
+                    return False
+        for prev, row in zip(self.rows, self.rows[1:]):
+            E = to_jacobian(prev[0])
+            for _ in range(self.w):
+                E = jacobian_double(E, a, p)
+            if not _same_point(E, row[0], p):
+                return False
+        return True
+
+    @classmethod
+    def cached(cls, G, a, p, bits, w=4, cache_dir=None):
+        """
+        Load the table for (curve, G, bits, w) from cache_dir (default: a
+        per-user directory), building and saving it on a miss. If the
+        directory cannot be used the table is built and not saved.
+        """
+        try:
+            path = cache_file("ec-fixed-base", (a, p, G, bits, w), ".ecfb", cache_dir)
+        except OSError:
+            return cls(G, a, p, bits, w)
+        try:
+            return cls.load(path, G, a, p, bits, w)
+        except (OSError, ValueError, IndexError, struct.error):
+            table = cls(G, a, p, bits, w)
+            try:
+                table.save(path)
+            except OSError:
+                pass                            # still usable, just not cached
+            return table
+
+
+def _field_bytes(p):
+    return (p.bit_length() + 7) // 8
+
+
+def _same_point(E, Q, p):
+    """Jacobian E equals affine Q (None for infinity), without an inversion."""
+    X, Y, Z = E
+    if Q is None or Z % p == 0:
+        return Q is None and Z % p == 0
+    z2 = Z * Z % p
+    return (X - Q[0] * z2) % p == 0 and (Y - Q[1] * z2 * Z) % p == 0
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(curves=TOY_CURVES, bits=7, widths=(2, 3, 4, 5)):
+    """
+    FixedBaseTable.mul against affine double-and-add for every point of each
+    toy curve as G and every k below 2^bits (past the group order, so
+    tables hold O), with a few negative k; each table also goes through
+    save and load.
+    """
+    from elliptic_curve_arithmetic import scalar_mul_affine
+
+    for w in widths:
+        for k in range(1 << (bits + w)):
+            digits = signed_digits(k, w, (bits + w) // w + 1)
+            if sum(d << (w * i) for i, d in enumerate(digits)) != k:
+                raise AssertionError(f"signed_digits({k}, {w}) = {digits}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (a, b, p) in curves.items():
+            for G in curve_points(a, b, p):
+                expected = [scalar_mul_affine(k, G, a, p) for k in range(1 << bits)]
+                for w in widths:
+                    table = FixedBaseTable(G, a, p, bits, w)
+                    path = os.path.join(tmp, f"w{w}.ecfb")
+                    table.save(path)
+                    for t in (table, FixedBaseTable.load(path, G, a, p, bits, w)):
+                        if [t.mul(k) for k in range(1 << bits)] != expected:
+                            raise AssertionError(f"{name}: fixed-base table for {G}, w={w}")
+                    for k in range(1, 4):
+                        if table.mul(-k) != scalar_mul_affine(k, (G[0], -G[1] % p), a, p):
+                            raise AssertionError(f"{name}: {-k} * {G}, w={w}")
+
+
+def benchmark(count=200):
+    a, b, p, G = BENCH_CURVES["secp256k1"]
+    scalars = [random.getrandbits(256) for _ in range(count)]
+    expected = [scalar_mul_wnaf(k, G, a, p) for k in scalars[:20]]
+
+    print("\n--- Fixed-base k*G on secp256k1: table size vs speed ---")
+    print(f"{'w':>3} {'entries':>8} {'KiB':>8} {'build s':>8} {'load s':>8} {'k*G / s':>9} {'windows':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for w in (2, 4, 6, 8):
+            start = time.perf_counter()
+            table = FixedBaseTable(G, a, p, 256, w)
+            built = time.perf_counter() - start
+            path = os.path.join(tmp, f"w{w}.ecfb")
+            table.save(path)
+            start = time.perf_counter()
+            table = FixedBaseTable.load(path, G, a, p)
+            loaded = time.perf_counter() - start
+            assert [table.mul(k) for k in scalars[:20]] == expected
+
+            start = time.perf_counter()
+            for k in scalars:
+                table.mul(k)
+            rate = count / (time.perf_counter() - start)
+            print(f"{w:>3} {table.entries:>8} {table.size_bytes() / 1024:>8.1f} {built:>8.2f} "
+                  f"{loaded:>8.3f} {rate:>9.1f} {table.windows:>8}")
+
+    print("\n--- Keypair generation (private key + k*G), keys per second ---")
+    print(f"{'curve':>10} {'wNAF':>10} {'fixed w=6':>10} {'speedup':>8}")
+    for name, (a, b, p, G) in BENCH_CURVES.items():
+        table = FixedBaseTable.cached(G, a, p, 256, 6)
+        start = time.perf_counter()
+        for _ in range(count):
+            scalar_mul_wnaf(random.getrandbits(256), G, a, p)
+        t_wnaf = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(count):
+            table.mul(random.getrandbits(256))
+        t_fixed = time.perf_counter() - start
+        print(f"{name:>10} {count / t_wnaf:>10.1f} {count / t_fixed:>10.1f} {t_wnaf / t_fixed:>7.1f}x")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -0,0 +1,176 @@
+# GLV Scalar Multiplication for a = 0 Curves
+# On y^2 = x^3 + b with p = 1 (mod 3), phi(x, y) = (beta*x, y) is a group
+# endomorphism for a cube root of unity beta mod p, and on the subgroup of
+# prime order n it acts as multiplication by a cube root of unity lambda
+# mod n. Writing k = k1 + k2*lambda (mod n) with |k1|, |k2| ~ sqrt(n) turns
+# k*P into k1*P + k2*phi(P): one joint wNAF loop with half the doublings.
+# phi(P)'s odd-multiple table is P's table with x scaled by beta, so the
+# second table costs no group operations.
+#
+# Curves without the endomorphism (a != 0, p = 2 mod 3, cofactor > 1) fall
+# back to plain wNAF through scalar_mul_glv.
+
+import random
+import time
+from functools import lru_cache
+
+from curves import get_curve
+from jacobian import INFINITY, from_jacobian, jacobian_add_mixed, jacobian_double
+from wnaf import OddMultipleTable, default_width, scalar_mul_wnaf, wnaf
+
+
+def _cube_root_of_unity(q):
+    """A primitive cube root of unity modulo a prime q = 1 (mod 3)."""
+    for g in range(2, q):
+        t = pow(g, (q - 1) // 3, q)
+        if t != 1:
+            return t
+
+
+def _short_basis(n, lam):
+    """
+    Two short vectors (a, b) with a + b*lam = 0 (mod n), from the extended
+    Euclidean sequence of (n, lam) stopped at sqrt(n).
+    """
+    r0, r1, t0, t1 = n, lam, 0, 1
+    while r1 * r1 >= n:
+        q = r0 // r1
+        r0, r1, t0, t1 = r1, r0 - q * r1, t1, t0 - q * t1
+    # now r0 >= sqrt(n) > r1
+    v1 = (r1, -t1)
+    q = r0 // r1
+    r2, t2 = r0 - q * r1, t0 - q * t1
+    v2 = min((r0, -t0), (r2, -t2), key=lambda v: v[0] * v[0] + v[1] * v[1])
+    return v1, v2
+
+
+# -----------------------------
+# Endomorphism and scalar split
+# -----------------------------
+class GLV:
+    """Endomorphism constants and lattice basis for one curve."""
+    __slots__ = ("p", "n", "beta", "lam", "v1", "v2", "g1", "g2", "shift")
+
+    def __init__(self, p, n, beta, lam):
+        self.p, self.n, self.beta, self.lam = p, n, beta, lam
+        self.v1, self.v2 = _short_basis(n, lam)
+        # c1 = round(b2*k/n), c2 = round(-b1*k/n) as a multiply and shift
+        self.shift = n.bit_length() + 2
+        self.g1 = ((self.v2[1] << self.shift) + n // 2) // n
+        self.g2 = ((-self.v1[1] << self.shift) + n // 2) // n
+
+    def split(self, k):
+        """(k1, k2) with k = k1 + k2*lam (mod n), both about sqrt(n) in size."""
+        k %= self.n
+        half = 1 << (self.shift - 1)
+        c1 = (k * self.g1 + half) >> self.shift
+        c2 = (k * self.g2 + half) >> self.shift
+        (a1, b1), (a2, b2) = self.v1, self.v2
+        return k - c1 * a1 - c2 * a2, -c1 * b1 - c2 * b2
+
+    def endomorphism(self, P):
+        return None if P is None else (self.beta * P[0] % self.p, P[1])
+
+    def recode(self, k, w):
+        """Signed wNAF digits of k1 and k2, most significant first."""
+        return tuple(_signed_wnaf(part, w)[::-1] for part in self.split(k))
+
+    def mul_digits(self, digits, P, a, w, table=None):
+        """k*P from recode(k, w); P must lie in the subgroup of order n."""
+        if P is None:
+            return None
+        if table is None:
+            table = OddMultipleTable(P, a, self.p, w)
+        phi = OddMultipleTable.from_points([self.endomorphism(Q) for Q in table.odd], a, self.p, w)
+        d1, d2 = digits
+        top = max(len(d1), len(d2))
+        d1 = (0,) * (top - len(d1)) + tuple(d1)
+        d2 = (0,) * (top - len(d2)) + tuple(d2)
+        R = INFINITY
+        for x, y in zip(d1, d2):
+            R = jacobian_double(R, a, self.p)
+            if x:
+                R = jacobian_add_mixed(R, table[x], a, self.p)
+            if y:
+                R = jacobian_add_mixed(R, phi[y], a, self.p)
+        return from_jacobian(R, self.p)
+
+    def mul(self, k, P, a, w=None):
+        if w is None:
+            w = default_width(self.n.bit_length() // 2)
+        return self.mul_digits(self.recode(k, w), P, a, w)
+
+
+def _signed_wnaf(k, w):
+    if k < 0:
+        return [-d for d in wnaf(-k, w)]
+    return wnaf(k, w)
+
+
+@lru_cache(maxsize=None)
+def glv_for(curve):
+    """GLV constants for `curve`, or None when it has no usable endomorphism."""
+    p, n = curve.p, curve.n
+    if curve.a % p or p % 3 != 1 or n is None or n % 3 != 1 or curve.h != 1:
+        return None
+    beta = _cube_root_of_unity(p)
+    lam = _cube_root_of_unity(n)
+    # pair beta with the lambda that phi actually multiplies by
+    G = curve.G
+    if scalar_mul_wnaf(lam, G, 0, p) != (beta * G[0] % p, G[1]):
+        lam = lam * lam % n
+    return GLV(p, n, beta, lam)
+
+
+def scalar_mul_glv(k, P, curve):
+    """k * P on `curve`: GLV when the curve has the endomorphism, wNAF otherwise."""
+    glv = glv_for(curve)
+    if glv is None:
+        return scalar_mul_wnaf(k, P, curve.a, curve.p)
+    return glv.mul(k, P, curve.a)
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark(count=200):
+    from elliptic_curve_arithmetic import scalar_mul_affine
+
+    print("\n--- GLV vs wNAF, scalar multiplications per second ---")
+    print(f"{'curve':>10} {'GLV':>4} {'affine':>8} {'wNAF':>8} {'GLV mul':>8} "
+          f"{'recoded':>8} {'k1 bits':>8}")
+    for name in ("secp256k1", "P-256"):
+        curve = get_curve(name)
+        a, p = curve.a, curve.p
+        glv = glv_for(curve)
+        scalars = [random.randrange(1, curve.n) for _ in range(count)]
+        points = [scalar_mul_wnaf(random.randrange(1, curve.n), curve.G, a, p) for _ in range(count)]
+
+        def rate(fn, items):
+            start = time.perf_counter()
+            results = [fn(k, P) for k, P in items]
+            return len(items) / (time.perf_counter() - start), results
+
+        pairs = list(zip(scalars, points))
+        affine, expected = rate(lambda k, P: scalar_mul_affine(k, P, a, p), pairs[:20])
+        plain, reference = rate(lambda k, P: scalar_mul_wnaf(k, P, a, p), pairs)
+        fast, results = rate(lambda k, P: scalar_mul_glv(k, P, curve), pairs)
+        assert results == reference and reference[:20] == expected
+        if glv is None:
+            recoded, k1_bits = "-", "-"
+        else:
+            w = default_width(curve.n.bit_length() // 2)
+            digits = [(glv.recode(k, w), P) for k, P in pairs]
+            pre, results = rate(lambda d, P: glv.mul_digits(d, P, a, w), digits)
+            assert results == reference
+            recoded = f"{pre:>8.0f}"
+            k1_bits = max(max(abs(x).bit_length() for x in glv.split(k)) for k in scalars)
+        print(f"{name:>10} {'yes' if glv else 'no':>4} {affine:>8.0f} {plain:>8.0f} {fast:>8.0f} "
+              f"{recoded:>8} {k1_bits:>8}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
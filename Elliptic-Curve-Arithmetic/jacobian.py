@@ -0,0 +1,168 @@
+# Elliptic Curve Arithmetic in Jacobian Coordinates
+# A point (X, Y, Z) stands for the affine point (X/Z^2, Y/Z^3); Z = 0 is the
+# point at infinity. Addition and doubling need no inversion, so a whole
+# scalar multiplication costs one modular inverse (the final conversion
+# back to affine) instead of one per group operation.
+#
+# Curve: y^2 = x^3 + a*x + b (mod p). Affine points are (x, y) tuples and
+# None is the point at infinity, exactly as in elliptic_curve_arithmetic.py.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import BACKEND
+from arith_backend import invert as modinv
+from curves import CURVES
+
+INFINITY = (1, 1, 0)
+
+
+# -----------------------------
+# Conversions
+# -----------------------------
+def to_jacobian(P):
+    if P is None:
+        return INFINITY
+    return (P[0], P[1], 1)
+
+
+def from_jacobian(P, p):
+    """Affine (x, y) or None; the only inversion in a scalar multiplication."""
+    X, Y, Z = P
+    if Z % p == 0:
+        return None
+    z_inv = modinv(Z, p)
+    z2 = z_inv * z_inv % p
+    return (X * z2 % p, Y * z2 * z_inv % p)
+
+
+def jacobian_neg(P, p):
+    X, Y, Z = P
+    return (X, -Y % p, Z)
+
+
+# -----------------------------
+# Group operations (no inversions)
+# -----------------------------
+def jacobian_double(P, a, p):
+    X, Y, Z = P
+    if Z == 0 or Y == 0:
+        return INFINITY
+    YY = Y * Y % p
+    S = 4 * X * YY % p
+    if a == 0:
+        M = 3 * X * X % p
+    else:
+        ZZ = Z * Z % p
+        M = (3 * X * X + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y * Z % p
+    return (X3, Y3, Z3)
+
+
+def jacobian_add(P, Q, a, p):
+    """P + Q with both points in Jacobian coordinates."""
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    r = (S2 - S1) % p
+    if H == 0:
+        return jacobian_double(P, a, p) if r == 0 else INFINITY
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * Z2 * H % p
+    return (X3, Y3, Z3)
+
+
+def jacobian_add_mixed(P, Q, a, p):
+    """P + Q with P Jacobian and Q affine (Z2 = 1 saves four multiplications)."""
+    if Q is None:
+        return P
+    X1, Y1, Z1 = P
+    if Z1 == 0:
+        return to_jacobian(Q)
+    x2, y2 = Q
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    r = (S2 - Y1) % p
+    if H == 0:
+        return jacobian_double(P, a, p) if r == 0 else INFINITY
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return (X3, Y3, Z3)
+
+
+# -----------------------------
+# Scalar multiplication
+# -----------------------------
+def scalar_mul_jacobian(k, P, a, p):
+    """k * P for an affine point P; left-to-right double and mixed add."""
+    if P is None or k == 0:
+        return None
+    if k < 0:
+        k, P = -k, (P[0], -P[1] % p)
+    R = INFINITY
+    for bit in bin(k)[2:]:
+        R = jacobian_double(R, a, p)
+        if bit == "1":
+            R = jacobian_add_mixed(R, P, a, p)
+    return from_jacobian(R, p)
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+# (a, b, p, G) for the two standard 256-bit curves in the registry
+BENCH_CURVES = {name: (CURVES[name].a, CURVES[name].b, CURVES[name].p, CURVES[name].G)
+                for name in ("secp256k1", "P-256")}
+
+
+def benchmark(count=50):
+    from elliptic_curve_arithmetic import scalar_mul_affine
+
+    print(f"\n--- Scalar multiplications per second (256-bit scalars, {BACKEND} inverses) ---")
+    print(f"{'curve':>10} {'affine':>10} {'jacobian':>10} {'speedup':>8}")
+    for name, (a, b, p, G) in BENCH_CURVES.items():
+        scalars = [random.getrandbits(256) for _ in range(count)]
+
+        start = time.perf_counter()
+        affine = [scalar_mul_affine(k, G, a, p) for k in scalars]
+        t_affine = time.perf_counter() - start
+
+        start = time.perf_counter()
+        jac = [scalar_mul_jacobian(k, G, a, p) for k in scalars]
+        t_jac = time.perf_counter() - start
+
+        assert affine == jac, name
+        print(f"{name:>10} {count / t_affine:>10.1f} {count / t_jac:>10.1f} {t_affine / t_jac:>7.1f}x")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
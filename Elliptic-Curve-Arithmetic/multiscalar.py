@@ -0,0 +1,177 @@
+# Multi-Scalar Multiplication: k1*P1 + k2*P2 + ... + kn*Pn
+# Straus/Shamir (few terms): every point gets its own wNAF table, and a
+# single chain of doublings serves all of them, so the sum costs about one
+# scalar multiplication's doublings plus the additions of each term.
+# Pippenger (many terms): each c-bit window of every scalar drops its point
+# into one of 2^c - 1 buckets; the buckets are summed with a running total,
+# costing about (bits/c) * (n + 2^(c+1)) additions and no per-point tables.
+
+import math
+import random
+import time
+
+from jacobian import (
+    BENCH_CURVES, INFINITY, from_jacobian, jacobian_add, jacobian_add_mixed,
+    jacobian_double,
+)
+from wnaf import TOY_CURVES, OddMultipleTable, curve_points, default_width, scalar_mul_wnaf, wnaf
+
+STRAUS_MAX_TERMS = 96         # measured crossover on 256-bit curves is ~100 terms
+
+
+# -----------------------------
+# Straus / Shamir's trick
+# -----------------------------
+def straus(scalars, points, a, p, w=None):
+    """Interleaved wNAF; best up to about a hundred terms."""
+    terms = _normalise(scalars, points, p)
+    if not terms:
+        return None
+    if w is None:
+        w = default_width(max(k.bit_length() for k, _ in terms))
+    recoded = [(wnaf(k, w), OddMultipleTable(P, a, p, w)) for k, P in terms]
+    R = INFINITY
+    for i in range(max(len(d) for d, _ in recoded) - 1, -1, -1):
+        R = jacobian_double(R, a, p)
+        for digits, table in recoded:
+            if i < len(digits) and digits[i]:
+                R = jacobian_add_mixed(R, table[digits[i]], a, p)
+    return from_jacobian(R, p)
+
+
+# -----------------------------
+# Pippenger's bucket method
+# -----------------------------
+def pippenger_window(n, bits):
+    """Bucket width c minimising (bits/c) * (n + 2^(c+1))."""
+    return min(range(1, 17), key=lambda c: math.ceil(bits / c) * (n + (2 << c)))
+
+
+def pippenger(scalars, points, a, p, c=None):
+    """Bucket method; best from about a hundred terms upwards."""
+    terms = _normalise(scalars, points, p)
+    if not terms:
+        return None
+    bits = max(k.bit_length() for k, _ in terms)
+    if c is None:
+        c = pippenger_window(len(terms), bits)
+    mask = (1 << c) - 1
+
+    R = INFINITY
+    for shift in range(((bits + c - 1) // c - 1) * c, -1, -c):
+        for _ in range(c):
+            R = jacobian_double(R, a, p)
+        buckets = [INFINITY] * (mask + 1)
+        for k, P in terms:
+            d = (k >> shift) & mask
+            if d:
+                buckets[d] = jacobian_add_mixed(buckets[d], P, a, p)
+        # sum_d d * bucket[d] = sum over j of (bucket[j] + ... + bucket[top])
+        running = total = INFINITY
+        for d in range(mask, 0, -1):
+            running = jacobian_add(running, buckets[d], a, p)
+            total = jacobian_add(total, running, a, p)
+        R = jacobian_add(R, total, a, p)
+    return from_jacobian(R, p)
+
+
+# -----------------------------
+# Dispatcher
+# -----------------------------
+def multi_scalar_mul(scalars, points, a, p):
+    """sum(k * P) over affine points (None = infinity); Straus or Pippenger by size."""
+    if len(scalars) != len(points):
+        raise ValueError("scalars and points must have the same length")
+    if len(scalars) <= STRAUS_MAX_TERMS:
+        return straus(scalars, points, a, p)
+    return pippenger(scalars, points, a, p)
+
+
+def _normalise(scalars, points, p):
+    # drop zero terms and fold the sign of negative scalars into the point
+    terms = []
+    for k, P in zip(scalars, points):
+        if P is None or k == 0:
+            continue
+        if k < 0:
+            k, P = -k, (P[0], -P[1] % p)
+        terms.append((k, P))
+    return terms
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(curves=TOY_CURVES, sums=60, rng=random):
+    """
+    Straus (w = 2..4), Pippenger (c = 1..4) and the dispatcher against a
+    sum of affine double-and-add products on the toy curves: every pair of
+    points (including O, equal and opposite points) with scalars around 0
+    and the group order, then random sums of up to 2 * STRAUS_MAX_TERMS
+    terms.
+    """
+    from elliptic_curve_arithmetic import point_add, scalar_mul_affine
+
+    def reference(scalars, points):
+        R = None
+        for k, P in zip(scalars, points):
+            if P is not None:
+                Q = scalar_mul_affine(abs(k), P if k >= 0 else (P[0], -P[1] % p), a, p)
+                R = point_add(R, Q, a, p)
+        return R
+
+    def check(scalars, points):
+        expected = reference(scalars, points)
+        got = [straus(scalars, points, a, p, w) for w in (2, 3, 4)]
+        got += [pippenger(scalars, points, a, p, c) for c in (1, 2, 3, 4)]
+        got.append(multi_scalar_mul(scalars, points, a, p))
+        if any(R != expected for R in got):
+            raise AssertionError(f"{name}: sum of {list(zip(scalars, points))[:4]}... != {expected}")
+
+    for name, (a, b, p) in curves.items():
+        points = curve_points(a, b, p) + [None]
+        N = len(points)
+        pairs = [(k1, k2) for k1 in (-1, 0, 1, 2, N - 1, N + 1) for k2 in (-N, 1, 3, N)]
+        for P in points:
+            for Q in points:
+                for k1, k2 in rng.sample(pairs, 2):
+                    check([k1, k2], [P, Q])
+        for _ in range(sums):
+            size = rng.randrange(1, 2 * STRAUS_MAX_TERMS)
+            check([rng.randrange(-4 * N, 4 * N) for _ in range(size)],
+                  [rng.choice(points) for _ in range(size)])
+
+
+def benchmark(sizes=(2, 4, 8, 32, 128, 512)):
+    a, b, p, G = BENCH_CURVES["secp256k1"]
+    pool = [scalar_mul_wnaf(random.getrandbits(256), G, a, p) for _ in range(max(sizes))]
+
+    print("\n--- Multi-scalar multiplication on secp256k1 (ms per sum) ---")
+    print(f"{'terms':>6} {'separate':>10} {'straus':>10} {'pippenger':>10} {'c':>3} {'best':>7}")
+    for n in sizes:
+        scalars = [random.getrandbits(256) for _ in range(n)]
+        points = pool[:n]
+
+        def separate():
+            R = INFINITY
+            for k, P in zip(scalars, points):
+                R = jacobian_add_mixed(R, scalar_mul_wnaf(k, P, a, p), a, p)
+            return from_jacobian(R, p)
+
+        row = []
+        results = []
+        for fn in (separate, lambda: straus(scalars, points, a, p), lambda: pippenger(scalars, points, a, p)):
+            start = time.perf_counter()
+            results.append(fn())
+            row.append((time.perf_counter() - start) * 1000)
+        assert results[0] == results[1] == results[2], n
+        print(f"{n:>6} {row[0]:>10.1f} {row[1]:>10.1f} {row[2]:>10.1f} "
+              f"{pippenger_window(n, 256):>3} {row[0] / min(row[1:]):>6.1f}x")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
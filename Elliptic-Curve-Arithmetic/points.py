@@ -0,0 +1,126 @@
+# Curve Points as Compact Objects
+# A Point carries its Curve, so code written with points never threads
+# (a, p) through every call. Both classes use __slots__: a Point is three
+# references and no per-instance __dict__, and the arithmetic underneath is
+# still the Jacobian/wNAF code working on plain integers.
+
+import random
+import sys
+import tracemalloc
+
+from curves import get_curve
+from encoding import decode_point, encode_point
+from glv import scalar_mul_glv
+from jacobian import from_jacobian, jacobian_add_mixed, to_jacobian
+
+
+class Point:
+    """Affine point on `curve`; x = y = None is the point at infinity."""
+    __slots__ = ("curve", "x", "y")
+
+    def __init__(self, curve, x=None, y=None):
+        self.curve, self.x, self.y = curve, x, y
+
+    @classmethod
+    def from_tuple(cls, curve, P):
+        """Wrap an (x, y) tuple, or None for infinity."""
+        return cls(curve) if P is None else cls(curve, P[0], P[1])
+
+    @classmethod
+    def generator(cls, curve):
+        return cls(curve, *curve.G)
+
+    @classmethod
+    def decode(cls, curve, data):
+        """From SEC1 bytes (compressed or uncompressed); ValueError if invalid."""
+        return cls.from_tuple(curve, decode_point(data, curve.a, curve.b, curve.p))
+
+    def encode(self, compressed=True):
+        return encode_point(self.to_tuple(), self.curve.p, compressed)
+
+    def to_tuple(self):
+        return None if self.x is None else (self.x, self.y)
+
+    @property
+    def is_infinity(self):
+        return self.x is None
+
+    def is_on_curve(self):
+        return self.curve.is_on_curve(self.to_tuple())
+
+    # --- group law ------------------------------------------------------
+    def __neg__(self):
+        if self.x is None:
+            return self
+        return Point(self.curve, self.x, -self.y % self.curve.p)
+
+    def __add__(self, other):
+        c = self.curve
+        if other.x is None:
+            return self
+        R = jacobian_add_mixed(to_jacobian(self.to_tuple()), (other.x, other.y), c.a, c.p)
+        return Point.from_tuple(c, from_jacobian(R, c.p))
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __mul__(self, k):
+        c = self.curve
+        if c.n is not None and c.h is not None:
+            k %= c.h * c.n              # #E = h*n; only for h = 1 is that ord(G)
+        return Point.from_tuple(c, scalar_mul_glv(k, self.to_tuple(), c))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return (isinstance(other, Point) and self.curve is other.curve
+                and self.x == other.x and self.y == other.y)
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        if self.x is None:
+            return f"Point({self.curve.name}, infinity)"
+        return f"Point({self.curve.name}, {self.x:#x}, {self.y:#x})"
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+class _DictPoint:
+    # the same fields without __slots__, for the memory comparison
+    def __init__(self, curve, x, y):
+        self.curve, self.x, self.y = curve, x, y
+
+
+def _footprint(make, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [make(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del items
+    return used / count
+
+
+def benchmark(count=100000):
+    curve = get_curve("secp256k1")
+    coords = [(random.getrandbits(256), random.getrandbits(256)) for _ in range(count)]
+
+    print("\n--- Bytes per point object (100k points; the two coordinate ints are shared) ---")
+    rows = [
+        ("(x, y) tuple", lambda i: (coords[i][0], coords[i][1])),
+        ("Point", lambda i: Point(curve, *coords[i])),
+        ("no __slots__", lambda i: _DictPoint(curve, *coords[i])),
+    ]
+    for name, make in rows:
+        print(f"{name:>14} {_footprint(make, count):>8.0f}")
+    print(f"{'coordinates':>14} {2 * sys.getsizeof(coords[0][0]):>8} (same for every representation)")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,191 @@
+# Windowed-NAF Scalar Multiplication
+# Recodes the scalar into width-w non-adjacent form: odd digits in
+# (-2^(w-1), 2^(w-1)) separated by at least w-1 zeros. The loop then does
+# one doubling per bit but only ~n/(w+1) additions, each a mixed add of an
+# entry from a per-point table of odd multiples P, 3P, ..., (2^(w-1)-1)P.
+# Negative digits are free because negating an affine point is -y.
+
+import random
+import time
+
+from batch_affine import batch_to_affine
+from jacobian import (
+    BENCH_CURVES, INFINITY, from_jacobian, jacobian_add_mixed, jacobian_double,
+    scalar_mul_jacobian, to_jacobian,
+)
+
+
+# -----------------------------
+# Scalar recoding
+# -----------------------------
+def default_width(bits):
+    """Width that minimises table cost + additions for a `bits`-bit scalar."""
+    for limit, w in ((16, 2), (40, 3), (96, 4), (288, 5), (768, 6)):
+        if bits <= limit:
+            return w
+    return 7
+
+
+def wnaf(k, w):
+    """Width-w NAF digits of k >= 0, least significant first."""
+    digits = []
+    half, full = 1 << (w - 1), 1 << w
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
+# -----------------------------
+# Odd-multiple table
+# -----------------------------
+class OddMultipleTable:
+    """Affine P, 3P, 5P, ..., (2^(w-1)-1)P; build once per point and reuse."""
+
+    def __init__(self, P, a, p, w=4):
+        self.P, self.a, self.p, self.w = P, a, p, w
+        self.odd = [P]
+        if w > 2:
+            P2 = from_jacobian(jacobian_double(to_jacobian(P), a, p), p)
+            entries = [to_jacobian(P)]
+            for _ in range((1 << (w - 2)) - 1):
+                entries.append(jacobian_add_mixed(entries[-1], P2, a, p))
+            self.odd = [P] + batch_to_affine(entries[1:], p)
+        self.neg = [None if Q is None else (Q[0], -Q[1] % p) for Q in self.odd]
+
+    @classmethod
+    def from_points(cls, odd, a, p, w):
+        """Table from already computed affine P, 3P, 5P, ..., (2^(w-1)-1)P."""
+        table = cls.__new__(cls)
+        table.P, table.a, table.p, table.w = odd[0], a, p, w
+        table.odd = list(odd)
+        table.neg = [None if Q is None else (Q[0], -Q[1] % p) for Q in table.odd]
+        return table
+
+    def __getitem__(self, d):
+        """d*P for an odd digit |d| < 2^(w-1)."""
+        return self.odd[d >> 1] if d > 0 else self.neg[-d >> 1]
+
+
+# -----------------------------
+# Scalar multiplication
+# -----------------------------
+def scalar_mul_wnaf(k, P, a, p, w=None, table=None):
+    """k * P (affine in, affine out). Pass a prebuilt table to reuse it."""
+    if P is None or k == 0:
+        return None
+    if k < 0:
+        k, P, table = -k, (P[0], -P[1] % p), None
+    if table is None:
+        table = OddMultipleTable(P, a, p, w or default_width(k.bit_length()))
+    return mul_digits(wnaf(k, table.w)[::-1], table, a, p)
+
+
+def mul_digits(digits, table, a, p):
+    """Evaluate wNAF digits (most significant first) against a point's table."""
+    R = INFINITY
+    for d in digits:
+        R = jacobian_double(R, a, p)
+        if d:
+            R = jacobian_add_mixed(R, table[d], a, p)
+    return from_jacobian(R, p)
+
+
+def operation_count(k, method="wnaf", w=4):
+    """{'doublings', 'additions', 'table'} needed for k*P by a method."""
+    if method == "binary":
+        return {"doublings": k.bit_length() - 1, "additions": bin(k).count("1") - 1, "table": 0}
+    digits = wnaf(k, w)
+    return {
+        "doublings": len(digits) - 1,
+        "additions": sum(1 for d in digits if d) - 1,
+        "table": 1 << (w - 2),
+    }
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+TOY_CURVES = {"y^2=x^3+2x+3/97": (2, 3, 97), "y^2=x^3+7/37": (0, 7, 37)}
+
+
+def curve_points(a, b, p):
+    """Every affine point of a small curve, by trying each x."""
+    squares = {}
+    for y in range(p):
+        squares.setdefault(y * y % p, []).append(y)
+    return [(x, y) for x in range(p) for y in squares.get((x * x * x + a * x + b) % p, [])]
+
+
+def check_against_reference(curves=TOY_CURVES, widths=(2, 3, 4, 5)):
+    """
+    scalar_mul_wnaf against affine double-and-add for every point of each
+    toy curve, every k in (-2N, 2N] with N = #E, and several widths; also
+    that the digits are a width-w NAF of k.
+    """
+    from elliptic_curve_arithmetic import scalar_mul_affine
+
+    for name, (a, b, p) in curves.items():
+        points = curve_points(a, b, p)
+        N = len(points) + 1
+        for k in range(4 * N):
+            for w in widths:
+                digits = wnaf(k, w)
+                if sum(d << i for i, d in enumerate(digits)) != k or any(
+                        d and (d % 2 == 0 or abs(d) >= 1 << (w - 1) or any(digits[i + 1:i + w]))
+                        for i, d in enumerate(digits)):
+                    raise AssertionError(f"wnaf({k}, {w}) = {digits}")
+        for P in points:
+            for k in range(-2 * N, 2 * N + 1):
+                expected = scalar_mul_affine(k, P, a, p) if k >= 0 else \
+                    scalar_mul_affine(-k, (P[0], -P[1] % p), a, p)
+                for w in widths:
+                    if scalar_mul_wnaf(k, P, a, p, w) != expected:
+                        raise AssertionError(f"{name}: {k} * {P} with w={w} != {expected}")
+
+
+def benchmark(count=50):
+    small = {"y^2=x^3+2x+3/97": (2, 3, 97, (3, 6)), "y^2=x^3+7/37": (0, 7, 37, (6, 1))}
+    print("\n--- Scalar multiplication: double-and-add vs wNAF (multiplications per second) ---")
+    print(f"{'curve':>16} {'bits':>5} {'w':>3} {'binary':>10} {'wnaf':>10} {'speedup':>8}")
+    for name, (a, b, p, G) in {**small, **BENCH_CURVES}.items():
+        bits = 256 if p.bit_length() > 64 else 16
+        reps = count if bits == 256 else 20 * count
+        scalars = [random.getrandbits(bits) | 1 for _ in range(reps)]
+        w = default_width(bits)
+
+        start = time.perf_counter()
+        expected = [scalar_mul_jacobian(k, G, a, p) for k in scalars]
+        t_bin = time.perf_counter() - start
+        start = time.perf_counter()
+        got = [scalar_mul_wnaf(k, G, a, p, w) for k in scalars]
+        t_wnaf = time.perf_counter() - start
+
+        assert got == expected, name
+        print(f"{name:>16} {bits:>5} {w:>3} {reps / t_bin:>10.1f} {reps / t_wnaf:>10.1f} "
+              f"{t_bin / t_wnaf:>7.2f}x")
+
+    print("\n--- Operation counts for a 256-bit scalar (average of 100) ---")
+    print(f"{'method':>8} {'w':>3} {'doublings':>10} {'additions':>10} {'table':>6} {'n/(w+1)':>8}")
+    scalars = [random.getrandbits(256) | (1 << 255) for _ in range(100)]
+    rows = [("binary", 1)] + [("wnaf", w) for w in range(2, 8)]
+    for method, w in rows:
+        counts = [operation_count(k, method, w) for k in scalars]
+        avg = {key: sum(c[key] for c in counts) / len(counts) for key in counts[0]}
+        print(f"{method:>8} {w:>3} {avg['doublings']:>10.1f} {avg['additions']:>10.1f} "
+              f"{avg['table']:>6} {256 / (w + 1):>8.1f}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -1,82 +1,62 @@
 # Elliptic Curve Diffie–Hellman (ECDH) Implementation
 
-# Elliptic Curve Parameters
-p = 37           # prime modulus
-a = 0            # curve parameter 'a'
-b = 7            # curve parameter 'b'
+import os
+import sys
 
-# Base point (generator)
-G = (2, 7)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Elliptic-Curve-Arithmetic"))
+from curves import Curve
+from ecdh import ECPrivateKey
 
+# Elliptic Curve: y^2 = x^3 + 7 (mod 37) has 39 points; G = (6, 1) generates
+# the subgroup of prime order 13 (cofactor 3). Curve and Point objects carry
+# (a, b, p) themselves; public keys come from the generator's fixed-base
+# table, shared secrets from wNAF.
+CURVE = Curve("y^2=x^3+7/37", 37, 0, 7, (6, 1), 13, 3).validate()
 
-# Function: Modular Inverse (Extended Euclid)
-def mod_inverse(k, p):
-    return pow(k, p - 2, p)
 
+def show(P):
+    # "O" is the point at infinity
+    return "O" if P is None or P.is_infinity else P.to_tuple()
 
-# Function: Point Addition
-def point_add(P, Q):
-    if P == "O":
-        return Q
-    if Q == "O":
-        return P
 
-    x1, y1 = P
-    x2, y2 = Q
-
-    if x1 == x2 and y1 != y2:
-        return "O"
-
-    if P != Q:
-        lam = ((y2 - y1) * mod_inverse((x2 - x1) % p, p)) % p
-    else:  # Point Doubling
-        lam = ((3 * x1 * x1 + a) * mod_inverse((2 * y1) % p, p)) % p
-
-    x3 = (lam * lam - x1 - x2) % p
-    y3 = (lam * (x1 - x3) - y1) % p
-
-    return (x3, y3)
-
-
-# Function: Scalar Multiplication (Double-and-Add)
-def scalar_mult(k, P):
-    result = "O"
-    addend = P
-
-    while k > 0:
-        if k & 1:
-            result = point_add(result, addend)
-        addend = point_add(addend, addend)
-        k >>= 1
-    return result
+def read_private_key(prompt):
+    d = int(input(prompt)) % CURVE.n
+    if d == 0:
+        print("Private key must not be a multiple of the group order", CURVE.n)
+        sys.exit(1)
+    return ECPrivateKey(CURVE, d)
 
 
 # -------------------------
 # ECDH Key Exchange
 # -------------------------
+def main():
+    print("Elliptic Curve Parameters:")
+    print(f"Curve: y^2 = x^3 + {CURVE.a}x + {CURVE.b} (mod {CURVE.p})")
+    print("Generator Point G =", CURVE.G)
+
+    # Alice chooses a private key 'a'
+    alice = read_private_key("\nAlice, enter your private key: ")
+    A_pub = alice.public_key
+    print("Alice's Public Key A = a*G =", show(A_pub))
 
-print("Elliptic Curve Parameters:")
-print(f"Curve: y^2 = x^3 + {a}x + {b} (mod {p})")
-print("Generator Point G =", G)
+    # Bob chooses a private key 'b'
+    bob = read_private_key("\nBob, enter your private key: ")
+    B_pub = bob.public_key
+    print("Bob's Public Key B = b*G =", show(B_pub))
 
-# Alice chooses a private key 'a'
-a_priv = int(input("\nAlice, enter your private key: "))
-A_pub = scalar_mult(a_priv, G)
-print("Alice's Public Key A = a*G =", A_pub)
+    # Shared secret keys
+    S_A = alice.exchange(B_pub)
+    S_B = bob.exchange(A_pub)
 
-# Bob chooses a private key 'b'
-b_priv = int(input("\nBob, enter your private key: "))
-B_pub = scalar_mult(b_priv, G)
-print("Bob's Public Key B = b*G =", B_pub)
+    print("\nShared Secret (Alice computes):", show(S_A))
+    print("Shared Secret (Bob computes):  ", show(S_B))
 
-# Shared secret keys
-S_A = scalar_mult(a_priv, B_pub)
-S_B = scalar_mult(b_priv, A_pub)
+    if S_A == S_B:
+        print("\n✔ ECDH Successful! Shared secret =", show(S_A))
+    else:
+        print("\n✘ Error: Secrets do not match!")
 
-print("\nShared Secret (Alice computes):", S_A)
-print("Shared Secret (Bob computes):  ", S_B)
 
-if S_A == S_B:
-    print("\n✔ ECDH Successful! Shared secret =", S_A)
-else:
-    print("\n✘ Error: Secrets do not match!")
+if __name__ == "__main__":
+    main()
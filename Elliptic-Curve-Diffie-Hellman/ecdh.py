@@ -0,0 +1,148 @@
+# ECDH Key Objects and Batch Agreement
+# ECPrivateKey holds a curve and a private scalar; its public key comes from
+# the generator's fixed-base table. ecdh_many() agrees one private key with
+# thousands of peer public keys: the private scalar is recoded to wNAF once
+# (split into two GLV half-scalars on curves like secp256k1), and large
+# batches are split across a process pool whose workers receive the key
+# once at start-up.
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Elliptic-Curve-Arithmetic"))
+
+from curves import get_curve
+from fixed_base import FixedBaseTable
+from glv import glv_for
+from points import Point
+from points import benchmark as point_memory_benchmark
+from wnaf import OddMultipleTable, default_width, mul_digits, scalar_mul_wnaf, wnaf
+
+
+# -----------------------------
+# Keys
+# -----------------------------
+@lru_cache(maxsize=None)
+def generator_table(curve):
+    """Fixed-base table for curve.G, shared by every key on the curve."""
+    bits = (curve.n or curve.p).bit_length()
+    return FixedBaseTable.cached(curve.G, curve.a, curve.p, bits, 6)
+
+
+class ECPrivateKey:
+    __slots__ = ("curve", "d", "w", "_glv", "_digits", "_public")
+
+    def __init__(self, curve, d):
+        if curve.n is not None and not 0 < d < curve.n:
+            raise ValueError("private key must be in 1 .. n-1")
+        self.curve, self.d = curve, d
+        # on a = 0 curves with the GLV endomorphism d is split once into
+        # two half-length scalars
+        self._glv = glv_for(curve)
+        if self._glv is None:
+            self.w = default_width(d.bit_length())
+            self._digits = wnaf(d, self.w)[::-1]
+        else:
+            self.w = default_width(curve.n.bit_length() // 2)
+            self._digits = self._glv.recode(d, self.w)
+        self._public = None
+
+    @classmethod
+    def generate(cls, curve):
+        return cls(curve, random.randrange(1, curve.n))
+
+    @property
+    def public_key(self):
+        if self._public is None:
+            self._public = Point.from_tuple(self.curve, generator_table(self.curve).mul(self.d))
+        return self._public
+
+    def exchange(self, peer):
+        """Shared point d * peer, or None if peer is not a valid public key."""
+        S = self._exchange(peer.to_tuple() if isinstance(peer, Point) else peer)
+        return None if S is None else Point(self.curve, S[0], S[1])
+
+    def _exchange(self, Q):
+        c = self.curve
+        if Q is None or not c.is_on_curve(Q):
+            return None
+        if c.h != 1 and c.n is not None and scalar_mul_wnaf(c.n, Q, c.a, c.p) is not None:
+            return None                 # outside the order-n subgroup
+        if self._glv is not None:
+            return self._glv.mul_digits(self._digits, Q, c.a, self.w)
+        return mul_digits(self._digits, OddMultipleTable(Q, c.a, c.p, self.w), c.a, c.p)
+
+
+# -----------------------------
+# Batch agreement
+# -----------------------------
+_worker_key = None
+
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+
+def _worker_exchange(Q):
+    return _worker_key._exchange(Q)
+
+
+def ecdh_many(private_key, peer_public_keys, workers=None, parallel_threshold=64):
+    """
+    Shared points for every peer (Point or (x, y) tuple), in order; invalid
+    peer keys give None. Batches below parallel_threshold (or workers=1)
+    run in this process.
+    """
+    peers = [Q.to_tuple() if isinstance(Q, Point) else Q for Q in peer_public_keys]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(peers) < parallel_threshold:
+        shared = [private_key._exchange(Q) for Q in peers]
+    else:
+        chunksize = max(1, len(peers) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(private_key,)) as pool:
+            shared = list(pool.map(_worker_exchange, peers, chunksize=chunksize))
+    curve = private_key.curve
+    return [None if S is None else Point(curve, S[0], S[1]) for S in shared]
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark(count=1000, curve_name="secp256k1"):
+    from elliptic_curve_arithmetic import scalar_mul_affine
+
+    curve = get_curve(curve_name)
+    server = ECPrivateKey.generate(curve)
+    clients = [ECPrivateKey.generate(curve).public_key for _ in range(count)]
+    tuples = [Q.to_tuple() for Q in clients]
+
+    print(f"\n--- ECDH agreements per second, one server key vs {count} clients ({curve_name}) ---")
+    start = time.perf_counter()
+    sample = [scalar_mul_affine(server.d, Q, curve.a, curve.p) for Q in tuples[:50]]
+    rate_affine = 50 / (time.perf_counter() - start)
+    start = time.perf_counter()
+    expected = [scalar_mul_wnaf(server.d, Q, curve.a, curve.p) for Q in tuples]
+    rate_tuple = count / (time.perf_counter() - start)
+    assert expected[:50] == sample
+
+    rows = [("tuple, affine double-and-add", rate_affine), ("tuple, wNAF per call", rate_tuple)]
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        shared = ecdh_many(server, clients, workers=workers)
+        rows.append((f"ecdh_many, {workers} worker(s)", count / (time.perf_counter() - start)))
+        assert [S.to_tuple() for S in shared] == expected
+    for name, rate in rows:
+        print(f"{name:>30} {rate:>10.1f}")
+
+    point_memory_benchmark()
+
+
+if __name__ == "__main__":
+    benchmark()
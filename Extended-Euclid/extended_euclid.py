@@ -1,16 +1,17 @@
 # Extended Euclid's Algorithm in Python
 # Computes gcd(a, b) and finds x, y such that: a*x + b*y = gcd(a, b)
 
-def extended_euclid(a, b):
-    if b == 0:
-        return a, 1, 0     # gcd, x, y
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from number_theory import extended_gcd
 
-    gcd, x1, y1 = extended_euclid(b, a % b)
 
-    # Update x and y using the results of recursion
-    x = y1
-    y = x1 - (a // b) * y1
-    return gcd, x, y
+def extended_euclid(a, b):
+    # Iterative version from the shared core, so large inputs cannot
+    # run into Python's recursion limit
+    return extended_gcd(a, b)     # gcd, x, y
 
 
 # -----------------------------
@@ -0,0 +1,108 @@
+# Vectorized Extended Euclid with NumPy
+# Runs the Euclidean steps on whole int64 arrays at once: every iteration
+# does one divmod per still-active lane, and lanes whose remainder reached
+# zero are written out and dropped from the working arrays.
+#
+# Inputs must fit in int64 with |value| < 2^63. The cofactor updates may
+# wrap in intermediate products, but the results are exact because every
+# final value is bounded by max(|a|, |b|) / gcd.
+
+import random
+import time
+
+import numpy as np
+
+from extended_euclid import extended_euclid
+
+
+# -----------------------------
+# ARRAY EXTENDED EUCLID
+# -----------------------------
+def extended_euclid_many(a_array, b_array):
+    """
+    Element-wise (g, x, y) with a*x + b*y = g and g >= 0, returned as three
+    int64 arrays; identical to extended_euclid() applied pair by pair.
+    """
+    a_in, b_in = np.broadcast_arrays(np.asarray(a_array, dtype=np.int64),
+                                     np.asarray(b_array, dtype=np.int64))
+    shape = a_in.shape
+    a_in, b_in = a_in.ravel(), b_in.ravel()
+    if (a_in == np.iinfo(np.int64).min).any() or (b_in == np.iinfo(np.int64).min).any():
+        raise ValueError("values must satisfy |v| < 2^63")
+
+    a, b = np.abs(a_in), np.abs(b_in)
+
+    # lanes with b == 0 are already finished: (a, 1, 0)
+    g = a.copy()
+    x = np.ones_like(a)
+    y = np.zeros_like(a)
+
+    with np.errstate(over="ignore"):
+        lanes = np.flatnonzero(b)
+        a, b = a[lanes], b[lanes]
+        x0, x1 = np.ones_like(a), np.zeros_like(a)
+        y0, y1 = np.zeros_like(a), np.ones_like(a)
+
+        while lanes.size:
+            q, r = np.divmod(a, b)
+            a, b = b, r
+            x0, x1 = x1, x0 - q * x1
+            y0, y1 = y1, y0 - q * y1
+
+            done = b == 0
+            if done.any():
+                finished = lanes[done]
+                g[finished], x[finished], y[finished] = a[done], x0[done], y0[done]
+                keep = ~done
+                lanes = lanes[keep]
+                a, b, x0, x1, y0, y1 = a[keep], b[keep], x0[keep], x1[keep], y0[keep], y1[keep]
+
+    x = np.where(a_in < 0, -x, x)
+    y = np.where(b_in < 0, -y, y)
+    return g.reshape(shape), x.reshape(shape), y.reshape(shape)
+
+
+def mod_inverse_many(a_array, m_array):
+    """Element-wise inverse of a modulo m in 0..m-1, or -1 where gcd(a, m) != 1."""
+    m = np.asarray(m_array, dtype=np.int64)
+    g, x, _ = extended_euclid_many(np.mod(a_array, m), m)
+    return np.where(g == 1, np.mod(x, m), -1)
+
+
+# -----------------------------
+# CHECK AND BENCHMARK
+# -----------------------------
+def check_against_scalar(a, b, samples=2000):
+    g, x, y = extended_euclid_many(a, b)
+    for i in random.sample(range(len(a)), min(samples, len(a))):
+        expected = extended_euclid(int(a[i]), int(b[i]))
+        if (int(g[i]), int(x[i]), int(y[i])) != expected:
+            raise AssertionError(f"mismatch at ({a[i]}, {b[i]}): {expected}")
+
+
+def benchmark(count=1_000_000):
+    rng = np.random.default_rng()
+    print("\n--- Vectorized Extended Euclid (pairs / second) ---")
+    print(f"{'operands':>10} {'scalar':>12} {'numpy':>12}")
+    for bits in (32, 63):
+        a = rng.integers(-(1 << bits) + 1, 1 << bits, size=count, dtype=np.int64)
+        b = rng.integers(-(1 << bits) + 1, 1 << bits, size=count, dtype=np.int64)
+        check_against_scalar(a, b)
+
+        sample = list(zip(a[:20000].tolist(), b[:20000].tolist()))
+        start = time.perf_counter()
+        for pa, pb in sample:
+            extended_euclid(pa, pb)
+        scalar = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        extended_euclid_many(a, b)
+        vector = count / (time.perf_counter() - start)
+        print(f"{str(bits) + '-bit':>10} {scalar:>12,.0f} {vector:>12,.0f}")
+
+
+# -----------------------------
+# MAIN PROGRAM
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
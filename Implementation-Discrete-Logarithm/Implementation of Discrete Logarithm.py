@@ -7,28 +7,27 @@ Solve discrete logarithm g^x ≡ h (mod p).
 Provides:
  - brute_force_discrete_log
  - baby_step_giant_step (BSGS)
+ - pohlig_hellman (prime p, smooth order of g; see pohlig_hellman.py)
+ - rho_log (prime p, Pollard rho with distinguished points; see dlog_rho.py)
+ - DiscreteLogSolver (many h for one g and p, mmap-cached table; see dlog_solver.py)
 
 Author: ChatGPT
 """
 
 import math
+import os
+import sys
 from collections import defaultdict
 
-def modinv(a, m):
-    """Modular inverse of a modulo m, returns None if inverse doesn't exist."""
-    # Extended Euclid
-    def egcd(a, b):
-        if b == 0:
-            return a, 1, 0
-        g, x1, y1 = egcd(b, a % b)
-        x = y1
-        y = x1 - (a // b) * y1
-        return g, x, y
-
-    g, x, _ = egcd(a % m, m)
-    if g != 1:
-        return None
-    return x % m
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+# Modular inverse of a modulo m, returns None if inverse doesn't exist
+from arith_backend import invert as modinv
+from arith_backend import is_prime, powmod
+from dlog_rho import rho_log
+from pohlig_hellman import is_smooth_enough, order_factors, pohlig_hellman
+
+COMPACT_TABLE_ABOVE = 1 << 40   # dict baby-step tables stop fitting in memory past here
 
 def brute_force_discrete_log(g, h, p, limit=None):
     """
@@ -44,17 +43,26 @@ def brute_force_discrete_log(g, h, p, limit=None):
         cur = (cur * g) % p
     return None
 
-def baby_step_giant_step(g, h, p):
+def baby_step_giant_step(g, h, p, memory_budget=None):
     """
     Baby-step Giant-step algorithm to solve g^x ≡ h (mod p).
     Returns x if a solution exists; otherwise returns None.
     Works even if p is composite as long as g generates the subgroup containing h.
     Complexity: O(sqrt(n)) time and memory where n is the group order (≤ p).
+    With memory_budget (bytes), or once a dict table would pass 2^20 entries,
+    the baby steps go into a compact NumPy table (bsgs_table.py) of about
+    8 bytes per entry, and a small budget means fewer baby steps and more
+    giant steps.
     """
     g %= p
     h %= p
     if p == 1:
         return 0 if h == 0 else None
+    if (memory_budget is not None or p > COMPACT_TABLE_ABOVE) and math.gcd(g, p) == 1:
+        from bsgs_table import DEFAULT_MEMORY_BUDGET, bsgs_compact
+
+        # x < ord(g), which divides phi(p) <= p - 1
+        return bsgs_compact(g, h, p, p - 1, memory_budget or DEFAULT_MEMORY_BUDGET)
 
     # m = ceil(sqrt(n)). We don't always know group order; using m = ceil(sqrt(p)) is fine.
     m = math.isqrt(p) + 1
@@ -69,7 +77,7 @@ def baby_step_giant_step(g, h, p):
         baby_val = (baby_val * g) % p
 
     # Compute g^{-m} mod p
-    gm = pow(g, m, p)
+    gm = powmod(g, m, p)
     gm_inv = modinv(gm, p)
     if gm_inv is None:
         # If gcd(gm, p) != 1, BSGS as-is cannot proceed; fall back or attempt variant.
@@ -88,25 +96,46 @@ def baby_step_giant_step(g, h, p):
                 # x = i*m + j
                 x = i * m + baby[gamma]
                 # verify
-                if pow(g, x, p) == h % p:
+                if powmod(g, x, p) == h % p:
                     return x
             # multiply gamma by g^{-m}
             gamma = (gamma * gm_inv) % p
 
     return None
 
-def solve_discrete_log(g, h, p, method='bsgs', brute_limit=1000000):
+def solve_discrete_log(g, h, p, method='auto', brute_limit=1000000, workers=None, stats=None,
+                       memory_budget=None):
     """
     Solve discrete log using chosen method.
-    method: 'bsgs' or 'brute'
+    method: 'auto', 'bsgs', 'brute', 'pohlig_hellman' or 'rho'
     brute_limit: maximum exponent to try for brute-force
+    'auto' uses Pohlig-Hellman when p is prime and the order of g is smooth
+    enough to beat BSGS, and BSGS otherwise.
+    memory_budget: byte limit for the BSGS baby-step table (compact table)
+    'rho' needs O(1) memory per walk instead of BSGS's sqrt(p) table, runs
+    its walks on `workers` processes and fills `stats` (a dict) with
+    iterations, collisions and seconds.
     """
+    if method == 'auto':
+        if p > 3 and is_prime(p) and g % p:
+            factors = order_factors(g % p, p)
+            if is_smooth_enough(factors, p):
+                return pohlig_hellman(g, h, p, factors)
+        method = 'bsgs'
     if method == 'brute':
         return brute_force_discrete_log(g, h, p, limit=brute_limit)
     elif method == 'bsgs':
-        return baby_step_giant_step(g, h, p)
+        return baby_step_giant_step(g, h, p, memory_budget)
+    elif method == 'pohlig_hellman':
+        if not is_prime(p):
+            raise ValueError("pohlig_hellman needs a prime modulus")
+        return pohlig_hellman(g, h, p)
+    elif method == 'rho':
+        if not is_prime(p):
+            raise ValueError("rho needs a prime modulus")
+        return rho_log(g, h, p, workers=workers, stats=stats)
     else:
-        raise ValueError("Unknown method: choose 'bsgs' or 'brute'")
+        raise ValueError("Unknown method: choose 'auto', 'bsgs', 'brute', 'pohlig_hellman' or 'rho'")
 
 def main():
     print("=== Discrete Logarithm Solver ===")
@@ -124,14 +153,30 @@ def main():
         print("Modulus must be > 1.")
         return
 
-    method = input("Method? (bsgs/brute) [default: bsgs]: ").strip().lower() or "bsgs"
-    if method not in ('bsgs', 'brute'):
-        print("Unknown method; using bsgs.")
-        method = 'bsgs'
+    methods = ('auto', 'bsgs', 'brute', 'pohlig_hellman', 'rho')
+    method = input("Method? (auto/bsgs/brute/pohlig_hellman/rho) [default: auto]: ").strip().lower() or "auto"
+    if method not in methods or (method in ('pohlig_hellman', 'rho') and not is_prime(p)):
+        print("Method not available here; using auto.")
+        method = 'auto'
 
     # quick trivial checks
     g_mod = g % p
     h_mod = h % p
 
     if h_mod == 1:
-        print("Trivial solution
+        print("Trivial solution: x = 0 (since g^0 ≡ 1)")
+        return
+
+    stats = {}
+    x = solve_discrete_log(g_mod, h_mod, p, method=method, stats=stats)
+    if stats:
+        print(f"Rho: {stats['iterations']} iterations (expected ~{stats['expected']:.0f}), "
+              f"{stats['collisions']} collision(s), {stats['seconds']:.3f} s")
+    if x is None:
+        print("No solution found (or not within search limits).")
+    else:
+        print(f"Solution: x = {x}")
+        print(f"Verification: {g_mod}^{x} mod {p} = {pow(g_mod, x, p)}")
+
+if __name__ == "__main__":
+    main()
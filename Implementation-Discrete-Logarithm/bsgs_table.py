@@ -0,0 +1,307 @@
+# Compact Baby-Step Tables for BSGS
+# A dict {g^j mod p: j} costs 100+ bytes per entry. CompactBabyTable keeps
+# only a truncated fingerprint of each g^j (the low 32 or 64 bits) in one
+# sorted NumPy array and the matching exponents in another - 8 bytes per
+# entry with 32-bit fingerprints. Giant steps are looked up a chunk at a
+# time with searchsorted; a fingerprint match is only a candidate and is
+# confirmed with one modular exponentiation.
+#
+# The memory budget sets the split: m = min(sqrt(n), budget / entry size)
+# baby steps and n / m giant steps, so a small budget trades memory for
+# time instead of failing.
+#
+# Tables can be saved to disk (a short header, g and p, then both arrays)
+# and memory-mapped back, so other processes reuse them without rebuilding
+# and share the pages. The default cache directory is private to the user;
+# since every hit is confirmed by exponentiation, a damaged file can cost a
+# miss but never a wrong answer.
+
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import invert, is_prime, powmod
+from disk_cache import atomic_write, cache_file
+
+DEFAULT_MEMORY_BUDGET = 1 << 28     # bytes
+BUILD_CHUNK = 1 << 16               # baby steps converted to NumPy at a time
+GIANT_CHUNK = 1 << 12               # giant steps looked up per searchsorted
+
+MAGIC = b"BSGS"
+VERSION = 1
+HEADER = struct.Struct(">4sBBIQ")   # magic, version, key bits, modulus bytes, m
+
+
+def _key_dtype(key_bits):
+    if key_bits == 32:
+        return np.uint32
+    if key_bits == 64:
+        return np.uint64
+    raise ValueError("key_bits must be 32 or 64")
+
+
+def _exponent_dtype(m):
+    return np.uint32 if m <= 1 << 32 else np.uint64
+
+
+def entry_bytes(m, key_bits=32):
+    return key_bits // 8 + np.dtype(_exponent_dtype(m)).itemsize
+
+
+def baby_steps_for(n, memory_budget=DEFAULT_MEMORY_BUDGET, key_bits=32):
+    """Number of baby steps m for a group of order n within memory_budget bytes."""
+    m = math.isqrt(n - 1) + 1 if n > 1 else 1
+    return max(1, min(m, memory_budget // entry_bytes(m, key_bits)))
+
+
+# -----------------------------
+# Table
+# -----------------------------
+class CompactBabyTable:
+    """Fingerprints of g^0 .. g^(m-1) mod p, sorted, with their exponents."""
+    __slots__ = ("g", "p", "m", "key_bits", "keys", "exponents")
+
+    def __init__(self, g, p, m, key_bits=32):
+        self.g, self.p, self.m, self.key_bits = g % p, p, m, key_bits
+        dtype = _key_dtype(key_bits)
+        mask = (1 << key_bits) - 1
+        keys = np.empty(m, dtype=dtype)
+        cur = 1
+        for start in range(0, m, BUILD_CHUNK):
+            count = min(BUILD_CHUNK, m - start)
+            chunk = []
+            for _ in range(count):
+                chunk.append(cur & mask)
+                cur = cur * self.g % p
+            keys[start:start + count] = chunk
+        # stable sort: equal fingerprints keep j ascending
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.exponents = order.astype(_exponent_dtype(m))
+
+    # --- disk cache -----------------------------------------------------
+    def save(self, path):
+        size = (self.p.bit_length() + 7) // 8
+        head = HEADER.pack(MAGIC, VERSION, self.key_bits, size, self.m)
+        head += self.g.to_bytes(size, "big") + self.p.to_bytes(size, "big")
+        head += bytes(-len(head) % 8)           # align the arrays for mmap
+        with atomic_write(path) as f:
+            f.write(head)
+            self.keys.tofile(f)
+            self.exponents.tofile(f)
+
+    @classmethod
+    def load(cls, path, g, p, m=None, key_bits=None):
+        """
+        Memory-map a saved table; the arrays are paged in on demand.
+        ValueError unless it is for (g, p), and for m and key_bits when given.
+        """
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            magic, version, stored_bits, size, stored_m = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("not a baby-step table file")
+            stored = f.read(2 * size)
+        if (int.from_bytes(stored[:size], "big"), int.from_bytes(stored[size:], "big")) != (g % p, p):
+            raise ValueError("baby-step table is for another (g, p)")
+        if m not in (None, stored_m) or key_bits not in (None, stored_bits):
+            raise ValueError("baby-step table has another size or fingerprint width")
+        m, key_bits = stored_m, stored_bits
+        offset = HEADER.size + 2 * size
+        offset += -offset % 8
+        table = cls.__new__(cls)
+        table.g, table.p, table.m, table.key_bits = g % p, p, m, key_bits
+        table.keys = np.memmap(path, dtype=_key_dtype(key_bits), mode="r", offset=offset, shape=(m,))
+        offset += table.keys.nbytes
+        table.exponents = np.memmap(path, dtype=_exponent_dtype(m), mode="r", offset=offset, shape=(m,))
+        return table
+
+    @classmethod
+    def cached(cls, g, p, m, key_bits=32, cache_dir=None):
+        """
+        Load the table for (g, p, m) from cache_dir (default: a per-user
+        directory), building it on a miss.
+        """
+        path = cache_file("bsgs-tables", (g % p, p, m, key_bits), ".bsgs", cache_dir)
+        try:
+            return cls.load(path, g, p, m, key_bits)
+        except (OSError, ValueError, struct.error):
+            table = cls(g, p, m, key_bits)
+            table.save(path)
+            return cls.load(path, g, p, m, key_bits)
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.exponents.nbytes
+
+    def candidates(self, values):
+        """(index into values, j) for every baby step whose fingerprint matches."""
+        mask = (1 << self.key_bits) - 1
+        if self.p <= 1 << 64:
+            fp = (np.array(values, dtype=np.uint64) & np.uint64(mask)).astype(self.keys.dtype)
+        else:
+            fp = np.fromiter((v & mask for v in values), dtype=self.keys.dtype, count=len(values))
+        idx = np.searchsorted(self.keys, fp)
+        hit = self.keys[np.minimum(idx, self.m - 1)] == fp
+        for k in np.flatnonzero(hit):
+            t = int(idx[k])
+            while t < self.m and self.keys[t] == fp[k]:
+                yield int(k), int(self.exponents[t])
+                t += 1
+
+    def search(self, h, giant_steps, chunk=GIANT_CHUNK):
+        """Smallest x < giant_steps * m with g^x = h (mod p), or None."""
+        p, m = self.p, self.m
+        h %= p
+        step = invert(powmod(self.g, m, p), p)
+        if step is None:
+            raise ValueError("g is not invertible modulo p")
+        gamma = h
+        for i in range(0, giant_steps, chunk):
+            gammas = []
+            for _ in range(min(chunk, giant_steps - i)):
+                gammas.append(gamma)
+                gamma = gamma * step % p
+            for k, j in self.candidates(gammas):
+                # confirmed even when fingerprints are whole values: the
+                # exponents may come from a file
+                x = (i + k) * m + j
+                if powmod(self.g, x, p) == h:
+                    return x
+        return None
+
+
+def bsgs_compact(g, h, p, n=None, memory_budget=DEFAULT_MEMORY_BUDGET, key_bits=32):
+    """
+    Baby-step giant-step for g^x = h (mod p) with x < n (default p - 1)
+    using a CompactBabyTable of at most memory_budget bytes.
+    """
+    if n is None:
+        n = p - 1
+    m = baby_steps_for(n, memory_budget, key_bits)
+    table = CompactBabyTable(g, p, m, key_bits)
+    return table.search(h, -(-n // m))
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(small=64, samples=200, rng=None):
+    """
+    CompactBabyTable.search against enumeration for every unit g and every
+    h modulo each prime below `small`, with the full sqrt split and with a
+    budget of two baby steps (ord(g) < m repeats baby values); then
+    bsgs_compact for random x modulo 2^61 - 1, where fingerprints are
+    truncated, with both key widths and a table that went through save
+    and load.
+    """
+    rng = rng or random.Random(1)
+    for p in range(3, small):
+        if not is_prime(p):
+            continue
+        for g in range(1, p):
+            logs = {}
+            cur = 1
+            for x in range(p):
+                logs.setdefault(cur, x)
+                cur = cur * g % p
+            for budget in (DEFAULT_MEMORY_BUDGET, 2 * entry_bytes(2)):
+                m = baby_steps_for(p - 1, budget)
+                table = CompactBabyTable(g, p, m)
+                for h in range(p):
+                    if table.search(h, -(-(p - 1) // m)) != logs.get(h):
+                        raise AssertionError(f"compact BSGS: {g}^x = {h} mod {p}, m={m}")
+
+    p = (1 << 61) - 1
+    with tempfile.TemporaryDirectory() as tmp:
+        for key_bits in (32, 64):
+            g = rng.randrange(2, p - 1)
+            n = 1 << 24
+            table = CompactBabyTable(g, p, 1 << 12, key_bits)
+            path = os.path.join(tmp, f"k{key_bits}.bsgs")
+            table.save(path)
+            loaded = CompactBabyTable.load(path, g, p, 1 << 12, key_bits)
+            for _ in range(samples):
+                x = rng.randrange(n)
+                h = powmod(g, x, p)
+                if bsgs_compact(g, h, p, n, entry_bytes(1 << 10, key_bits) << 10, key_bits) != x:
+                    raise AssertionError(f"bsgs_compact: {g}^{x} mod 2^61 - 1, key_bits={key_bits}")
+                if loaded.search(h, n >> 12) != x:
+                    raise AssertionError(f"loaded table: {g}^{x} mod 2^61 - 1, key_bits={key_bits}")
+            del loaded                          # release the mapping before the directory goes
+
+
+def _dict_table(g, p, m):
+    baby, cur = {}, 1
+    for j in range(m):
+        baby.setdefault(cur, j)
+        cur = cur * g % p
+    return baby
+
+
+def _dict_giant_steps(baby, h, step, p, count):
+    gamma = h
+    for _ in range(count):
+        if gamma in baby:
+            return True
+        gamma = gamma * step % p
+    return False
+
+
+def benchmark(sizes=(1 << 16, 1 << 18, 1 << 20), giant=1 << 18, p=(1 << 61) - 1):
+    """Bytes per baby-step entry and giant steps per second, dict vs compact."""
+    rng = random.Random()
+    g = rng.randrange(2, p - 1)
+    step = invert(powmod(g, 4096, p), p)
+    print(f"\n--- Baby-step tables over a {p.bit_length()}-bit prime ---")
+    print(f"{'entries':>9} {'table':>8} {'bytes/entry':>12} {'build s':>8} {'giant/s':>10}")
+    for m in sizes:
+        rows = []
+        tracemalloc.start()
+        start = time.perf_counter()
+        baby = _dict_table(g, p, m)
+        build = time.perf_counter() - start
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        h = rng.randrange(1, p)         # almost surely not hit: time the full scan
+        start = time.perf_counter()
+        _dict_giant_steps(baby, h, step, p, giant)
+        rows.append(("dict", used / m, build, giant / (time.perf_counter() - start)))
+        del baby
+
+        for key_bits in (32, 64):
+            start = time.perf_counter()
+            table = CompactBabyTable(g, p, m, key_bits)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            table.search(h, giant)
+            rows.append((f"uint{key_bits}", table.nbytes / m, build,
+                         giant / (time.perf_counter() - start)))
+            x = rng.randrange(m * 64)
+            assert table.search(powmod(g, x, p), 64) == x
+        for name, per_entry, build, rate in rows:
+            print(f"{m:>9,} {name:>8} {per_entry:>12.1f} {build:>8.2f} {rate:>10,.0f}")
+
+    print("\n--- Memory budget vs baby/giant split, n = 2^44 ---")
+    n = 1 << 44
+    for budget in (1 << 20, 1 << 24, 1 << 28, 1 << 32):
+        m = baby_steps_for(n, budget)
+        print(f"  budget {budget >> 20:>5} MiB: m = {m:>10,} baby steps, "
+              f"{-(-n // m):>12,} giant steps")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
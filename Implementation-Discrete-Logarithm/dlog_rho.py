@@ -0,0 +1,213 @@
+# Pollard Rho Discrete Logarithms modulo p (Distinguished Points)
+# Finds x with g^x = h (mod p) in O(1) memory per walk:
+#   - r-adding walk: X -> X * M[j], j = X mod r, M[j] = g^c_j * h^d_j,
+#     tracking X = g^c * h^d; a collision c1 + d1*x = c2 + d2*x (mod n)
+#     gives x, where n is the order of g.
+#   - distinguished points: each walk stops at an X whose bits above the
+#     index bits are zero and reports only that value, so worker processes
+#     keep nothing but their current walk and the parent holds about
+#     n^(1/4) entries instead of the sqrt(n) of a baby-step table.
+# Expected iterations: sqrt(pi*n/2). Task scheduling and collision solving
+# are shared with ecdlp in distinguished_points.py.
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import powmod
+from distinguished_points import collision_search, default_dp_bits, expected_iterations
+
+BRUTE_FORCE_LIMIT = 1 << 10     # below this order, just walk through <g>
+TASK_STEPS = 1 << 17            # most walk steps per worker task
+
+
+# -----------------------------
+# Walks
+# -----------------------------
+def _walk_table(g, h, p, n, r, rng):
+    table = []
+    for _ in range(r):
+        c, d = rng.randrange(n), rng.randrange(n)
+        table.append((powmod(g, c, p) * powmod(h, d, p) % p, c, d))
+    return table
+
+
+def _walks(g, h, p, n, table, dp_bits, seed, budget):
+    """
+    Walk from random starts until `budget` steps are spent.
+    Returns ([(X, c, d) distinguished points], steps, restarts).
+    """
+    rng = random.Random(seed)
+    r = len(table)
+    rmask = r - 1
+    dmask = ((1 << dp_bits) - 1) * r
+    max_length = 20 << dp_bits
+    # starts S, S*T, S*T^2, ...: one multiplication each
+    sc, sd, tc, td = (rng.randrange(n) for _ in range(4))
+    S = powmod(g, sc, p) * powmod(h, sd, p) % p
+    T = powmod(g, tc, p) * powmod(h, td, p) % p
+    found, steps, restarts = [], 0, 0
+    while steps < budget:
+        S = S * T % p
+        sc, sd = sc + tc, sd + td
+        X, c, d = S, sc, sd
+        length = 0
+        while X & dmask and length <= max_length:
+            M, mc, md = table[X & rmask]
+            X = X * M % p
+            c += mc
+            d += md
+            length += 1
+        steps += max(1, length)        # a degenerate start still costs a step
+        if X & dmask:
+            restarts += 1              # a cycle without distinguished points
+            continue
+        found.append((X, c % n, d % n))
+    return found, steps, restarts
+
+
+# -----------------------------
+# Solver
+# -----------------------------
+def rho_log(g, h, p, n=None, workers=None, r=32, dp_bits=None, max_iterations=None,
+            seed=None, stats=None):
+    """
+    x in [0, n) with g^x = h (mod p) by parallel Pollard rho, or None if h
+    is not a power of g.
+
+    n is the order of g (computed for prime p when omitted). Rho suits a
+    prime n or one with small cofactors; smooth orders are better served
+    by pohlig_hellman, which calls this for its large prime subgroups.
+    r must be a power of two. If `stats` is a dict it receives iterations,
+    expected, distinguished, collisions, restarts, workers and seconds.
+    Raises ArithmeticError once max_iterations steps (default 50x
+    expected) pass without a solution.
+    """
+    start = time.perf_counter()
+    g, h = g % p, h % p
+    if n is None and h == 1:
+        n = 1                                   # x = 0 whatever the order: skip factoring it
+    elif n is None and g:
+        from pohlig_hellman import order_factors
+
+        n = math.prod(q ** e for q, e in order_factors(g, p).items())
+    elif n is None:
+        n = 1                                   # 0 generates no subgroup of (Z/pZ)*
+    if r & (r - 1) or r < 2:
+        raise ValueError("r must be a power of two")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if dp_bits is None:
+        dp_bits = default_dp_bits(n)
+    expected = expected_iterations(n)
+    if max_iterations is None:
+        max_iterations = 50 * expected + (workers << (dp_bits + 4))
+    report = {"iterations": 0, "expected": expected, "distinguished": 0,
+              "collisions": 0, "restarts": 0, "workers": workers, "seconds": 0.0}
+
+    x = None
+    if h == 1:
+        x = 0
+    elif g == 0 or h == 0 or powmod(h, n, p) != 1:
+        pass                                    # h is outside <g>
+    elif n < BRUTE_FORCE_LIMIT:
+        cur = 1
+        for k in range(n):
+            if cur == h:
+                x = k
+                break
+            cur = cur * g % p
+    else:
+        rng = random.Random(seed)
+        args = (g, h, p, n, _walk_table(g, h, p, n, r, rng), dp_bits)
+        x = collision_search(_walks, args, n, lambda x: powmod(g, x, p) == h, expected,
+                             dp_bits, workers, TASK_STEPS, max_iterations, rng, report)
+
+    report["seconds"] = time.perf_counter() - start
+    if stats is not None:
+        stats.update(report)
+    return x
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(small=64, samples=400, rng=None):
+    """
+    rho_log against enumeration for every g and h modulo each prime below
+    `small` (the brute-force path), then against known x for the walks:
+    every second x in a prime-order subgroup just above BRUTE_FORCE_LIMIT,
+    random x for a generator of a composite order p - 1, and None for h
+    outside the subgroup.
+    """
+    from arith_backend import is_prime
+    from pohlig_hellman import safe_prime
+
+    rng = rng or random.Random(1)
+    for p in range(2, small):
+        if not is_prime(p):
+            continue
+        for g in range(1, p):
+            logs = {}
+            cur = 1
+            for x in range(p):
+                logs.setdefault(cur, x)
+                cur = cur * g % p
+            for h in range(p):
+                if rho_log(g, h, p, workers=1) != logs.get(h):
+                    raise AssertionError(f"rho_log({g}, {h}, {p}) != {logs.get(h)}")
+
+    p = safe_prime(BRUTE_FORCE_LIMIT.bit_length() + 2)
+    q = (p - 1) // 2
+    g = powmod(rng.randrange(2, p - 1), 2, p)
+    for x in range(0, q, 2):
+        if rho_log(g, powmod(g, x, p), p, q, workers=1, seed=x) != x:
+            raise AssertionError(f"rho_log: {g}^{x} mod {p}")
+    outside = next(h for h in range(2, p) if powmod(h, q, p) != 1)
+    if rho_log(g, outside, p, q, workers=1) is not None:
+        raise AssertionError(f"rho_log found a log of {outside} outside <{g}>")
+
+    g = next(c for c in range(2, p) if powmod(c, q, p) != 1 and powmod(c, 2, p) != 1)
+    for _ in range(samples):
+        x = rng.randrange(p - 1)
+        if rho_log(g, powmod(g, x, p), p, workers=1, seed=x) != x:
+            raise AssertionError(f"rho_log: {g}^{x} mod {p}, order {p - 1}")
+
+
+def benchmark(sizes=(32, 40, 48), instances=3):
+    """Safe primes p = 2q + 1, logs in the order-q subgroup; try sizes=(56,) for a long run."""
+    from pohlig_hellman import safe_prime
+
+    rng = random.Random()
+    cpus = os.cpu_count() or 1
+    print("\n--- Pollard rho DLP mod p, prime-order subgroups (mean over instances) ---")
+    print(f"{'q bits':>7} {'workers':>8} {'expected':>12} {'actual':>12} {'ratio':>6} "
+          f"{'DPs':>7} {'coll.':>6} {'seconds':>8} {'BSGS dict':>10}")
+    for bits in sizes:
+        p = safe_prime(bits + 1)
+        q = (p - 1) // 2
+        g = powmod(rng.randrange(2, p - 1), 2, p)
+        for workers in sorted({1, cpus}):
+            total = dict.fromkeys(("iterations", "expected", "distinguished", "collisions", "seconds"), 0)
+            for _ in range(instances):
+                x = rng.randrange(q)
+                stats = {}
+                assert rho_log(g, powmod(g, x, p), p, q, workers, stats=stats) == x
+                for key in total:
+                    total[key] += stats[key]
+            mean = {key: value / instances for key, value in total.items()}
+            print(f"{bits:>7} {workers:>8} {mean['expected']:>12,.0f} {mean['iterations']:>12,.0f} "
+                  f"{mean['iterations'] / mean['expected']:>6.2f} {mean['distinguished']:>7,.0f} "
+                  f"{mean['collisions']:>6.1f} {mean['seconds']:>8.2f} {math.isqrt(q) + 1:>10,}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -0,0 +1,140 @@
+# Reusable Discrete-Log Solver for one Base
+# DiscreteLogSolver(g, p) builds the baby-step table for g once - as a
+# CompactBabyTable saved under a key derived from (g, p, m) and opened with
+# mmap - and answers any number of g^x = h (mod p) queries against it. A
+# later process (or a pool worker) maps the same file instead of rebuilding,
+# and the operating system shares its pages between them.
+#
+# The table size m sets the per-query cost: a query takes at most n / m
+# giant steps, so with Q queries the total work m + Q * n / (2m) is smallest
+# near m = sqrt(Q * n / 2), well above the sqrt(n) of a single BSGS.
+
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import powmod
+from bsgs_table import DEFAULT_MEMORY_BUDGET, CompactBabyTable, baby_steps_for, entry_bytes
+
+
+def baby_steps_for_queries(n, queries, memory_budget=DEFAULT_MEMORY_BUDGET, key_bits=32):
+    """m minimising build + queries cost, m + queries * n / (2m), within the budget."""
+    m = max(1, math.isqrt(queries * n // 2))
+    return max(1, min(m, n, memory_budget // entry_bytes(m, key_bits)))
+
+
+class DiscreteLogSolver:
+    """Baby-step table for g modulo p, built or mapped once, queried many times."""
+    __slots__ = ("g", "p", "n", "m", "table")
+
+    def __init__(self, g, p, n=None, m=None, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 key_bits=32, cache_dir=None):
+        """
+        n bounds the exponents searched (the order of g, default p - 1);
+        m is the number of baby steps (default: the sqrt(n) split, capped by
+        memory_budget). The table file lives in cache_dir.
+        """
+        self.g, self.p = g % p, p
+        self.n = p - 1 if n is None else n
+        self.m = baby_steps_for(self.n, memory_budget, key_bits) if m is None else m
+        self.table = CompactBabyTable.cached(self.g, p, self.m, key_bits, cache_dir)
+
+    @property
+    def giant_steps(self):
+        """Most giant steps one query can take."""
+        return -(-self.n // self.m)
+
+    @property
+    def table_bytes(self):
+        return self.table.nbytes
+
+    def solve(self, h):
+        """Smallest x < n with g^x = h (mod p), or None."""
+        return self.table.search(h, self.giant_steps)
+
+    def solve_many(self, hs, workers=None, parallel_threshold=16):
+        """
+        solve() for every h, in order. Batches of parallel_threshold or more
+        are spread over worker processes that each map the table file.
+        """
+        hs = list(hs)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(hs) < parallel_threshold:
+            return [self.solve(h) for h in hs]
+        state = (self.g, self.p, self.n, self.m, self.table.key_bits, _table_dir(self.table))
+        chunksize = max(1, len(hs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(state,)) as pool:
+            return list(pool.map(_worker_solve, hs, chunksize=chunksize))
+
+
+def _table_dir(table):
+    return os.path.dirname(table.keys.filename)
+
+
+# -----------------------------
+# Batch workers
+# -----------------------------
+_worker_solver = None
+
+
+def _init_worker(state):
+    global _worker_solver
+    g, p, n, m, key_bits, cache_dir = state
+    # maps the file written by the parent: no rebuild, shared pages
+    _worker_solver = DiscreteLogSolver(g, p, n, m, key_bits=key_bits, cache_dir=cache_dir)
+
+
+def _worker_solve(h):
+    return _worker_solver.solve(h)
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def benchmark(bits=36, queries=20, scales=(0.25, 1, 4, 16)):
+    """Query time against table size in a prime-order subgroup of a safe prime."""
+    from pohlig_hellman import safe_prime
+
+    rng = random.Random()
+    p = safe_prime(bits + 1)
+    n = (p - 1) // 2
+    g = powmod(rng.randrange(2, p - 1), 2, p)
+    xs = [rng.randrange(n) for _ in range(queries)]
+    hs = [powmod(g, x, p) for x in xs]
+    root = math.isqrt(n)
+
+    print(f"\n--- DiscreteLogSolver, {bits}-bit prime-order subgroup, {queries} queries ---")
+    print(f"{'m/sqrt(n)':>10} {'table MiB':>10} {'build s':>8} {'mmap ms':>8} "
+          f"{'max giant':>10} {'ms/query':>9} {'total s':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for scale in scales:
+            m = max(1, int(root * scale))
+            start = time.perf_counter()
+            solver = DiscreteLogSolver(g, p, n, m, cache_dir=cache_dir)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            solver = DiscreteLogSolver(g, p, n, m, cache_dir=cache_dir)   # second process's view
+            reopen = time.perf_counter() - start
+            start = time.perf_counter()
+            assert solver.solve_many(hs, workers=1) == xs
+            per_query = (time.perf_counter() - start) / queries
+            print(f"{scale:>10} {solver.table_bytes / 2**20:>10.1f} {build:>8.2f} "
+                  f"{reopen * 1000:>8.1f} {solver.giant_steps:>10,} {per_query * 1000:>9.1f} "
+                  f"{build + per_query * queries:>8.2f}")
+        best = baby_steps_for_queries(n, queries)
+        print(f"  suggested m for {queries} queries: {best:,} ({best / root:.1f} x sqrt(n))")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,252 @@
+# Pohlig-Hellman Discrete Logarithms modulo a Prime
+# If g has order n = q1^e1 * ... * qr^er in (Z/pZ)*, then g^x = h splits
+# into one problem per prime power: x mod qi^ei is found digit by digit in
+# the subgroup of order qi (baby-step giant-step, or constant-memory rho
+# once a baby-step table would pass 2^20 entries), and CRT recombines the
+# residues. The cost is about sum(ei * sqrt(qi)) instead of sqrt(p), so a
+# prime p whose p - 1 is smooth gives up its logarithms almost for free,
+# while a safe prime p = 2q + 1 leaves one subproblem of size q.
+
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+
+from arith_backend import invert, is_prime, powmod
+from factorization import factorize
+from dlog_rho import rho_log
+from number_theory import crt
+
+BRUTE_FORCE_LIMIT = 64          # subgroups this small are searched directly
+BSGS_MAX_BITS = 40              # larger prime subgroups use rho_log
+PARALLEL_MIN_BITS = 20          # subproblems with q above this go to the pool
+
+
+# -----------------------------
+# Group order
+# -----------------------------
+@lru_cache(maxsize=256)
+def group_order_factors(p):
+    """{q: e} for p - 1, the order of (Z/pZ)* for prime p."""
+    return factorize(p - 1, workers=1)
+
+
+def order_factors(g, p):
+    """{q: e} for the multiplicative order of g modulo prime p."""
+    factors = dict(group_order_factors(p))
+    n = p - 1
+    for q in list(factors):
+        while factors[q] and powmod(g, n // q, p) == 1:
+            n //= q
+            factors[q] -= 1
+        if not factors[q]:
+            del factors[q]
+    return factors
+
+
+def pohlig_hellman_cost(factors):
+    """Group operations Pohlig-Hellman needs: about sum(e * sqrt(q))."""
+    return sum(e * (math.isqrt(q) + 1) for q, e in factors.items())
+
+
+def is_smooth_enough(factors, p):
+    """True when Pohlig-Hellman beats one BSGS over the whole group by 2x or more."""
+    return 2 * pohlig_hellman_cost(factors) <= math.isqrt(p)
+
+
+# -----------------------------
+# Subgroup of prime order
+# -----------------------------
+def bsgs_subgroup(g, h, p, n):
+    """x in [0, n) with g^x = h (mod p) for g of order n, or None."""
+    if n <= BRUTE_FORCE_LIMIT:
+        cur = 1
+        for x in range(n):
+            if cur == h:
+                return x
+            cur = cur * g % p
+        return None
+    m = math.isqrt(n) + 1
+    baby = {}
+    cur = 1
+    for j in range(m):
+        baby.setdefault(cur, j)
+        cur = cur * g % p
+    step = invert(powmod(g, m, p), p)
+    gamma = h
+    for i in range(m):
+        j = baby.get(gamma)
+        if j is not None:
+            return (i * m + j) % n
+        gamma = gamma * step % p
+    return None
+
+
+def dlog_prime_power(g, h, p, q, e):
+    """x mod q^e with g^x = h for g of order q^e, one base-q digit at a time."""
+    g0 = powmod(g, q ** (e - 1), p)             # order q
+    g_inv = invert(g, p)
+    x = 0
+    for i in range(e):
+        # strip the digits found so far and project into the order-q subgroup
+        hi = powmod(h * powmod(g_inv, x, p) % p, q ** (e - 1 - i), p)
+        if q.bit_length() <= BSGS_MAX_BITS:
+            d = bsgs_subgroup(g0, hi, p, q)
+        else:
+            d = rho_log(g0, hi, p, q, workers=1)
+        if d is None:
+            return None
+        x += d * q ** i
+    return x
+
+
+def _solve_task(task):
+    return dlog_prime_power(*task)
+
+
+# -----------------------------
+# Solver
+# -----------------------------
+def pohlig_hellman(g, h, p, factors=None, workers=None):
+    """
+    Smallest x >= 0 with g^x = h (mod prime p), or None if h is not a power
+    of g. factors is {q: e} for the order of g (computed when omitted).
+    When two or more subproblems have q above 2^PARALLEL_MIN_BITS they run
+    in a process pool; the small ones stay in this process.
+    """
+    g, h = g % p, h % p
+    if h == 1:
+        return 0                                # g^0, without factoring the order
+    if h == 0 or g == 0:
+        return None
+    if factors is None:
+        factors = order_factors(g, p)
+    n = math.prod(q ** e for q, e in factors.items())
+    if powmod(h, n, p) != 1:
+        return None                             # h is outside <g>
+    if n == 1:
+        return 0
+
+    tasks = []
+    for q, e in factors.items():
+        cofactor = n // q ** e
+        tasks.append((powmod(g, cofactor, p), powmod(h, cofactor, p), p, q, e))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    large = [i for i, t in enumerate(tasks) if t[3].bit_length() > PARALLEL_MIN_BITS]
+    solved = {}
+    if workers > 1 and len(large) >= 2:
+        with ProcessPoolExecutor(max_workers=min(workers, len(large))) as pool:
+            solved = dict(zip(large, pool.map(_solve_task, [tasks[i] for i in large])))
+    residues = [solved[i] if i in solved else _solve_task(t) for i, t in enumerate(tasks)]
+    if any(r is None for r in residues):
+        return None
+    x, _ = crt(residues, [q ** e for q, e in factors.items()])
+    return x
+
+
+# -----------------------------
+# Check and benchmark
+# -----------------------------
+def check_against_reference(small=128, medium=(4099, 8191, 12289, 65537, 65539), samples=300,
+                            rng=None):
+    """
+    pohlig_hellman against the smallest x found by enumeration: every g and
+    h modulo each prime below `small` (h outside <g>, or 0, gives None), then
+    random x modulo primes whose p - 1 has prime powers and subgroups past
+    BRUTE_FORCE_LIMIT, with the factors computed and passed in.
+    """
+    rng = rng or random.Random(1)
+    for p in range(2, small):
+        if not is_prime(p):
+            continue
+        for g in range(1, p):
+            logs = {}
+            cur = 1
+            for x in range(p):
+                logs.setdefault(cur, x)
+                cur = cur * g % p
+            for h in range(p):
+                if pohlig_hellman(g, h, p, workers=1) != logs.get(h):
+                    raise AssertionError(f"pohlig_hellman({g}, {h}, {p}) != {logs.get(h)}")
+    for p in medium:
+        for _ in range(samples):
+            g = rng.randrange(2, p)
+            n = math.prod(q ** e for q, e in order_factors(g, p).items())
+            x = rng.randrange(n)
+            h = powmod(g, x, p)
+            for factors in (None, order_factors(g, p)):
+                if pohlig_hellman(g, h, p, factors, workers=1) != x:
+                    raise AssertionError(f"pohlig_hellman({g}, {h}, {p}) != {x}")
+
+
+def smooth_prime(bits, smoothness=16, rng=random):
+    """Prime p with p - 1 = 2 * (product of primes below 2^smoothness)."""
+    from number_theory import primes_below
+
+    small = primes_below(1 << smoothness)[1:]
+    while True:
+        m = 2
+        while m.bit_length() < bits - smoothness:
+            m *= rng.choice(small)
+        for _ in range(100):
+            p = m * rng.choice(small) + 1
+            if p.bit_length() == bits and is_prime(p):
+                return p
+        m = 2
+
+
+def safe_prime(bits):
+    """Prime p = 2q + 1 with q prime."""
+    from factorization import _random_prime
+
+    while True:
+        q = _random_prime(bits - 1)
+        if is_prime(2 * q + 1) and (2 * q + 1).bit_length() == bits:
+            return 2 * q + 1
+
+
+def _generator(p, rng):
+    factors = group_order_factors(p)
+    while True:
+        g = rng.randrange(2, p - 1)
+        if all(powmod(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+
+
+def benchmark(smooth_bits=(40, 64, 128, 256), safe_bits=(24, 32, 40), instances=3):
+    rng = random.Random()
+    print("\n--- Discrete logs mod p: Pohlig-Hellman vs BSGS over the whole group (seconds) ---")
+    print(f"{'p':>10} {'bits':>5} {'largest q':>10} {'smooth?':>8} {'PH':>9} {'BSGS':>9}")
+    cases = [("smooth", bits, smooth_prime(bits, rng=rng)) for bits in smooth_bits]
+    cases += [("safe", bits, safe_prime(bits)) for bits in safe_bits]
+    for kind, bits, p in cases:
+        g = _generator(p, rng)
+        factors = order_factors(g, p)
+        t_ph = t_bsgs = 0.0
+        for _ in range(instances):
+            x = rng.randrange(p - 1)
+            h = powmod(g, x, p)
+            start = time.perf_counter()
+            assert pohlig_hellman(g, h, p, factors) == x
+            t_ph += time.perf_counter() - start
+            if bits <= 40:
+                start = time.perf_counter()
+                assert bsgs_subgroup(g, h, p, p - 1) == x
+                t_bsgs += time.perf_counter() - start
+        bsgs = f"{t_bsgs / instances:>9.4f}" if bits <= 40 else f"{'-':>9}"
+        print(f"{kind:>10} {bits:>5} {max(factors).bit_length():>8}-b "
+              f"{'yes' if is_smooth_enough(factors, p) else 'no':>8} {t_ph / instances:>9.4f} {bsgs}")
+
+
+# -----------------------------
+# Main Program
+# -----------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
@@ -0,0 +1,166 @@
+# Big-Integer Arithmetic Backend
+# powmod / invert / mul_mod / is_prime for the RSA, ElGamal, Diffie-Hellman
+# and elliptic-curve code. Uses gmpy2 (GMP) when it is installed and falls
+# back to pure Python otherwise; both return plain Python ints and give
+# identical results.
+#
+# Set ARITH_BACKEND=python (or gmpy2) in the environment to force a choice.
+
+import os
+import random
+import time
+
+from number_theory import mod_inverse
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+
+# -----------------------------------------------------------
+# PURE PYTHON
+# -----------------------------------------------------------
+_TRIAL_PRIMES = [p for p in range(3, 1000, 2) if all(p % d for d in range(3, int(p ** 0.5) + 1, 2))]
+
+
+class PythonBackend:
+    name = "python"
+
+    @staticmethod
+    def powmod(base, exp, mod):
+        return pow(base, exp, mod)
+
+    @staticmethod
+    def invert(a, mod):
+        """Inverse of a modulo mod, or None if it does not exist."""
+        return mod_inverse(a, mod)
+
+    @staticmethod
+    def mul_mod(a, b, mod):
+        return a * b % mod
+
+    @staticmethod
+    def is_prime(n, rounds=25):
+        """Trial division by primes < 1000, then Miller-Rabin with random bases."""
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        for p in _TRIAL_PRIMES:
+            if n % p == 0:
+                return n == p
+        if n < 1000 * 1000:
+            return True
+
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
+        for _ in range(rounds):
+            x = pow(random.randrange(2, n - 1), d, n)
+            if x == 1 or x == n - 1:
+                continue
+            for _ in range(s - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+
+# -----------------------------------------------------------
+# GMP (gmpy2)
+# -----------------------------------------------------------
+GMP_MUL_THRESHOLD = 512      # bits
+
+
+class GMPBackend:
+    name = "gmpy2"
+
+    @staticmethod
+    def powmod(base, exp, mod):
+        return int(gmpy2.powmod(base, exp, mod))
+
+    @staticmethod
+    def invert(a, mod):
+        try:
+            return int(gmpy2.invert(a, mod))
+        except ZeroDivisionError:
+            return None
+
+    @staticmethod
+    def mul_mod(a, b, mod):
+        if mod.bit_length() < GMP_MUL_THRESHOLD:
+            return a * b % mod          # converting to mpz costs more than it saves
+        return int(gmpy2.mpz(a) * b % mod)
+
+    @staticmethod
+    def is_prime(n, rounds=25):
+        return bool(gmpy2.is_prime(n, rounds))
+
+
+def get_backend(name=None):
+    """Backend by name ('gmpy2' or 'python'); None picks gmpy2 when present."""
+    if name is None or name == "auto":
+        return GMPBackend if gmpy2 is not None else PythonBackend
+    if name == "gmpy2":
+        if gmpy2 is None:
+            raise ImportError("gmpy2 is not installed")
+        return GMPBackend
+    if name == "python":
+        return PythonBackend
+    raise ValueError("Unknown backend: choose 'gmpy2' or 'python'")
+
+
+backend = get_backend(os.environ.get("ARITH_BACKEND"))
+BACKEND = backend.name
+powmod = backend.powmod
+invert = backend.invert
+mul_mod = backend.mul_mod
+is_prime = backend.is_prime
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def _per_op(fn, args, reps):
+    start = time.perf_counter()
+    for _ in range(reps):
+        for a in args:
+            fn(*a)
+    return (time.perf_counter() - start) / (reps * len(args)) * 1e6
+
+
+def benchmark(sizes=(256, 1024, 2048, 4096), count=20):
+    print(f"\n--- Arithmetic backend (active: {BACKEND}), microseconds per operation ---")
+    backends = [PythonBackend] + ([GMPBackend] if gmpy2 is not None else [])
+    print(f"{'operation':>10} {'bits':>6} " + " ".join(f"{b.name:>10}" for b in backends)
+          + ("    speedup" if len(backends) > 1 else ""))
+    for bits in sizes:
+        mod = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        while not PythonBackend.is_prime(mod):
+            mod += 2
+        vals = [random.randrange(2, mod) for _ in range(2 * count)]
+        cases = {
+            "powmod": ([(a, b, mod) for a, b in zip(vals, vals[count:])], 1),
+            "invert": ([(a, mod) for a in vals[:count]], 5),
+            "mul_mod": ([(a, b, mod) for a, b in zip(vals, vals[count:])], 200),
+            "is_prime": ([(mod,)], 1),
+        }
+        for op, (args, reps) in cases.items():
+            results = [[getattr(b, op)(*a) for a in args] for b in backends]
+            assert all(r == results[0] for r in results), op
+            times = [_per_op(getattr(b, op), args, reps) for b in backends]
+            line = f"{op:>10} {bits:>6} " + " ".join(f"{t:>10.2f}" for t in times)
+            if len(times) > 1:
+                line += f" {times[0] / times[1]:>9.1f}x"
+            print(line)
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,54 @@
+# On-Disk Table Caches
+# Precomputed tables (fixed-base EC tables, baby-step tables) are cached
+# as files named after a hash of their parameters. The default directory
+# is per user and mode 0700, so nobody else can plant or swap a table, and
+# files are written beside their final name and renamed into place, so a
+# concurrent reader sees either the old file or the whole new one.
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def _default_cache_dir(name):
+    """$XDG_CACHE_HOME/name, or ~/.cache/name."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, name)
+
+
+def private_dir(path):
+    """Create path with mode 0700 and return it; PermissionError if another user owns it."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.stat(path)
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user")
+    if st.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def cache_file(name, params, suffix, cache_dir=None):
+    """
+    Path for the table described by `params` (hashed through repr) in
+    cache_dir, default the private directory `name` under the user's cache.
+    Raises OSError if the directory cannot be created or is not ours.
+    """
+    key = hashlib.sha256(repr(params).encode()).hexdigest()[:24]
+    return os.path.join(private_dir(cache_dir or _default_cache_dir(name)), key + suffix)
+
+
+@contextmanager
+def atomic_write(path):
+    """Binary file to fill; it replaces `path` only if the block completes."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,101 @@
+# Distinguished-Point Driver for Parallel Pollard Rho
+# The discrete-log solvers modulo p (dlog_rho) and on elliptic curves
+# (ecdlp) differ only in their group and walk. Both hand this driver a
+# walk function that runs random walks until it has spent a step budget and
+# returns ([(key, c, d) distinguished points], steps, restarts), where the
+# point reached is base^c * target^d (c*P + d*Q on a curve) and key
+# identifies it. The driver runs walk tasks here or streams them through a
+# process pool, keeps one table of keys, and turns two reports of a key
+# with different (c, d) into c1 + d1*x = c2 + d2*x (mod n).
+
+import math
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+MAX_GCD_CANDIDATES = 1 << 12    # collisions with a larger gcd(d1 - d2, n) are dropped
+
+
+def expected_iterations(n, negation=False):
+    """sqrt(pi*n/2) steps, or sqrt(pi*n/4) when walking on classes {X, -X}."""
+    return math.sqrt(math.pi * n / (4 if negation else 2))
+
+
+def default_dp_bits(n):
+    # walks of ~2^dp_bits steps; about n^(1/4) distinguished points in all.
+    # Small n stay at 2^dp_bits <= sqrt(n)/8: a walk's own cycle (~sqrt(n)
+    # steps) must not be likely to miss every distinguished point.
+    bits = n.bit_length()
+    return max(2, min(bits // 4, bits // 2 - 3))
+
+
+# -----------------------------
+# Walk tasks
+# -----------------------------
+def walk_batches(walks, args, budget, workers, rng):
+    """Results of walks(*args, seed, budget), forever, from this process or a pool."""
+    if workers <= 1:
+        while True:
+            yield walks(*args, rng.getrandbits(64), budget)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {pool.submit(walks, *args, rng.getrandbits(64), budget)
+                   for _ in range(2 * workers)}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.add(pool.submit(walks, *args, rng.getrandbits(64), budget))
+                yield future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------
+# Collisions
+# -----------------------------
+def solve_collision(first, second, n, check):
+    """x from c1 + d1*x = c2 + d2*x (mod n), trying each root with check(x) when gcd > 1."""
+    (c1, d1), (c2, d2) = first, second
+    u, v = (d1 - d2) % n, (c2 - c1) % n
+    g = math.gcd(u, n)
+    if u == 0 or v % g or g > MAX_GCD_CANDIDATES:
+        return None
+    m = n // g
+    x0 = (v // g) * pow(u // g, -1, m) % m
+    for i in range(g):
+        x = x0 + i * m
+        if check(x):
+            return x
+    return None
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def collision_search(walks, args, n, check, expected, dp_bits, workers, task_steps,
+                     max_iterations, rng=random, report=None):
+    """
+    Run walk tasks until a collision yields x with check(x), and return it.
+    `report` (a dict) accumulates iterations, restarts, distinguished and
+    collisions. Raises ArithmeticError once max_iterations steps pass.
+    """
+    if report is None:
+        report = {}
+    for key in ("iterations", "restarts", "distinguished", "collisions"):
+        report.setdefault(key, 0)
+    # small tasks keep the collision check close behind the walks
+    budget = int(min(task_steps, max(expected / (4 * workers), 4 << dp_bits)))
+    seen = {}
+    for found, steps, restarts in walk_batches(walks, args, budget, workers, rng):
+        report["iterations"] += steps
+        report["restarts"] += restarts
+        report["distinguished"] += len(found)
+        for key, c, d in found:
+            other = seen.setdefault(key, (c, d))
+            if other == (c, d):
+                continue
+            report["collisions"] += 1
+            x = solve_collision((c, d), other, n, check)
+            if x is not None:
+                return x
+        if report["iterations"] > max_iterations:
+            raise ArithmeticError("no useful collision within max_iterations")
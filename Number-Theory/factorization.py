@@ -0,0 +1,469 @@
+# Integer Factorization Engine
+# Chains trial division by a precomputed prime table, a perfect-power check,
+# a short Fermat search (close primes, as in weak RSA moduli), Pollard p-1,
+# Brent's rho and Lenstra's elliptic-curve method (Montgomery curves,
+# stage 1 + stage 2, curves run in parallel worker processes).
+#
+# factorize(n) returns the complete factorization; prime_certificate(p)
+# proves each factor prime (prime table, deterministic Miller-Rabin bases,
+# or a recursive Pratt certificate) and marks it "probable" only when p-1
+# cannot be factored within the effort budget.
+
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from arith_backend import invert, is_prime, powmod
+from number_theory import primes_below
+
+
+TRIAL_LIMIT = 1 << 16
+TRIAL_PRIMES = primes_below(TRIAL_LIMIT)
+
+# ECM schedule: (B1, curves); B2 = ECM_B2_FACTOR * B1. The last level repeats.
+ECM_LEVELS = [(2000, 25), (11000, 90), (50000, 300), (250000, 700)]
+ECM_B2_FACTOR = 25
+
+
+class FactorizationError(Exception):
+    pass
+
+
+@lru_cache(maxsize=8)
+def _primes_up_to(limit):
+    return primes_below(limit + 1)
+
+
+# -----------------------------------------------------------
+# TRIAL DIVISION, PERFECT POWERS, FERMAT
+# -----------------------------------------------------------
+def trial_division(n, limit=TRIAL_LIMIT):
+    """Strip primes below limit; return ({p: e}, cofactor)."""
+    limit = min(limit, TRIAL_LIMIT)
+    factors = {}
+    for p in TRIAL_PRIMES:
+        if p >= limit or p * p > n:
+            break
+        if n % p == 0:
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors[p] = e
+    if 1 < n < limit * limit:
+        # no prime factor below min(limit, sqrt(n)) is left, so n is prime
+        factors[n] = factors.get(n, 0) + 1
+        n = 1
+    return factors, n
+
+
+def integer_root(n, k):
+    """Largest r with r^k <= n."""
+    if k == 2:
+        return math.isqrt(n)
+    r = 1 << ((n.bit_length() + k - 1) // k)
+    while True:
+        s = ((k - 1) * r + n // r ** (k - 1)) // k
+        if s >= r:
+            return r
+        r = s
+
+
+def perfect_power(n):
+    """(r, k) with r^k = n and k >= 2 as large as possible, or None."""
+    for k in range(n.bit_length(), 1, -1):
+        r = integer_root(n, k)
+        if r > 1 and r ** k == n:
+            return r, k
+    return None
+
+
+def fermat(n, max_steps=1000):
+    """Factor n = a^2 - b^2 when its two factors are close together."""
+    a = math.isqrt(n)
+    if a * a == n:
+        return a
+    a += 1
+    for _ in range(max_steps):
+        b2 = a * a - n
+        b = math.isqrt(b2)
+        if b * b == b2:
+            return a - b
+        a += 1
+    return None
+
+
+# -----------------------------------------------------------
+# POLLARD p-1
+# -----------------------------------------------------------
+def pollard_pm1(n, B1=10000, B2=None):
+    """Finds p | n when p-1 is B1-smooth (stage 1) apart from one prime <= B2 (stage 2)."""
+    if B2 is None:
+        B2 = ECM_B2_FACTOR * B1
+    primes = _primes_up_to(B2)
+
+    a = 2
+    for p in primes:
+        if p > B1:
+            break
+        pe = p
+        while pe * p <= B1:
+            pe *= p
+        a = powmod(a, pe, n)
+    g = math.gcd(a - 1, n)
+    if 1 < g < n:
+        return g
+    if g == n:
+        return None
+
+    # stage 2: step a^q from prime to prime with cached a^gap
+    gaps = {}
+    start = next((i for i, p in enumerate(primes) if p > B1), len(primes))
+    if start == len(primes):
+        return None
+    q_prev = primes[start]
+    b = powmod(a, q_prev, n)
+    acc = b - 1
+    for q in primes[start + 1:]:
+        gap = q - q_prev
+        if gap not in gaps:
+            gaps[gap] = powmod(a, gap, n)
+        b = b * gaps[gap] % n
+        acc = acc * (b - 1) % n
+        q_prev = q
+    g = math.gcd(acc, n)
+    return g if 1 < g < n else None
+
+
+# -----------------------------------------------------------
+# BRENT'S RHO
+# -----------------------------------------------------------
+def brent_rho(n, max_iterations=None, seed=None):
+    """Pollard rho with Brent's cycle detection and batched gcds."""
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(seed)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+            if g == 1 and max_iterations is not None and r > max_iterations:
+                return None
+        if g == n:
+            # the batch overshot; retrace one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        if max_iterations is not None:
+            return None
+
+
+# -----------------------------------------------------------
+# ELLIPTIC-CURVE METHOD (Montgomery curves, x-only)
+# -----------------------------------------------------------
+def _xdbl(X, Z, a24, n):
+    s, d = (X + Z) * (X + Z) % n, (X - Z) * (X - Z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def _xadd(XP, ZP, XQ, ZQ, Xd, Zd, n):
+    u = (XP - ZP) * (XQ + ZQ) % n
+    v = (XP + ZP) * (XQ - ZQ) % n
+    return Zd * (u + v) * (u + v) % n, Xd * (u - v) * (u - v) % n
+
+
+def _ladder(k, X, Z, a24, n):
+    X0, Z0 = X, Z
+    X1, Z1 = _xdbl(X, Z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            X0, Z0 = _xadd(X1, Z1, X0, Z0, X, Z, n)
+            X1, Z1 = _xdbl(X1, Z1, a24, n)
+        else:
+            X1, Z1 = _xadd(X0, Z0, X1, Z1, X, Z, n)
+            X0, Z0 = _xdbl(X0, Z0, a24, n)
+    return X0, Z0
+
+
+def ecm_curve(n, B1, B2, sigma):
+    """One curve with Suyama's parametrisation; returns a factor or None."""
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    X, Z = powmod(u, 3, n), powmod(v, 3, n)
+    den = 16 * X * v % n
+    inv = invert(den, n)
+    if inv is None:
+        g = math.gcd(den, n)
+        return g if 1 < g < n else None
+    a24 = powmod(v - u, 3, n) * (3 * u + v) % n * inv % n
+
+    primes = _primes_up_to(B2)
+    for p in primes:
+        if p > B1:
+            break
+        pe = p
+        while pe * p <= B1:
+            pe *= p
+        X, Z = _ladder(pe, X, Z, a24, n)
+    g = math.gcd(Z, n)
+    if g != 1:
+        return g if g != n else None
+
+    # stage 2: walk odd multiples m*Q (m > B1) with step 2Q, collect Z at primes
+    X2, Z2 = _xdbl(X, Z, a24, n)
+    m = B1 + 1 if B1 % 2 == 0 else B1 + 2
+    Xp, Zp = _ladder(m - 2, X, Z, a24, n)
+    Xm, Zm = _ladder(m, X, Z, a24, n)
+    prime_set = _prime_flags(B2)
+    acc = 1
+    while m <= B2:
+        if prime_set[m]:
+            acc = acc * Zm % n
+        Xm, Zm, Xp, Zp = (*_xadd(Xm, Zm, X2, Z2, Xp, Zp, n), Xm, Zm)
+        m += 2
+    g = math.gcd(acc, n)
+    return g if 1 < g < n else None
+
+
+@lru_cache(maxsize=8)
+def _prime_flags(limit):
+    flags = bytearray(limit + 1)
+    for p in _primes_up_to(limit):
+        flags[p] = 1
+    return flags
+
+
+_worker_stop = None
+
+
+def _init_worker(stop):
+    global _worker_stop
+    _worker_stop = stop
+
+
+def _ecm_curves(n, B1, B2, sigmas):
+    for sigma in sigmas:
+        # another worker may already have the factor: stop between curves
+        if _worker_stop is not None and _worker_stop.is_set():
+            return None
+        g = ecm_curve(n, B1, B2, sigma)
+        if g:
+            return g
+    return None
+
+
+def ecm(n, B1=2000, curves=25, B2=None, workers=None, seed=None):
+    """Run up to `curves` ECM curves, spread over `workers` processes."""
+    if B2 is None:
+        B2 = ECM_B2_FACTOR * B1
+    rng = random.Random(seed)
+    sigmas = [rng.randrange(6, 1 << 32) for _ in range(curves)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return _ecm_curves(n, B1, B2, sigmas)
+
+    chunk = max(1, curves // (workers * 4))
+    stop = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stop,))
+    try:
+        futures = [pool.submit(_ecm_curves, n, B1, B2, sigmas[i:i + chunk])
+                   for i in range(0, curves, chunk)]
+        for future in as_completed(futures):
+            g = future.result()
+            if g:
+                return g
+        return None
+    finally:
+        # queued chunks are dropped; running ones see the event after their curve
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------------------------------------
+# FULL CHAIN
+# -----------------------------------------------------------
+def find_factor(n, workers=None, max_curves=None):
+    """A non-trivial factor of the composite n, or None once max_curves ECM curves fail."""
+    power = perfect_power(n)
+    if power:
+        return power[0]
+    for method in (lambda: fermat(n, 1000),
+                   lambda: pollard_pm1(n, 10000),
+                   lambda: brent_rho(n, None if n.bit_length() <= 64 else 1 << 18)):
+        g = method()
+        if g:
+            return g
+
+    used = 0
+    level = 0
+    while max_curves is None or used < max_curves:
+        B1, curves = ECM_LEVELS[min(level, len(ECM_LEVELS) - 1)]
+        if max_curves is not None:
+            curves = min(curves, max_curves - used)
+        g = ecm(n, B1, curves, workers=workers)
+        if g:
+            return g
+        used += curves
+        level += 1
+    return None
+
+
+def factorize(n, workers=None, max_curves=None):
+    """
+    Complete factorization {p: e} of n >= 1. With max_curves set, raises
+    FactorizationError if some cofactor survives that many ECM curves.
+    """
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    factors, n = trial_division(n)
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        g = find_factor(m, workers, max_curves)
+        if g is None:
+            raise FactorizationError(f"could not split {m}")
+        stack.extend((g, m // g))
+    return dict(sorted(factors.items()))
+
+
+# -----------------------------------------------------------
+# PRIMALITY CERTIFICATES
+# -----------------------------------------------------------
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_BASES_LIMIT = 3317044064679887385961981     # these bases are a proof below this bound
+
+
+def _strong_probable_prime(n, a):
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = powmod(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def prime_certificate(p, max_curves=200):
+    """
+    ("table", p), ("mr-bases", p), ("pratt", p, witness, [certificates of
+    the primes dividing p-1]) or ("probable", p) if p-1 resists factoring.
+    """
+    if p < TRIAL_LIMIT:
+        return ("table", p)
+    if p < _MR_BASES_LIMIT:
+        return ("mr-bases", p)
+    try:
+        q_factors = factorize(p - 1, workers=1, max_curves=max_curves)
+    except FactorizationError:
+        return ("probable", p)
+    for a in range(2, 1000):
+        if powmod(a, p - 1, p) == 1 and all(powmod(a, (p - 1) // q, p) != 1 for q in q_factors):
+            return ("pratt", p, a, [prime_certificate(q, max_curves) for q in q_factors])
+    return ("probable", p)
+
+
+def verify_certificate(cert):
+    """True if the certificate proves its number prime ("probable" never does)."""
+    kind, p = cert[0], cert[1]
+    if kind == "table":
+        return p in set(TRIAL_PRIMES)
+    if kind == "mr-bases":
+        return p < _MR_BASES_LIMIT and all(p == a or _strong_probable_prime(p, a) for a in _MR_BASES)
+    if kind == "pratt":
+        _, p, a, subs = cert
+        qs = [sub[1] for sub in subs]
+        m = p - 1
+        for q in qs:
+            while m % q == 0:
+                m //= q
+        return (m == 1 and powmod(a, p - 1, p) == 1
+                and all(powmod(a, (p - 1) // q, p) != 1 for q in qs)
+                and all(verify_certificate(sub) for sub in subs))
+    return False
+
+
+def factorize_certified(n, workers=None):
+    """[(p, e, certificate)] for the complete factorization of n."""
+    return [(p, e, prime_certificate(p)) for p, e in factorize(n, workers).items()]
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def _random_prime(bits):
+    while True:
+        p = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if is_prime(p):
+            return p
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def benchmark(sizes=(40, 56, 72, 88), unbalanced=((32, 256), (40, 256))):
+    print("\n--- Factorization by input size (seconds; '-' = method gave up) ---")
+    print(f"{'n bits':>7} {'p bits':>7} {'p-1':>8} {'rho':>8} {'ecm':>8} {'chain':>8} {'cert':>6}")
+
+    cases = [(_random_prime(b // 2), _random_prime(b - b // 2)) for b in sizes]
+    cases += [(_random_prime(small), _random_prime(big)) for small, big in unbalanced]
+    for p, q in cases:
+        n = p * q
+        pm1, t_pm1 = _timed(lambda: pollard_pm1(n, 10000))
+        rho, t_rho = _timed(lambda: brent_rho(n, 1 << 22))
+        e, t_ecm = _timed(lambda: ecm(n, 2000, 200, workers=1))
+        factors, t_all = _timed(lambda: factorize(n, workers=1))
+        assert factors == ({p: 1, q: 1} if p != q else {p: 2})
+        certs = [prime_certificate(r) for r in factors]
+        proven = all(verify_certificate(c) for c in certs)
+
+        def show(result, t):
+            return f"{t:>8.3f}" if result else f"{'-':>8}"
+
+        print(f"{n.bit_length():>7} {min(p, q).bit_length():>7} {show(pm1, t_pm1)} "
+              f"{show(rho, t_rho)} {show(e, t_ecm)} {t_all:>8.3f} {'yes' if proven else 'no':>6}")
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        n = int(sys.argv[1])
+        for p, e, cert in factorize_certified(n):
+            print(f"{p}^{e}  [{cert[0]}{'' if verify_certificate(cert) else ', unproven'}]")
+    else:
+        benchmark()
@@ -0,0 +1,316 @@
+# Shared Number-Theory Core
+# Iterative and Lehmer extended GCD, modular inverse, Montgomery's batch
+# inversion trick, CRT helpers and modular square roots, imported by the
+# other algorithm folders:
+#
+#   import os, sys
+#   sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+#   from number_theory import extended_gcd, mod_inverse
+
+import random
+import sys
+import time
+
+
+# -----------------------------------------------------------
+# PRIME TABLE (Sieve of Eratosthenes)
+# -----------------------------------------------------------
+def primes_below(limit):
+    """All primes p < limit."""
+    if limit < 3:
+        return []
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+
+# -----------------------------------------------------------
+# EXTENDED GCD
+# -----------------------------------------------------------
+LEHMER_THRESHOLD = 2048      # bits; below this the plain loop is faster in Python
+_LEHMER_DIGIT = 60           # leading bits simulated with small ints per Lehmer step
+
+
+def extended_gcd(a, b):
+    """
+    Return (g, x, y) with g = gcd(a, b) >= 0 and a*x + b*y = g.
+    Same coefficients as the textbook recursive version for a, b >= 0,
+    but iterative, so large operands never hit the recursion limit.
+    """
+    if a < 0 or b < 0:
+        g, x, y = extended_gcd(abs(a), abs(b))
+        return g, (-x if a < 0 else x), (-y if b < 0 else y)
+    if min(a, b).bit_length() >= LEHMER_THRESHOLD:
+        return lehmer_extended_gcd(a, b)
+    return iterative_extended_gcd(a, b)
+
+
+def iterative_extended_gcd(a, b):
+    """Plain Euclid for non-negative a, b with the cofactors carried along."""
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def lehmer_extended_gcd(a, b):
+    """
+    Extended GCD for non-negative a, b using Lehmer's method (Knuth 4.5.2,
+    Algorithm L): runs of quotients are found from the leading bits with
+    small ints, then applied to the full operands as one 2x2 matrix.
+    """
+    a0, b0 = a, b
+    x0, x1 = 1, 0                    # coefficient of the original a
+    if a < b:
+        a, b = b, a                  # the q = 0 step of Euclid
+        x0, x1 = 0, 1
+    while b >> _LEHMER_DIGIT:
+        shift = a.bit_length() - _LEHMER_DIGIT
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C and bh + D:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            x0, x1 = x1, x0 - q * x1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+
+    y0 = (a - a0 * x0) // b0 if b0 else 0
+    return a, x0, y0
+
+
+def mod_inverse(a, m):
+    """Inverse of a modulo m in 0..m-1, or None if gcd(a, m) != 1."""
+    g, x, _ = extended_gcd(a % m, m)
+    if g != 1:
+        return None
+    return x % m
+
+
+# -----------------------------------------------------------
+# BATCH INVERSION (Montgomery's trick)
+# -----------------------------------------------------------
+def batch_inverse(values, m):
+    """
+    Inverses of all values modulo m with one inversion and 3(n-1)
+    multiplications: invert the running product, then peel it apart.
+    Raises ValueError if any value is not invertible.
+    """
+    values = list(values)
+    if not values:
+        return []
+
+    prefix = []
+    acc = 1
+    for v in values:
+        acc = acc * v % m
+        prefix.append(acc)
+
+    inv = mod_inverse(acc, m)
+    if inv is None:
+        raise ValueError("batch contains a value with no inverse modulo m")
+
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % m
+        inv = inv * values[i] % m
+    result[0] = inv
+    return result
+
+
+# -----------------------------------------------------------
+# CHINESE REMAINDER THEOREM
+# -----------------------------------------------------------
+def garner_coefficients(moduli):
+    """c_i = (m_1 * ... * m_{i-1})^-1 mod m_i for i >= 1 (c_0 is None)."""
+    coefficients = [None]
+    prefix = moduli[0]
+    for m in moduli[1:]:
+        c = mod_inverse(prefix, m)
+        if c is None:
+            raise ValueError("moduli must be pairwise coprime")
+        coefficients.append(c)
+        prefix *= m
+    return coefficients
+
+
+def garner(residues, moduli, coefficients=None):
+    """Smallest x >= 0 with x = r_i (mod m_i), by Garner's mixed-radix recombination."""
+    if coefficients is None:
+        coefficients = garner_coefficients(moduli)
+    x = residues[0] % moduli[0]
+    prefix = moduli[0]
+    for r, m, c in zip(residues[1:], moduli[1:], coefficients[1:]):
+        x += prefix * ((r - x) * c % m)
+        prefix *= m
+    return x
+
+
+def crt(residues, moduli):
+    """Return (x, M) with M = prod(moduli) and x = r_i (mod m_i), 0 <= x < M."""
+    M = 1
+    for m in moduli:
+        M *= m
+    return garner(residues, moduli), M
+
+
+# -----------------------------------------------------------
+# MODULAR SQUARE ROOTS (prime modulus)
+# -----------------------------------------------------------
+def legendre(a, p):
+    """1 if a is a non-zero square mod odd prime p, -1 if not, 0 if p | a."""
+    r = pow(a, (p - 1) // 2, p)
+    return -1 if r == p - 1 else r
+
+
+def sqrt_mod(a, p):
+    """
+    x with x*x = a (mod prime p), or None if a is not a square. One
+    exponentiation for p = 3 (mod 4) and p = 5 (mod 8) (Atkin), otherwise
+    Tonelli-Shanks. The other root is p - x.
+    """
+    a %= p
+    if a == 0 or p == 2:
+        return a
+    if p % 4 == 3:
+        x = pow(a, (p + 1) // 4, p)
+    elif p % 8 == 5:
+        b = pow(2 * a, (p - 5) // 8, p)
+        i = 2 * a * b * b % p
+        x = a * b * (i - 1) % p
+    elif legendre(a, p) == 1:
+        return _tonelli_shanks(a, p)
+    else:
+        return None
+    # the closed forms give garbage for non-squares, so check instead of
+    # paying for a Legendre symbol up front
+    return x if x * x % p == a else None
+
+
+def _tonelli_shanks(a, p):
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while legendre(z, p) != -1:
+        z += 1
+    m, c = s, pow(z, q, p)
+    t, r = pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c = i, b * b % p
+        t, r = t * c % p, r * b % p
+    return r
+
+
+# -----------------------------------------------------------
+# CHECK AND BENCHMARK (against the old recursive versions)
+# -----------------------------------------------------------
+def _recursive_extended_euclid(a, b):
+    if b == 0:
+        return a, 1, 0
+    g, x1, y1 = _recursive_extended_euclid(b, a % b)
+    return g, y1, x1 - (a // b) * y1
+
+
+def check_against_reference(small=128, pairs=300):
+    """
+    lehmer_extended_gcd against the plain loop: every pair below `small`,
+    then operands just past the Lehmer digit, consecutive Fibonacci numbers
+    (one quotient at a time), shared factors and powers of two.
+    """
+    cases = [(a, b) for a in range(small) for b in range(small)]
+    fib = [0, 1]
+    while fib[-1].bit_length() < 400:
+        fib.append(fib[-1] + fib[-2])
+    cases += list(zip(fib[1:], fib)) + list(zip(fib, fib[1:]))
+    for _ in range(pairs):
+        bits = random.randrange(_LEHMER_DIGIT - 2, 400)
+        a, b = random.getrandbits(bits), random.getrandbits(bits)
+        c = random.getrandbits(random.randrange(1, 200)) | 1
+        cases += [(a, b), (a * c, b * c), (a, a), (1 << bits, b), (a, a * c)]
+    for a, b in cases:
+        expected = iterative_extended_gcd(a, b)
+        if lehmer_extended_gcd(a, b) != expected:
+            raise AssertionError(f"lehmer_extended_gcd({a}, {b}) != {expected}")
+        g, x, y = extended_gcd(-a, b)
+        if g != expected[0] or -a * x + b * y != g:
+            raise AssertionError(f"extended_gcd({-a}, {b}) = {(g, x, y)}")
+
+
+def _linear_search_inverse(a, m):
+    for i in range(1, m):
+        if (a * i) % m == 1:
+            return i
+    return None
+
+
+def _time(fn, args, reps):
+    start = time.perf_counter()
+    for _ in range(reps):
+        for a in args:
+            fn(*a)
+    return (time.perf_counter() - start) / (reps * len(args)) * 1e6
+
+
+def benchmark(sizes=(64, 256, 1024, 2048, 4096), pairs=50, batch=1000):
+    sys.setrecursionlimit(10000)
+    print("\n--- Extended GCD (microseconds per call) ---")
+    print(f"{'bits':>6} {'recursive':>10} {'iterative':>10} {'lehmer':>10}")
+    for bits in sizes:
+        args = [(random.getrandbits(bits), random.getrandbits(bits)) for _ in range(pairs)]
+        for a, b in args:
+            assert _recursive_extended_euclid(a, b) == iterative_extended_gcd(a, b) == lehmer_extended_gcd(a, b)
+        print(f"{bits:>6} {_time(_recursive_extended_euclid, args, 3):>10.1f} "
+              f"{_time(iterative_extended_gcd, args, 3):>10.1f} "
+              f"{_time(lehmer_extended_gcd, args, 3):>10.1f}")
+
+    print("\n--- Modular inverse mod 26 (Affine cipher, microseconds) ---")
+    args = [(a, 26) for a in (1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25)]
+    print(f"linear search {_time(_linear_search_inverse, args, 200):.2f}   "
+          f"extended_gcd {_time(mod_inverse, args, 200):.2f}")
+
+    print(f"\n--- {batch} inversions modulo a 256-bit prime (ms) ---")
+    p = 2 ** 256 - 2 ** 224 + 2 ** 192 + 2 ** 96 - 1
+    values = [random.randrange(1, p) for _ in range(batch)]
+    start = time.perf_counter()
+    single = [mod_inverse(v, p) for v in values]
+    one_by_one = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    batched = batch_inverse(values, p)
+    together = (time.perf_counter() - start) * 1000
+    assert single == batched
+    print(f"one by one {one_by_one:.2f}   batch_inverse {together:.2f}")
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    check_against_reference()
+    benchmark()
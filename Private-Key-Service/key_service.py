@@ -0,0 +1,333 @@
+# Private-Key Operation Service (asyncio)
+# Accepts decryption requests over TCP or a Unix socket, groups them into
+# micro-batches within a latency budget, and runs each batch on a process
+# pool whose workers keep the key objects loaded.
+#
+# Protocol: one JSON object per line, answered (possibly out of order) by
+# one JSON line carrying the same "id".
+#   {"id": 1, "op": "decrypt", "key": "rsa", "c": 1234...}
+#   {"id": 2, "op": "decrypt", "key": "elgamal", "c": [c1, c2]}
+#   {"id": 3, "op": "public_key", "key": "rsa"}
+#   {"id": 4, "op": "stats"}
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "RSA"))
+sys.path.insert(0, os.path.join(HERE, "..", "Elgamal"))
+from elgamal import ElGamalPrivateKey
+from prime_gen import generate_prime
+from rsa_key import RSAPrivateKey
+
+
+# -----------------------------------------------------------
+# POOL WORKERS (keys are loaded once per process)
+# -----------------------------------------------------------
+_worker_keys = None
+
+
+def _init_worker(keys):
+    global _worker_keys
+    _worker_keys = keys
+
+
+def _decrypt_batch(name, ciphertexts):
+    """(True, m) or (False, error) per ciphertext: one bad item fails only itself."""
+    key = _worker_keys[name]
+    results = []
+    for c in ciphertexts:
+        try:
+            results.append((True, key.decrypt(c)))
+        except Exception as exc:
+            results.append((False, str(exc) or type(exc).__name__))
+    return results
+
+
+# -----------------------------------------------------------
+# REQUEST VALIDATION
+# -----------------------------------------------------------
+def _is_int(v):
+    return isinstance(v, int) and not isinstance(v, bool)
+
+
+def _check_ciphertext(key, c):
+    """c in the form key.decrypt() takes, or ValueError if it cannot be one."""
+    if isinstance(key, ElGamalPrivateKey):
+        if not (isinstance(c, list) and len(c) == 2 and all(map(_is_int, c))):
+            raise ValueError("ElGamal ciphertext must be [c1, c2]")
+        if not (0 < c[0] < key.p and 0 <= c[1] < key.p):
+            raise ValueError("ElGamal ciphertext out of range")
+        return tuple(c)
+    if isinstance(key, RSAPrivateKey):
+        if not _is_int(c):
+            raise ValueError("RSA ciphertext must be an integer")
+        if not 0 <= c < key.n:
+            raise ValueError("RSA ciphertext out of range")
+        return c
+    return tuple(c) if isinstance(c, list) else c
+
+
+# -----------------------------------------------------------
+# LATENCY / THROUGHPUT COUNTERS
+# -----------------------------------------------------------
+class ServiceStats:
+    def __init__(self, window=20000, rate_window=10.0):
+        self.latencies = deque(maxlen=window)     # seconds, most recent requests
+        self.finished_at = deque()                # completion times inside rate_window
+        self.rate_window = rate_window
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.first_at = None
+
+    def record(self, latency, now):
+        if self.first_at is None:
+            self.first_at = now - latency
+        self.latencies.append(latency)
+        self.finished_at.append(now)
+        self.completed += 1
+
+    def snapshot(self, now, queue_depth):
+        while self.finished_at and self.finished_at[0] < now - self.rate_window:
+            self.finished_at.popleft()
+        ordered = sorted(self.latencies)
+        span = min(self.rate_window, now - self.first_at) if self.first_at is not None else 0.0
+
+        def percentile(q):
+            return ordered[int(q * (len(ordered) - 1))] * 1000 if ordered else 0.0
+
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_depth": queue_depth,
+            "ops_per_s": len(self.finished_at) / span if span > 0 else 0.0,
+            "p50_ms": percentile(0.50),
+            "p99_ms": percentile(0.99),
+        }
+
+
+# -----------------------------------------------------------
+# SERVICE
+# -----------------------------------------------------------
+class KeyService:
+    """
+    keys:           name -> key object with .decrypt(c) and .public_key
+    max_batch:      most requests sent to a worker in one call
+    budget_ms:      how long the first request of a batch may wait for company
+    queue_size:     bound on queued requests; readers stop when it is full
+    max_inflight:   bound on batches running or waiting on the pool
+    """
+
+    def __init__(self, keys, workers=None, max_batch=32, budget_ms=2.0,
+                 queue_size=1024, max_inflight=None):
+        self.keys = keys
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.budget = budget_ms / 1000
+        self.queue_size = queue_size
+        self.max_inflight = max_inflight or 2 * self.workers
+        self.stats = ServiceStats()
+        self.pool = None
+        self.queue = None
+        self.inflight = None
+        self._running = set()
+
+    async def start(self, host=None, port=None, unix_path=None):
+        self.queue = asyncio.Queue(self.queue_size)
+        self.inflight = asyncio.Semaphore(self.max_inflight)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        initializer=_init_worker, initargs=(self.keys,))
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self._handle, path=unix_path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    def close(self):
+        self._batcher.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+    # --- batching -------------------------------------------------------
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self.queue.get()
+            batch = [first]
+            deadline = first[3] + self.budget
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+            for name, items in groups.items():
+                await self.inflight.acquire()
+                task = asyncio.create_task(self._run_batch(name, items))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, name, items):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.pool, _decrypt_batch, name,
+                                                 [item[1] for item in items])
+        except Exception as exc:
+            self.stats.failed += len(items)
+            for item in items:
+                if not item[2].done():
+                    item[2].set_exception(exc)
+        else:
+            now = loop.time()
+            self.stats.batches += 1
+            for item, (ok, value) in zip(items, results):
+                if ok:
+                    self.stats.record(now - item[3], now)
+                else:
+                    self.stats.failed += 1
+                if item[2].done():
+                    continue
+                if ok:
+                    item[2].set_result(value)
+                else:
+                    item[2].set_exception(ValueError(value))
+        finally:
+            self.inflight.release()
+
+    # --- connections ----------------------------------------------------
+    async def _handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        replies = asyncio.Queue()
+        sender = asyncio.create_task(self._send_loop(replies, writer))
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    replies.put_nowait({"error": "invalid JSON"})
+                    continue
+                if not isinstance(request, dict):
+                    replies.put_nowait({"error": "request must be a JSON object"})
+                    continue
+                rid = request.get("id")
+                op = request.get("op")
+                name = request.get("key")
+
+                if op == "stats":
+                    replies.put_nowait({"id": rid, **self.stats.snapshot(loop.time(), self.queue.qsize())})
+                elif not isinstance(name, str) or name not in self.keys:
+                    replies.put_nowait({"id": rid, "error": f"unknown key {name!r}"})
+                elif op == "public_key":
+                    replies.put_nowait({"id": rid, "public_key": list(self.keys[name].public_key)})
+                elif op == "decrypt":
+                    try:
+                        c = _check_ciphertext(self.keys[name], request.get("c"))
+                    except ValueError as exc:
+                        replies.put_nowait({"id": rid, "error": str(exc)})
+                        continue
+                    future = loop.create_future()
+                    # blocks this reader (and so the client) while the queue is full
+                    await self.queue.put((name, c, future, loop.time()))
+                    task = asyncio.create_task(self._reply_when_done(rid, future, replies))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                else:
+                    replies.put_nowait({"id": rid, "error": f"unknown op {op!r}"})
+
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            replies.put_nowait(None)
+            await sender
+            writer.close()
+
+    @staticmethod
+    async def _reply_when_done(rid, future, replies):
+        try:
+            replies.put_nowait({"id": rid, "m": await future})
+        except Exception as exc:
+            replies.put_nowait({"id": rid, "error": str(exc)})
+
+    @staticmethod
+    async def _send_loop(replies, writer):
+        while True:
+            reply = await replies.get()
+            if reply is None:
+                break
+            writer.write((json.dumps(reply) + "\n").encode())
+            if replies.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+
+
+# -----------------------------------------------------------
+# DEMO KEYS
+# -----------------------------------------------------------
+def demo_keys(rsa_bits=2048, elgamal_bits=1024):
+    """Fresh RSA key plus an ElGamal key over a random prime with g = 2."""
+    p = generate_prime(elgamal_bits)
+    return {
+        "rsa": RSAPrivateKey.generate(rsa_bits),
+        "elgamal": ElGamalPrivateKey(p, 2, random.randint(2, p - 2)),
+    }
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+async def serve(args):
+    print("Generating keys ...")
+    service = KeyService(demo_keys(args.rsa_bits, args.elgamal_bits), args.workers,
+                         args.max_batch, args.budget_ms, args.queue_size)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Key service listening on {where} with {service.workers} worker(s)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batched private-key decryption service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--budget-ms", type=float, default=2.0)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--rsa-bits", type=int, default=2048)
+    parser.add_argument("--elgamal-bits", type=int, default=1024)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,161 @@
+# Load Generator for key_service.py
+# Opens several connections, keeps a fixed number of decryption requests in
+# flight on each, and reports client-side ops/s and p50/p99 latency next to
+# the counters the service exposes through the "stats" op.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "RSA"))
+sys.path.insert(0, os.path.join(HERE, "..", "Elgamal"))
+from elgamal import power_mod
+from rsa_crt import fast_pow
+
+
+# -----------------------------------------------------------
+# CONNECTION
+# -----------------------------------------------------------
+class Connection:
+    """One socket with request ids matched to futures by a reader task."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.waiting = {}
+        self.listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def open(cls, host, port, unix_path=None):
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def call(self, **request):
+        if self.listener.done():
+            raise ConnectionError("connection closed by the service")
+        self.next_id += 1
+        request["id"] = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self.next_id] = future
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+        reply = await future
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self.waiting.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            # EOF, a reset or close(): nothing will answer the calls still waiting
+            waiting, self.waiting = self.waiting, {}
+            for future in waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed by the service"))
+
+    async def close(self):
+        self.writer.close()
+        self.listener.cancel()
+
+
+# -----------------------------------------------------------
+# CIPHERTEXTS
+# -----------------------------------------------------------
+def make_ciphertexts(kind, public_key, count):
+    """(ciphertext, plaintext) pairs encrypted locally under the public key."""
+    pairs = []
+    if kind == "rsa":
+        e, n = public_key
+        for _ in range(count):
+            m = random.randrange(2, n)
+            pairs.append((fast_pow(m, e, n), m))
+    else:
+        p, g, y = public_key
+        for _ in range(count):
+            m, k = random.randrange(2, p), random.randint(2, p - 2)
+            pairs.append(([power_mod(g, k, p), m * power_mod(y, k, p) % p], m))
+    return pairs
+
+
+# -----------------------------------------------------------
+# LOAD LOOP
+# -----------------------------------------------------------
+async def run_load(args):
+    conns = [await Connection.open(args.host, args.port, args.unix) for _ in range(args.connections)]
+    public_key = (await conns[0].call(op="public_key", key=args.key))["public_key"]
+    samples = make_ciphertexts(args.key, public_key, 64)
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + args.duration
+
+    async def worker(conn):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            c, m = random.choice(samples)
+            start = time.perf_counter()
+            try:
+                reply = await conn.call(op="decrypt", key=args.key, c=c)
+            except RuntimeError:
+                errors += 1
+                continue
+            except ConnectionError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+            if reply["m"] != m:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(conn) for conn in conns for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    server = await conns[0].call(op="stats")
+    for conn in conns:
+        await conn.close()
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"\n--- Load against key '{args.key}' "
+          f"({args.connections} conn x {args.concurrency} in flight, {args.duration:.0f}s) ---")
+    if n:
+        print(f"client: {n / elapsed:.1f} ops/s, "
+              f"p50 {latencies[n // 2] * 1000:.2f} ms, "
+              f"p99 {latencies[int(0.99 * (n - 1))] * 1000:.2f} ms, errors {errors}")
+    else:
+        print(f"client: no replies, errors {errors}")
+    print(f"server: {server['ops_per_s']:.1f} ops/s (last 10s), "
+          f"p50 {server['p50_ms']:.2f} ms, p99 {server['p99_ms']:.2f} ms, "
+          f"{server['completed']} done in {server['batches']} batches")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for key_service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix")
+    parser.add_argument("--key", default="rsa", choices=("rsa", "elgamal"))
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight per connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_load(parse_args()))
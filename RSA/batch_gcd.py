@@ -0,0 +1,276 @@
+# Batch GCD: Find RSA Moduli that Share a Prime Factor
+# Bernstein's product tree / remainder tree. For moduli n_1..n_N with
+# product P, gcd(n_i, (P mod n_i^2) / n_i) is the product of the primes n_i
+# shares with the other moduli, found for all i in quasi-linear time.
+#
+# Tree levels that do not fit in `memory_limit` bytes are streamed to files
+# and read back through mmap; with several workers each process builds and
+# descends the subtree over its own slice of the moduli.
+
+import math
+import mmap
+import os
+import random
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from prime_gen import generate_prime
+
+try:
+    import resource
+except ImportError:          # not available on Windows
+    resource = None
+
+
+# -----------------------------------------------------------
+# TREE LEVEL STORAGE (list in memory, or file + mmap)
+# -----------------------------------------------------------
+class IntLevel:
+    """
+    A sequence of non-negative ints. With a path the values are streamed to
+    that file as little-endian byte strings and only the offsets stay in memory.
+    """
+
+    def __init__(self, values, path=None):
+        self.path = path
+        self._map = None
+        if path is None:
+            self._values = list(values)
+            self.offsets = None
+            return
+
+        self._values = None
+        offsets = array("Q", [0])
+        with open(path, "wb") as f:
+            for v in values:
+                data = v.to_bytes((v.bit_length() + 7) // 8 or 1, "little")
+                f.write(data)
+                offsets.append(offsets[-1] + len(data))
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self._values) if self._values is not None else len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if self._values is not None:
+            return self._values[i]
+        if self._map is None:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return int.from_bytes(self._map[self.offsets[i]:self.offsets[i + 1]], "little")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def close(self, delete=False):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if delete and self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_map"] = None
+        return state
+
+
+def _new_level(values, spill, spill_dir, tag):
+    if not spill:
+        return IntLevel(values)
+    return IntLevel(values, os.path.join(spill_dir, tag + ".bin"))
+
+
+def _should_spill(moduli_bytes, memory_limit, spill_dir):
+    # every product-tree level holds about as many bytes as the leaves
+    return spill_dir is not None and memory_limit is not None and moduli_bytes > memory_limit
+
+
+# -----------------------------------------------------------
+# PRODUCT TREE AND REMAINDER TREE
+# -----------------------------------------------------------
+def product_tree(moduli, spill_dir=None, memory_limit=None, tag="tree"):
+    """Levels from the leaves (moduli) up to the single root product."""
+    moduli = list(moduli)
+    leaf_bytes = sum((n.bit_length() + 7) // 8 for n in moduli)
+    spill = _should_spill(leaf_bytes, memory_limit, spill_dir)
+
+    levels = [_new_level(moduli, spill, spill_dir, f"{tag}-p0")]
+    resident = 0 if spill else leaf_bytes
+    while len(levels[-1]) > 1:
+        prev = levels[-1]
+        size = len(prev)
+        products = (prev[i] * prev[i + 1] if i + 1 < size else prev[i] for i in range(0, size, 2))
+        if not spill and memory_limit is not None and resident + leaf_bytes > memory_limit:
+            spill = spill_dir is not None
+        levels.append(_new_level(products, spill, spill_dir, f"{tag}-p{len(levels)}"))
+        resident += 0 if spill else leaf_bytes
+    return levels
+
+
+def remainder_tree(levels, root_remainder=None, spill_dir=None, memory_limit=None, tag="tree"):
+    """
+    Descend from the root with r_child = r_parent mod child^2 and return
+    gcd(n_i, r_i / n_i) for every leaf. root_remainder defaults to the root
+    product itself (the whole tree).
+    """
+    leaves = levels[0]
+    # each remainder is below child^2, so a remainder level is ~2x the leaves
+    leaf_bytes = sum((n.bit_length() + 7) // 8 for n in leaves)
+    spill = _should_spill(2 * leaf_bytes, memory_limit, spill_dir)
+
+    rems = [levels[-1][0] if root_remainder is None else root_remainder]
+    for depth in range(len(levels) - 2, -1, -1):
+        level = levels[depth]
+        nxt = _new_level((rems[i // 2] % (level[i] * level[i]) for i in range(len(level))),
+                         spill, spill_dir, f"{tag}-r{depth}")
+        if isinstance(rems, IntLevel):
+            rems.close(delete=True)
+        rems = nxt
+
+    gcds = [math.gcd(leaves[i], rems[i] // leaves[i]) for i in range(len(leaves))]
+    if isinstance(rems, IntLevel):
+        rems.close(delete=True)
+    return gcds
+
+
+# -----------------------------------------------------------
+# PARALLEL SUBTREES
+# -----------------------------------------------------------
+def _build_subtree(chunk, spill_dir, memory_limit, tag):
+    levels = product_tree(chunk, spill_dir, memory_limit, tag)
+    for level in levels:
+        level.close()
+    return levels
+
+
+def _descend_subtree(levels, root_remainder, spill_dir, memory_limit, tag):
+    gcds = remainder_tree(levels, root_remainder, spill_dir, memory_limit, tag)
+    for level in levels:
+        level.close(delete=True)
+    return gcds
+
+
+def batch_gcd(moduli, workers=None, memory_limit=None, spill_dir=None):
+    """
+    gcd(n_i, product of all other n_j) for every modulus, via product and
+    remainder trees. With workers > 1 the moduli are split into one slice per
+    worker; each worker builds its subtree (spilled to `spill_dir`), the
+    parent joins the slice roots, and the workers descend their subtrees.
+    """
+    moduli = list(moduli)
+    if not moduli:
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(moduli) // 2))
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as tmp:
+        if workers == 1:
+            levels = product_tree(moduli, tmp, memory_limit)
+            gcds = remainder_tree(levels, None, tmp, memory_limit)
+            for level in levels:
+                level.close(delete=True)
+            return gcds
+
+        step = -(-len(moduli) // workers)
+        chunks = [moduli[i:i + step] for i in range(0, len(moduli), step)]
+        # subtrees have to travel between processes, so they always go to disk
+        sub_limit = 0 if memory_limit is None else memory_limit // len(chunks)
+
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            subtrees = list(pool.map(_build_subtree, chunks, [tmp] * len(chunks),
+                                     [sub_limit] * len(chunks),
+                                     [f"s{i}" for i in range(len(chunks))]))
+
+            top = product_tree([tree[-1][0] for tree in subtrees])
+            for tree in subtrees:
+                tree[-1].close()            # reading the root mapped its file here
+            rems = [top[-1][0]]
+            for depth in range(len(top) - 2, -1, -1):
+                rems = [rems[i // 2] % (top[depth][i] ** 2) for i in range(len(top[depth]))]
+
+            results = pool.map(_descend_subtree, subtrees, rems, [tmp] * len(chunks),
+                               [sub_limit] * len(chunks),
+                               [f"s{i}" for i in range(len(chunks))])
+            return [g for part in results for g in part]
+
+
+def find_shared_factors(moduli, **kwargs):
+    """
+    Run batch_gcd and factor every weak modulus.
+    Returns a list of (index, n, p, q); p and q are None when n only
+    appears as an exact duplicate of another modulus.
+    """
+    moduli = list(moduli)
+    gcds = batch_gcd(moduli, **kwargs)
+    weak = [i for i, g in enumerate(gcds) if g != 1]
+
+    found = []
+    for i in weak:
+        n, g = moduli[i], gcds[i]
+        if g == n:
+            # both primes are shared; split against the other weak moduli
+            g = next((h for h in (math.gcd(n, moduli[j]) for j in weak if j != i)
+                      if 1 < h < n), n)
+        found.append((i, n, g, n // g) if g != n else (i, n, None, None))
+    return found
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def peak_memory_mb():
+    if resource is None:
+        return float("nan")
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / 1024          # ru_maxrss is in KiB on Linux
+
+
+def make_test_moduli(count, bits=512, weak_pairs=3):
+    primes = [generate_prime(bits // 2) for _ in range(2 * count - weak_pairs)]
+    moduli = [primes[2 * i] * primes[2 * i + 1] for i in range(count - weak_pairs)]
+    spare = primes[2 * (count - weak_pairs):]
+    for i in range(weak_pairs):
+        moduli.append(primes[2 * i] * spare[i])      # shares a prime with moduli[i]
+    random.shuffle(moduli)
+    return moduli
+
+
+def benchmark(counts=(1000, 2000, 4000), bits=512):
+    print("\n--- Batch GCD Benchmark ---")
+    print(f"{'moduli':>8} {'batch (s)':>10} {'pairwise (s)':>13} {'found':>6} {'peak MB':>8}")
+    for count in counts:
+        moduli = make_test_moduli(count, bits)
+
+        start = time.perf_counter()
+        found = find_shared_factors(moduli)
+        batch_time = time.perf_counter() - start
+
+        if count <= 2000:
+            start = time.perf_counter()
+            for i in range(count):
+                n = moduli[i]
+                for j in range(i + 1, count):
+                    math.gcd(n, moduli[j])
+            pairwise = f"{time.perf_counter() - start:>13.2f}"
+        else:
+            pairwise = f"{'(skipped)':>13}"
+
+        print(f"{count:>8} {batch_time:>10.2f} {pairwise} {len(found):>6} {peak_memory_mb():>8.1f}")
+        for i, n, p, q in found:
+            assert p is None or p * q == n
+
+    print("\nRecovered factors from the last run:")
+    for i, n, p, q in found:
+        print(f"  modulus #{i}: p = {p}")
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,298 @@
+# Modular Exponentiation Engine
+# Sliding-window and fixed-window recoding of the exponent, reusable tables
+# of precomputed powers, and an optional Montgomery-domain context that is
+# built once per modulus.
+
+import random
+import time
+from functools import lru_cache
+
+
+# -----------------------------------------------------------
+# REFERENCE: BIT-BY-BIT BINARY EXPONENTIATION
+# -----------------------------------------------------------
+def binary_pow(base, exp, mod):
+    """The original right-to-left square-and-multiply loop, minus its squaring after the top bit."""
+    result = 1
+    base = base % mod
+    while exp > 0:
+        if exp % 2 == 1:
+            result = (result * base) % mod
+        exp //= 2
+        if exp:
+            base = (base * base) % mod
+    return result
+
+
+# -----------------------------------------------------------
+# EXPONENT RECODING
+# -----------------------------------------------------------
+def default_window(bits):
+    """Window width that minimises table cost + multiplications for `bits`."""
+    for limit, w in ((8, 1), (24, 2), (80, 3), (240, 4), (672, 5), (1792, 6)):
+        if bits <= limit:
+            return w
+    return 7
+
+
+def sliding_window_recode(exp, w):
+    """
+    Recode exp (> 0) from the top bit down into (squarings, digit) pairs.
+    Each digit is odd and < 2^w, or 0 for a trailing run of squarings.
+    """
+    digits = []
+    i = exp.bit_length() - 1
+    pending = 0
+    while i >= 0:
+        if not (exp >> i) & 1:
+            pending += 1
+            i -= 1
+            continue
+        j = max(i - w + 1, 0)
+        while not (exp >> j) & 1:
+            j += 1
+        width = i - j + 1
+        digits.append((pending + width, (exp >> j) & ((1 << width) - 1)))
+        pending = 0
+        i = j - 1
+    if pending:
+        digits.append((pending, 0))
+    return digits
+
+
+def fixed_window_recode(exp, w):
+    """Recode exp (> 0) into base-2^w digits, most significant first."""
+    digits = []
+    mask = (1 << w) - 1
+    shift = ((exp.bit_length() - 1) // w) * w
+    while shift >= 0:
+        digits.append((w, (exp >> shift) & mask))
+        shift -= w
+    return digits
+
+
+# -----------------------------------------------------------
+# MONTGOMERY DOMAIN
+# -----------------------------------------------------------
+class MontgomeryContext:
+    """
+    Montgomery arithmetic for an odd modulus n with R = 2^k, k = bits(n).
+    Values stay in the domain (x*R mod n) between operations, and each
+    product is reduced with REDC (two multiplies and a shift, no division).
+    """
+
+    def __init__(self, n):
+        if n < 3 or n % 2 == 0:
+            raise ValueError("Montgomery reduction needs an odd modulus > 2")
+        self.n = n
+        self.k = n.bit_length()
+        self.mask = (1 << self.k) - 1
+        self.n_prime = (-pow(n, -1, 1 << self.k)) & self.mask
+        self.one = (1 << self.k) % n
+        self.r2 = (1 << (2 * self.k)) % n
+
+    def redc(self, t):
+        m = ((t & self.mask) * self.n_prime) & self.mask
+        t = (t + m * self.n) >> self.k
+        return t - self.n if t >= self.n else t
+
+    def to_mont(self, x):
+        return self.redc((x % self.n) * self.r2)
+
+    def from_mont(self, x):
+        return self.redc(x)
+
+    def mul(self, a, b):
+        return self.redc(a * b)
+
+
+@lru_cache(maxsize=64)
+def montgomery_context(n):
+    """Shared context per modulus, so repeated calls skip the setup."""
+    return MontgomeryContext(n)
+
+
+# -----------------------------------------------------------
+# PRECOMPUTED POWERS OF ONE BASE
+# -----------------------------------------------------------
+class OddPowerTable:
+    """
+    base^1, base^3, ..., base^(2^w - 1) mod n, stored in the Montgomery
+    domain when a context is given. Build it once and pass it to
+    sliding_window_pow() for every exponentiation that shares the base.
+    """
+
+    def __init__(self, base, mod, w=4, ctx=None):
+        self.mod = mod
+        self.w = w
+        self.ctx = ctx
+        if ctx is None:
+            b = base % mod
+            b2 = b * b % mod
+            powers = [b]
+            for _ in range((1 << (w - 1)) - 1):
+                powers.append(powers[-1] * b2 % mod)
+        else:
+            b = ctx.to_mont(base)
+            b2 = ctx.mul(b, b)
+            powers = [b]
+            for _ in range((1 << (w - 1)) - 1):
+                powers.append(ctx.mul(powers[-1], b2))
+        self.powers = powers
+
+    def __getitem__(self, digit):
+        return self.powers[digit >> 1]
+
+
+# -----------------------------------------------------------
+# EXPONENTIATION
+# -----------------------------------------------------------
+def sliding_window_pow(base, exp, mod, w=None, table=None, ctx=None):
+    """
+    base^exp mod mod with sliding-window recoding.
+    table: an OddPowerTable for this base (its w and ctx are then used).
+    ctx:   a MontgomeryContext for mod, or True to use the shared one.
+    """
+    if exp < 0:
+        return sliding_window_pow(pow(base, -1, mod), -exp, mod, w, None, ctx)
+    if mod == 1:
+        return 0
+    if exp == 0:
+        return 1
+
+    if table is not None:
+        w, ctx = table.w, table.ctx
+    else:
+        if ctx is True:
+            ctx = montgomery_context(mod)
+        if w is None:
+            w = default_window(exp.bit_length())
+        table = OddPowerTable(base, mod, w, ctx)
+
+    digits = sliding_window_recode(exp, w)
+    powers = table.powers
+    result = powers[digits[0][1] >> 1]
+
+    if ctx is None:
+        for squarings, digit in digits[1:]:
+            for _ in range(squarings):
+                result = result * result % mod
+            if digit:
+                result = result * powers[digit >> 1] % mod
+        return result
+
+    redc = ctx.redc
+    for squarings, digit in digits[1:]:
+        for _ in range(squarings):
+            result = redc(result * result)
+        if digit:
+            result = redc(result * powers[digit >> 1])
+    return ctx.from_mont(result)
+
+
+def fixed_window_pow(base, exp, mod, w=4, ctx=None):
+    """base^exp mod mod with a fixed 2^w-ary window and a full power table."""
+    if exp < 0:
+        return fixed_window_pow(pow(base, -1, mod), -exp, mod, w, ctx)
+    if mod == 1:
+        return 0
+    if exp == 0:
+        return 1
+    if ctx is True:
+        ctx = montgomery_context(mod)
+
+    mul = (lambda a, b: a * b % mod) if ctx is None else ctx.mul
+    one = 1 if ctx is None else ctx.one
+    b = base % mod if ctx is None else ctx.to_mont(base)
+    table = [one, b]
+    for _ in range((1 << w) - 2):
+        table.append(mul(table[-1], b))
+
+    digits = fixed_window_recode(exp, w)
+    result = table[digits[0][1]]
+    for squarings, digit in digits[1:]:
+        for _ in range(squarings):
+            result = mul(result, result)
+        if digit:
+            result = mul(result, table[digit])
+    return result if ctx is None else ctx.from_mont(result)
+
+
+# -----------------------------------------------------------
+# OPERATION COUNTS
+# -----------------------------------------------------------
+def operation_count(exp, method="sliding", w=None):
+    """
+    Modular squarings / multiplications needed for exp, including the
+    table precomputation, without running the exponentiation.
+    """
+    if w is None:
+        w = default_window(exp.bit_length())
+    if method == "binary":
+        # square-and-multiply is the sliding window with w = 1
+        digits = sliding_window_recode(exp, 1)
+        table = 0
+    elif method == "sliding":
+        digits = sliding_window_recode(exp, w)
+        table = (1 << (w - 1))          # one squaring + 2^(w-1) - 1 multiplies
+    elif method == "fixed":
+        digits = fixed_window_recode(exp, w)
+        table = (1 << w) - 2
+    else:
+        raise ValueError("Unknown method: choose 'binary', 'sliding' or 'fixed'")
+    return {"squarings": sum(s for s, _ in digits[1:]),
+            "multiplications": sum(1 for _, d in digits[1:] if d),
+            "precomputation": table}
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def _time(fn, reps):
+    start = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - start) / reps * 1000
+
+
+def benchmark(sizes=(1024, 2048, 3072, 4096), reps=5):
+    print("\n--- Modular Exponentiation Benchmark (ms per exponentiation) ---")
+    print(f"{'bits':>6} {'fast_pow':>9} {'sliding':>9} {'fixed':>9} "
+          f"{'mont':>9} {'shared':>9} {'pow()':>9}")
+    for bits in sizes:
+        mod = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+        base = random.randrange(2, mod)
+        exp = random.getrandbits(bits) | (1 << (bits - 1))
+        expected = pow(base, exp, mod)
+
+        ctx = montgomery_context(mod)
+        shared = OddPowerTable(base, mod, default_window(bits))
+        assert sliding_window_pow(base, exp, mod) == expected
+        assert fixed_window_pow(base, exp, mod, 5) == expected
+        assert sliding_window_pow(base, exp, mod, ctx=ctx) == expected
+        assert sliding_window_pow(base, exp, mod, table=shared) == expected
+
+        row = [
+            _time(lambda: binary_pow(base, exp, mod), reps),
+            _time(lambda: sliding_window_pow(base, exp, mod), reps),
+            _time(lambda: fixed_window_pow(base, exp, mod, 5), reps),
+            _time(lambda: sliding_window_pow(base, exp, mod, ctx=ctx), reps),
+            _time(lambda: sliding_window_pow(base, exp, mod, table=shared), reps),
+            _time(lambda: pow(base, exp, mod), reps),
+        ]
+        print(f"{bits:>6} " + " ".join(f"{t:>9.2f}" for t in row))
+
+    print("\n--- Operation Counts (squarings + multiplications + table) ---")
+    print(f"{'bits':>6} {'binary':>8} {'sliding':>8} {'fixed':>8} {'w':>3}")
+    for bits in sizes:
+        exp = random.getrandbits(bits) | (1 << (bits - 1))
+        w = default_window(bits)
+        totals = [sum(operation_count(exp, m, w).values()) for m in ("binary", "sliding", "fixed")]
+        print(f"{bits:>6} {totals[0]:>8} {totals[1]:>8} {totals[2]:>8} {w:>3}")
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,109 @@
+# Multi-Prime RSA with Garner's CRT Recombination
+# n = r_1 * r_2 * ... * r_k. Decryption does k exponentiations modulo primes
+# of size bits/k and recombines them with Garner's algorithm using
+# coefficients that are computed once per key (RFC 8017, section 5.1.2).
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from number_theory import garner, garner_coefficients
+from prime_gen import generate_prime
+from rsa_crt import fast_pow, mod_inverse
+from rsa_key import RSAPrivateKey
+
+
+# -----------------------------------------------------------
+# MULTI-PRIME PRIVATE KEY
+# -----------------------------------------------------------
+class MultiPrimeRSAPrivateKey(RSAPrivateKey):
+    """
+    RSA private key over k >= 2 distinct primes. Stores per prime
+        d_i = d mod (r_i - 1)
+    and Garner coefficients
+        t_i = (r_1 * ... * r_{i-1})^-1 mod r_i   (i >= 2)
+    With two primes it decrypts exactly like RSAPrivateKey.
+    """
+
+    def __init__(self, primes, e, d=None):
+        primes = list(primes)
+        if len(primes) < 2 or len(set(primes)) != len(primes):
+            raise ValueError("need at least two distinct primes")
+
+        n, phi = 1, 1
+        for r in primes:
+            n *= r
+            phi *= r - 1
+        if d is None:
+            d = mod_inverse(e, phi)
+
+        self.primes = primes
+        self.p, self.q = primes[0], primes[1]
+        self.n = n
+        self.e = e
+        self.d = d
+        self.exponents = [d % (r - 1) for r in primes]
+        self.coefficients = garner_coefficients(primes)
+
+    @classmethod
+    def from_two_prime(cls, key):
+        """Wrap an existing RSAPrivateKey (p, q, e, d)."""
+        return cls([key.p, key.q], key.e, key.d)
+
+    def decrypt(self, c):
+        """k half/third/quarter-size exponentiations, then Garner."""
+        residues = [fast_pow(c, d_i, r) for d_i, r in zip(self.exponents, self.primes)]
+        return garner(residues, self.primes, self.coefficients)
+
+    @classmethod
+    def generate(cls, bits=2048, count=3, e=65537, workers=2, pool=None):
+        """
+        New key whose modulus has exactly `bits` bits and `count` primes of
+        about bits/count bits each, searched for in worker processes.
+        """
+        sizes = [bits // count + (1 if i < bits % count else 0) for i in range(count)]
+        if pool is None and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, count)) as own_pool:
+                return cls.generate(bits, count, e, pool=own_pool)
+
+        while True:
+            if pool is not None:
+                primes = [f.result() for f in [pool.submit(generate_prime, s, e) for s in sizes]]
+            else:
+                primes = [generate_prime(s, e) for s in sizes]
+            n = 1
+            for r in primes:
+                n *= r
+            if n.bit_length() == bits and len(set(primes)) == count:
+                return cls(primes, e)
+
+    def __repr__(self):
+        return f"MultiPrimeRSAPrivateKey(bits={self.n.bit_length()}, primes={len(self.primes)}, e={self.e})"
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def benchmark(sizes=(2048, 3072, 4096), prime_counts=(2, 3, 4), messages=20):
+    print("\n--- Multi-Prime RSA Decryption (decryptions / second) ---")
+    print(f"{'bits':>6} " + " ".join(f"{str(k) + ' primes':>10}" for k in prime_counts))
+    for bits in sizes:
+        row = []
+        for k in prime_counts:
+            key = MultiPrimeRSAPrivateKey.generate(bits, k, workers=1)
+            ciphertexts = [key.encrypt(random.randrange(2, key.n)) for _ in range(messages)]
+            start = time.perf_counter()
+            for c in ciphertexts:
+                key.decrypt(c)
+            row.append(messages / (time.perf_counter() - start))
+        print(f"{bits:>6} " + " ".join(f"{r:>10.1f}" for r in row))
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    benchmark()
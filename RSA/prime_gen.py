@@ -0,0 +1,96 @@
+# Fast Prime Generation: Windowed Sieve + Miller-Rabin
+# A random odd start is chosen, a whole window of odd candidates is sieved
+# against a precomputed small-prime table, and only the survivors pay for
+# Miller-Rabin rounds (arith_backend.is_prime: GMP when available).
+
+import math
+import os
+import secrets
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from arith_backend import is_prime
+from number_theory import primes_below
+
+
+# -----------------------------------------------------------
+# SMALL PRIME TABLE
+# -----------------------------------------------------------
+SMALL_PRIMES = primes_below(1 << 14)
+_ODD_SMALL_PRIMES = SMALL_PRIMES[1:]
+
+
+# -----------------------------------------------------------
+# MILLER-RABIN
+# -----------------------------------------------------------
+def miller_rabin_rounds(bits):
+    """Rounds for an error below 2^-100 on random candidates (FIPS 186-4, C.3)."""
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    return 40
+
+
+def is_probable_prime(n, rounds=None):
+    if n < 2:
+        return False
+    for sp in SMALL_PRIMES:
+        if n % sp == 0:
+            return n == sp
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    if rounds is None:
+        rounds = miller_rabin_rounds(n.bit_length())
+    return is_prime(n, rounds)
+
+
+# -----------------------------------------------------------
+# WINDOWED SIEVE
+# -----------------------------------------------------------
+def sieve_window(start, window):
+    """
+    Return the candidates start, start+2, ..., start+2*(window-1) that have
+    no factor in the small-prime table (start must be odd).
+    """
+    composite = bytearray(window)
+    for sp in _ODD_SMALL_PRIMES:
+        # first i with start + 2*i = 0 (mod sp); (sp+1)//2 is the inverse of 2
+        i = (-start * ((sp + 1) // 2)) % sp
+        if i < window:
+            composite[i::sp] = b"\x01" * len(range(i, window, sp))
+    return [start + 2 * i for i in range(window) if not composite[i]]
+
+
+def generate_prime(bits, e=None, window=None):
+    """
+    Random prime with exactly `bits` bits and the top two bits set (so a
+    product of two such primes has exactly 2*bits bits).
+    If e is given, primes with gcd(e, p-1) != 1 are skipped.
+    """
+    if bits < 16:
+        raise ValueError("bits must be at least 16")
+    if window is None:
+        window = max(64, bits // 2)        # ~ ln(2^bits) / 2 odd numbers per prime
+    rounds = miller_rabin_rounds(bits)
+    top = (1 << (bits - 1)) | (1 << (bits - 2))
+
+    while True:
+        start = secrets.randbits(bits) | top | 1
+        if (start + 2 * window).bit_length() > bits:
+            continue
+        for candidate in sieve_window(start, window):
+            if e is not None and math.gcd(e, candidate - 1) != 1:
+                continue
+            if is_prime(candidate, rounds):
+                return candidate
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    bits = int(input("Enter prime size in bits: "))
+    print("Prime =", generate_prime(bits))
@@ -1,45 +1,52 @@
 # RSA Implementation with Fast Exponentiation and CRT Optimization
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Number-Theory"))
+from arith_backend import BACKEND, invert, powmod
+from modexp import sliding_window_pow
+from number_theory import extended_gcd
+from prime_gen import is_probable_prime
+
+
 # -----------------------------------------------------------
-# FAST MODULAR EXPONENTIATION (Exponentiation by Squaring)
+# FAST MODULAR EXPONENTIATION (GMP, or the sliding-window engine)
 # -----------------------------------------------------------
 def fast_pow(base, exp, mod):
-    result = 1
-    base = base % mod
-
-    while exp > 0:
-        if exp % 2 == 1:        # If exponent is odd
-            result = (result * base) % mod
-        base = (base * base) % mod
-        exp //= 2               # floor division
-
-    return result
+    if BACKEND == "gmpy2":
+        return powmod(base, exp, mod)
+    return sliding_window_pow(base, exp, mod)
 
 
 # -----------------------------------------------------------
-# EXTENDED EUCLID (for modular inverse)
+# EXTENDED EUCLID (for modular inverse, see Number-Theory/)
 # -----------------------------------------------------------
-def extended_euclid(a, b):
-    if b == 0:
-        return a, 1, 0
-    g, x1, y1 = extended_euclid(b, a % b)
-    return g, y1, x1 - (a // b) * y1
+extended_euclid = extended_gcd
 
 
 def mod_inverse(a, m):
-    g, x, y = extended_euclid(a, m)
-    if g != 1:
+    inv = invert(a, m)
+    if inv is None:
         raise Exception("Inverse does not exist")
-    return x % m
+    return inv
 
 
 # -----------------------------------------------------------
 # RSA KEY GENERATION
 # -----------------------------------------------------------
+def read_prime(prompt):
+    while True:
+        value = int(input(prompt))
+        if is_probable_prime(value):
+            return value
+        print(value, "is not prime, try again.")
+
+
 def generate_keys():
     print("\n--- RSA Key Generation ---")
-    p = int(input("Enter prime p: "))
-    q = int(input("Enter prime q: "))
+    p = read_prime("Enter prime p: ")
+    q = read_prime("Enter prime q: ")
 
     n = p * q
     phi = (p - 1) * (q - 1)
@@ -0,0 +1,189 @@
+# RSA Private Key with Precomputed CRT Parameters
+# dp, dq and q_inv are derived once when the key is built, so every
+# decryption is just two half-size exponentiations and one recombination.
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from prime_gen import generate_prime
+from rsa_crt import fast_pow, mod_inverse
+
+
+# -----------------------------------------------------------
+# PRIVATE KEY OBJECT
+# -----------------------------------------------------------
+class RSAPrivateKey:
+    """
+    RSA private key (p, q, e, d) with the CRT values stored on the object:
+        dp = d mod (p-1), dq = d mod (q-1), q_inv = q^-1 mod p
+    """
+
+    def __init__(self, p, q, e, d=None):
+        if p == q:
+            raise ValueError("p and q must be distinct primes")
+        if p < q:
+            p, q = q, p          # keep p > q so q_inv is reduced mod the larger prime
+
+        self.p = p
+        self.q = q
+        self.n = p * q
+        self.e = e
+        if d is None:
+            d = mod_inverse(e, (p - 1) * (q - 1))
+        self.d = d
+
+        # Step 1-2 of rsa_decrypt_crt(), done once per key
+        self.dp = d % (p - 1)
+        self.dq = d % (q - 1)
+        self.q_inv = mod_inverse(q, p)
+
+    @property
+    def public_key(self):
+        return self.e, self.n
+
+    def encrypt(self, m):
+        return fast_pow(m, self.e, self.n)
+
+    def decrypt(self, c):
+        """Decrypt one ciphertext with the stored CRT parameters."""
+        p, q = self.p, self.q
+        mp = fast_pow(c, self.dp, p)
+        mq = fast_pow(c, self.dq, q)
+        h = (self.q_inv * (mp - mq)) % p
+        return mq + h * q
+
+    def decrypt_without_crt(self, c):
+        """Plain m = c^d mod n, kept for comparison."""
+        return fast_pow(c, self.d, self.n)
+
+    def decrypt_many(self, ciphertexts, workers=None, parallel_threshold=64):
+        """
+        Decrypt a list of ciphertexts.
+        Batches smaller than parallel_threshold (or workers=1) run in this
+        process; larger ones are split across a process pool whose workers
+        receive the key once at start-up.
+        """
+        ciphertexts = list(ciphertexts)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(ciphertexts) < parallel_threshold:
+            return [self.decrypt(c) for c in ciphertexts]
+
+        chunksize = max(1, len(ciphertexts) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            return list(pool.map(_worker_decrypt, ciphertexts, chunksize=chunksize))
+
+    @classmethod
+    def generate(cls, bits=2048, e=65537, workers=2, pool=None):
+        """
+        New key with a `bits`-bit modulus. p and q are searched for in two
+        worker processes (or in `pool` if one is passed in); workers=1 keeps
+        everything in this process.
+        """
+        p_bits, q_bits = bits - bits // 2, bits // 2
+        if pool is not None:
+            fp = pool.submit(generate_prime, p_bits, e)
+            fq = pool.submit(generate_prime, q_bits, e)
+            p, q = fp.result(), fq.result()
+        elif workers > 1:
+            with ProcessPoolExecutor(max_workers=2) as own_pool:
+                return cls.generate(bits, e, pool=own_pool)
+        else:
+            p, q = generate_prime(p_bits, e), generate_prime(q_bits, e)
+
+        if p == q:
+            return cls.generate(bits, e, workers, pool)
+        return cls(p, q, e)
+
+    def __repr__(self):
+        return f"RSAPrivateKey(bits={self.n.bit_length()}, e={self.e})"
+
+
+def generate_many(count, bits=2048, e=65537, workers=None):
+    """Mint `count` keys, generating all of their primes on one shared pool."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return [RSAPrivateKey.generate(bits, e, workers=1) for _ in range(count)]
+
+    p_bits, q_bits = bits - bits // 2, bits // 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = [(pool.submit(generate_prime, p_bits, e), pool.submit(generate_prime, q_bits, e))
+                   for _ in range(count)]
+        keys = []
+        for fp, fq in pending:
+            p, q = fp.result(), fq.result()
+            keys.append(RSAPrivateKey(p, q, e) if p != q else RSAPrivateKey.generate(bits, e, pool=pool))
+        return keys
+
+
+# -----------------------------------------------------------
+# PROCESS POOL WORKERS
+# -----------------------------------------------------------
+_worker_key = None
+
+
+def _init_worker(key):
+    global _worker_key
+    _worker_key = key
+
+
+def _worker_decrypt(c):
+    return _worker_key.decrypt(c)
+
+
+# -----------------------------------------------------------
+# BENCHMARK
+# -----------------------------------------------------------
+def _rate(fn, items):
+    start = time.perf_counter()
+    for c in items:
+        fn(c)
+    return len(items) / (time.perf_counter() - start)
+
+
+def benchmark_keygen(sizes=(1024, 2048, 3072), count=4):
+    print("\n--- RSA Key Generation Benchmark (keys / minute) ---")
+    print(f"{'bits':>6} {'1 process':>10} {'pool':>10}")
+    for bits in sizes:
+        start = time.perf_counter()
+        for _ in range(count):
+            RSAPrivateKey.generate(bits, workers=1)
+        serial = count * 60 / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generate_many(count, bits)
+        pooled = count * 60 / (time.perf_counter() - start)
+        print(f"{bits:>6} {serial:>10.1f} {pooled:>10.1f}")
+
+
+def benchmark(sizes=(2048, 3072, 4096), messages=20):
+    print("\n--- RSA Decryption Benchmark (decryptions / second) ---")
+    print(f"{'bits':>6} {'no CRT':>10} {'CRT':>10} {'speedup':>8}")
+    for bits in sizes:
+        key = RSAPrivateKey.generate(bits, workers=1)
+        ciphertexts = [key.encrypt(random.randrange(2, key.n)) for _ in range(messages)]
+
+        plain_rate = _rate(key.decrypt_without_crt, ciphertexts)
+        crt_rate = _rate(key.decrypt, ciphertexts)
+        print(f"{bits:>6} {plain_rate:>10.1f} {crt_rate:>10.1f} {crt_rate / plain_rate:>7.2f}x")
+
+        start = time.perf_counter()
+        key.decrypt_many(ciphertexts * 10, parallel_threshold=1)
+        batch_rate = len(ciphertexts) * 10 / (time.perf_counter() - start)
+        print(f"{'':>6} decrypt_many on {os.cpu_count()} worker(s): {batch_rate:.1f} / s")
+
+
+# -----------------------------------------------------------
+# MAIN PROGRAM
+# -----------------------------------------------------------
+if __name__ == "__main__":
+    if "keygen" in sys.argv[1:]:
+        benchmark_keygen()
+    else:
+        benchmark()